@@ -0,0 +1,199 @@
+import os
+import math
+import time
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from fastapi import HTTPException
+
+from config import db_metrics, logger, log_fields
+
+# ============== ДОПУСК ЗАПРОСОВ (ВОЛНА ВХОДОВ В НАЧАЛЕ ПОТОКА) ==============
+# Когда администратор раздает логины целому потоку, сотни тестируемых
+# за минуту входят и запрашивают вопросы. Вместо того чтобы пустить всех
+# сразу (и все упрутся в Firestore и отвалятся по таймауту вместе),
+# каждый тяжелый роут пропускает запросы через корзину токенов:
+#
+#   - rate запросов в секунду, до burst подряд без ожидания;
+#   - остальные ждут в очереди FIFO (порядок прихода сохраняется);
+#   - кто не дождется своей очереди за ADMISSION_QUEUE_TIMEOUT секунд,
+#     получает 503 с Retry-After сразу, а не после ожидания.
+#
+# Настройка: ADMISSION_RATES="/auth/login=20:40,/questions=50:100"
+# (роут=запросов в секунду:burst). Число одновременных вызовов Firestore
+# ограничено отдельно (DB_POOL_SIZE, см. config.run_db).
+
+# Ожидание в очереди (секунды) и мест в очереди на роут
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "15"))
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "500"))
+
+DEFAULT_ADMISSION_RATES = "/auth/login=20:40,/auth/firebase-login=20:40,/questions=50:100"
+
+
+def _parse_admission_rates(value: str) -> Dict[str, tuple]:
+    """"/auth/login=20:40" -> {"/auth/login": (20.0, 40)}; без burst - burst = rate"""
+    rates = {}
+    for item in value.split(","):
+        route, _, limits = item.strip().partition("=")
+        if not route or not limits:
+            continue
+        rate, _, burst = limits.partition(":")
+        rate = float(rate)
+        if rate > 0:
+            rates[route.strip()] = (rate, max(1, int(burst) if burst else math.ceil(rate)))
+    return rates
+
+
+ADMISSION_RATES = _parse_admission_rates(os.getenv("ADMISSION_RATES", DEFAULT_ADMISSION_RATES))
+
+
+class AdmissionRejected(Exception):
+    """Запрос не дождется своей очереди - отказ сразу"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
+class RouteGate:
+    """Корзина токенов одного роута с очередью FIFO"""
+
+    def __init__(self, route: str, rate: float, burst: int,
+                 queue_size: int = ADMISSION_QUEUE_SIZE, timeout: float = ADMISSION_QUEUE_TIMEOUT):
+        self.route = route
+        self.rate = rate
+        self.burst = burst
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._metrics = {
+            "admitted": 0,
+            "queued": 0,
+            "rejected": 0,
+            "timedOut": 0,
+            "maxDepth": 0,
+            "totalWaitMs": 0.0,
+            "maxWaitMs": 0.0
+        }
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(len(self._waiters) / self.rate))
+
+    async def acquire(self) -> float:
+        """Дождаться допуска; возвращает ожидание (мс). AdmissionRejected - отказ"""
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            self._metrics["admitted"] += 1
+            return 0.0
+
+        # Место в очереди и успеет ли запрос до срока при текущем темпе
+        expected_wait = (len(self._waiters) + 1 - self._tokens) / self.rate
+        if len(self._waiters) >= self.queue_size or expected_wait > self.timeout:
+            self._metrics["rejected"] += 1
+            raise AdmissionRejected(self._retry_after())
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        self._metrics["queued"] += 1
+        self._metrics["maxDepth"] = max(self._metrics["maxDepth"], len(self._waiters))
+        self._schedule(loop)
+
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except asyncio.TimeoutError:
+            self._metrics["timedOut"] += 1
+            raise AdmissionRejected(self._retry_after())
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                # Не дождался (срок, отключился клиент) - место в очереди больше не нужно
+                self._forget(waiter)
+
+        waited = (time.perf_counter() - started) * 1000
+        self._metrics["admitted"] += 1
+        self._metrics["totalWaitMs"] += waited
+        self._metrics["maxWaitMs"] = max(self._metrics["maxWaitMs"], waited)
+        return waited
+
+    def _forget(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _schedule(self, loop) -> None:
+        """Разбудить очередь, когда накопится следующий токен"""
+        if self._timer is None:
+            delay = max(0.0, (1 - self._tokens) / self.rate)
+            self._timer = loop.call_later(delay, self._drain, loop)
+
+    def _drain(self, loop) -> None:
+        self._timer = None
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._tokens -= 1
+            waiter.set_result(None)
+        if self._waiters:
+            self._schedule(loop)
+
+    def metrics(self) -> Dict:
+        return dict(
+            self._metrics,
+            rate=self.rate,
+            burst=self.burst,
+            depth=len(self._waiters),
+            avgWaitMs=round(self._metrics["totalWaitMs"] / max(1, self._metrics["queued"]), 1)
+        )
+
+
+_gates: Dict[str, RouteGate] = {
+    route: RouteGate(route, rate, burst) for route, (rate, burst) in ADMISSION_RATES.items()
+}
+
+
+def admit(route: str):
+    """
+    Зависимость FastAPI для роута: ждет допуска, при отказе - 503 с
+    Retry-After. Роут без настройки в ADMISSION_RATES пропускается сразу.
+    """
+    gate = _gates.get(route)
+
+    async def dependency() -> None:
+        if gate is None:
+            return
+        try:
+            waited = await gate.acquire()
+        except AdmissionRejected as e:
+            logger.warning(f"⚠️ Очередь {route} переполнена, повтор через {e.retry_after}с")
+            raise HTTPException(
+                status_code=503,
+                detail="Сервер перегружен, повторите позже",
+                headers={"Retry-After": str(e.retry_after)}
+            )
+        if waited:
+            log_fields(queuedMs=round(waited, 1))
+
+    return dependency
+
+
+def admission_metrics() -> Dict:
+    return {
+        "routes": {route: gate.metrics() for route, gate in _gates.items()},
+        "firestore": db_metrics(),
+        "queueTimeout": ADMISSION_QUEUE_TIMEOUT,
+        "queueSize": ADMISSION_QUEUE_SIZE
+    }
@@ -0,0 +1,104 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from scoring import decode_answer_bits, encode_answer_bits, unpack_answer_bits
+
+# ============== ЛИСТ ОТВЕТОВ ==============
+# Ответы попытки хранятся одним документом answerSheets/{user_id}
+# вместо документа на каждый ответ в users/{id}/answers:
+#
+#   answerBits   - ответы битами (base64, бит n-1 = вопрос n, 1 = Да)
+#   answeredBits - на какие вопросы ответили (только если не на все)
+#   pointBits    - какие ответы дали балл (если баллы каталога 0/1),
+#   points       - иначе баллы за каждый вопрос списком
+#
+# Документ пишется одним коммитом с результатом.
+
+ANSWER_SHEETS_COLLECTION = "answerSheets"
+
+
+def _mask(bits: Optional[bytes], size: int) -> int:
+    if bits is None:
+        return (1 << size) - 1
+    return int.from_bytes(bits, "little")
+
+
+def build_answer_sheet(catalog, user_id: str, answer_bits: bytes, answered_bits: Optional[bytes],
+                       submitted_at: datetime) -> Dict:
+    """Документ листа ответов для попытки (catalog - снимок версии, по которой считали)"""
+    size = catalog.engine.size
+    yes = int.from_bytes(answer_bits, "little")
+    answered = _mask(answered_bits, size)
+
+    sheet = {
+        "userId": user_id,
+        "catalogVersion": catalog.version,
+        "answerBits": encode_answer_bits(answer_bits),
+        "submittedAt": submitted_at
+    }
+    if answered_bits is not None:
+        sheet["answeredBits"] = encode_answer_bits(answered_bits)
+
+    if catalog.binary_points and len(catalog.by_number) == size:
+        # Баллы 0/1 и все вопросы на месте - биты баллов по маскам каталога
+        point_bits = (yes & catalog.yes_point_mask) | (~yes & answered & catalog.no_point_mask)
+        sheet["pointBits"] = encode_answer_bits(point_bits.to_bytes(len(answer_bits), "little"))
+        return sheet
+
+    points = [0] * size
+    for i in range(size):
+        if not answered >> i & 1:
+            continue
+        question = catalog.by_number.get(i + 1)
+        if yes >> i & 1:
+            points[i] = question.points_if_yes if question else 1
+        else:
+            points[i] = question.points_if_no if question else 0
+
+    if all(p in (0, 1) for p in points):
+        point_bits = sum(1 << i for i, p in enumerate(points) if p)
+        sheet["pointBits"] = encode_answer_bits(point_bits.to_bytes(len(answer_bits), "little"))
+    else:
+        sheet["points"] = points
+    return sheet
+
+
+def answers_from_sheet(sheet: Dict, catalog) -> List[Dict]:
+    """
+    Список ответов в формате /admin/user-answers из листа ответов
+    (или из документа результата, где ответы хранились битами вместе с баллами).
+    Баллы берутся из документа, а если их там нет - из каталога.
+    """
+    size = catalog.engine.size
+    answers = unpack_answer_bits(decode_answer_bits(sheet["answerBits"], size), size)
+    if sheet.get("answeredBits"):
+        answered = unpack_answer_bits(decode_answer_bits(sheet["answeredBits"], size), size)
+    else:
+        answered = [True] * size
+
+    if sheet.get("pointBits"):
+        stored_points = [int(p) for p in unpack_answer_bits(decode_answer_bits(sheet["pointBits"], size), size)]
+    else:
+        stored_points = sheet.get("points")
+    submitted_at = sheet.get("submittedAt", sheet.get("completedAt"))
+
+    result = []
+    for i, answer in enumerate(answers):
+        if not answered[i]:
+            continue
+        if stored_points is not None:
+            points = stored_points[i]
+        else:
+            question = catalog.by_number.get(i + 1)
+            if answer:
+                points = question.points_if_yes if question else 1
+            else:
+                points = question.points_if_no if question else 0
+        result.append({
+            "questionNumber": i + 1,
+            "answer": answer,
+            "answerText": "Да" if answer else "Нет",
+            "points": points,
+            "submittedAt": submitted_at
+        })
+    return result
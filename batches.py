@@ -0,0 +1,75 @@
+import os
+import time
+from typing import Optional, Tuple
+
+from config import db, logger, run_db
+
+# ============== ТЕКУЩИЙ ПОТОК В ПАМЯТИ ==============
+# Номер текущего потока (batches/current) меняется только через
+# /admin/new-batch, а нужен при генерации пользователей, оплате и
+# регистрации. Воркер держит его в памяти:
+#
+#   - /admin/new-batch обновляет значение своего воркера сразу;
+#   - слушатель Firestore (on_snapshot) доносит изменение до остальных
+#     воркеров, обычно меньше чем за секунду;
+#   - если слушатель не запустился, значение перечитывается не чаще
+#     раза в BATCH_CACHE_TTL секунд.
+
+BATCHES_COLLECTION = "batches"
+CURRENT_BATCH_DOCUMENT = "current"
+
+# Срок жизни значения без слушателя и со слушателем (страховка, если поток событий оборвался)
+BATCH_CACHE_TTL = float(os.getenv("BATCH_CACHE_TTL", "1"))
+BATCH_LISTENER_TTL = float(os.getenv("BATCH_LISTENER_TTL", "300"))
+
+
+def current_batch_ref():
+    return db.collection(BATCHES_COLLECTION).document(CURRENT_BATCH_DOCUMENT)
+
+
+def _batch_number(snapshot) -> Optional[int]:
+    if not snapshot.exists:
+        return None
+    return snapshot.to_dict().get("batchNumber", 1)
+
+
+class CurrentBatch:
+    """Номер текущего потока: None - документа batches/current еще нет"""
+
+    def __init__(self):
+        # (номер, время чтения) одним кортежем: слушатель пишет из своего потока
+        self._state: Optional[Tuple[Optional[int], float]] = None
+        self._watch = None
+
+    def start(self) -> None:
+        try:
+            self._watch = current_batch_ref().on_snapshot(self._on_snapshot)
+        except Exception as e:
+            logger.warning(f"⚠️ Слушатель потока не запущен, номер перечитывается раз в {BATCH_CACHE_TTL}с: {e}")
+
+    def stop(self) -> None:
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+
+    def _on_snapshot(self, snapshots, changes, read_time) -> None:
+        for snapshot in snapshots:
+            self.set(_batch_number(snapshot))
+        if not snapshots:
+            # Документ удален
+            self.set(None)
+
+    def set(self, number: Optional[int]) -> None:
+        self._state = (number, time.monotonic())
+
+    async def get(self) -> Optional[int]:
+        state = self._state
+        ttl = BATCH_LISTENER_TTL if self._watch is not None else BATCH_CACHE_TTL
+        if state is not None and time.monotonic() - state[1] < ttl:
+            return state[0]
+        number = _batch_number(await run_db(current_batch_ref().get))
+        self.set(number)
+        return number
+
+
+current_batch_cache = CurrentBatch()
@@ -0,0 +1,298 @@
+import os
+import time
+import json
+import gzip
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple, NamedTuple, Mapping
+
+from config import db, logger, run_db
+from scoring import ScoringEngine
+from catalog_sync import (
+    CATALOG_META_COLLECTION, CATALOG_META_DOCUMENT, CATALOG_VERSIONS_COLLECTION,
+    QUESTIONS_COLLECTION, catalog_version
+)
+
+try:
+    import brotli
+except ImportError:  # brotli необязателен - без него отдаем gzip
+    brotli = None
+
+# ============== КАТАЛОГ ВОПРОСОВ В ПАМЯТИ ==============
+# Вопросы читаются из Firestore один раз на процесс и раздаются из памяти.
+# Снимок заменяется целиком, когда меняется маркер версии meta/questions
+# (его обновляют скрипты загрузки вопросов, см. catalog_sync.py).
+#
+# Старые версии (на них ссылаются результаты и начатые тесты) поднимаются
+# из catalogVersions/{версия} по требованию и держатся в LRU-кэше.
+
+# Как часто (в секундах) сверять маркер версии с Firestore
+CATALOG_CHECK_INTERVAL = float(os.getenv("CATALOG_CHECK_INTERVAL", "30"))
+
+# Сколько версий каталога (вместе с текущей) держать в памяти
+CATALOG_CACHE_SIZE = max(1, int(os.getenv("CATALOG_CACHE_SIZE", "4")))
+
+
+class CatalogQuestion(NamedTuple):
+    """Вопрос каталога (неизменяемый)"""
+    id: str
+    number: int
+    text_ru: Optional[str]
+    text_kz: Optional[str]
+    types: Tuple[str, ...]
+    is_inverted: bool
+    points_if_yes: int
+    points_if_no: int
+
+    def text(self, lang: str) -> str:
+        """Текст вопроса на нужном языке (с откатом на русский)"""
+        text = self.text_kz if lang == "kz" else self.text_ru
+        if text is None:
+            text = self.text_ru or "Вопрос"
+        return text
+
+
+class QuestionsPayload(NamedTuple):
+    """Готовый ответ GET /questions для одного языка"""
+    body: bytes
+    gzip: bytes
+    br: Optional[bytes]
+    etag: str
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        if encoding == "br":
+            return self.br
+        if encoding == "gzip":
+            return self.gzip
+        return self.body
+
+
+LANGUAGES = ("ru", "kz")
+
+
+def build_questions_payload(questions: Tuple[CatalogQuestion, ...], lang: str,
+                            version: Optional[str] = None) -> QuestionsPayload:
+    """Сериализация и сжатие списка вопросов (один раз на версию каталога)"""
+    content = {"version": version, "questions": [
+        {
+            "id": q.id,
+            "number": q.number,
+            "text": q.text(lang),
+            "types": list(q.types),
+            "is_inverted": q.is_inverted
+        }
+        for q in questions
+    ]}
+    # Тот же формат, что у JSONResponse
+    body = json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    return QuestionsPayload(
+        body=body,
+        gzip=gzip.compress(body, compresslevel=9, mtime=0),
+        br=brotli.compress(body, quality=11) if brotli is not None else None,
+        etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    )
+
+
+class QuestionCatalog:
+    """
+    Неизменяемый снимок каталога вопросов одной версии
+    """
+
+    def __init__(self, version: Optional[str], questions: List[CatalogQuestion]):
+        self.version = version
+        self.questions: Tuple[CatalogQuestion, ...] = tuple(sorted(questions, key=lambda q: q.number))
+        self.by_id: Mapping[str, CatalogQuestion] = MappingProxyType({q.id: q for q in self.questions})
+        self.by_number: Mapping[int, CatalogQuestion] = MappingProxyType({q.number: q for q in self.questions})
+        # Вопросы по номеру в формате, который ждет scoring.calculate_score
+        self.scoring_map: Mapping[int, Mapping] = MappingProxyType({
+            q.number: MappingProxyType({
+                "types": list(q.types),
+                "pointsIfYes": q.points_if_yes,
+                "pointsIfNo": q.points_if_no
+            })
+            for q in self.questions
+        })
+        self.engine = ScoringEngine(self.scoring_map)
+        # Битовые маски вопросов, где "Да" / "Нет" дает балл (для листа ответов)
+        self.binary_points = all(
+            q.points_if_yes in (0, 1) and q.points_if_no in (0, 1) for q in self.questions
+        )
+        self.yes_point_mask = sum(1 << (q.number - 1) for q in self.questions if 0 < q.number and q.points_if_yes)
+        self.no_point_mask = sum(1 << (q.number - 1) for q in self.questions if 0 < q.number and q.points_if_no)
+        self.payloads: Mapping[str, QuestionsPayload] = MappingProxyType({
+            lang: build_questions_payload(self.questions, lang, version) for lang in LANGUAGES
+        })
+        self.loaded_at = time.time()
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+
+def question_from_document(doc_id: str, q_data: Dict) -> CatalogQuestion:
+    """Преобразование документа Firestore в вопрос каталога"""
+    return CatalogQuestion(
+        id=doc_id,
+        number=q_data.get("number", 0),
+        # Документы старого загрузчика хранят только русский текст в поле text
+        text_ru=q_data.get("text_ru", q_data.get("text")),
+        text_kz=q_data.get("text_kz"),
+        types=tuple(q_data.get("types", [])),
+        is_inverted=q_data.get("is_inverted", False),
+        points_if_yes=q_data.get("pointsIfYes", 1),
+        points_if_no=q_data.get("pointsIfNo", 0),
+    )
+
+
+_catalog: Optional[QuestionCatalog] = None
+_checked_at = 0.0
+_lock = Lock()
+
+# Версия -> снимок, в порядке последнего использования
+_versions: "OrderedDict[str, QuestionCatalog]" = OrderedDict()
+_versions_lock = Lock()
+
+
+def _read_version() -> Optional[str]:
+    marker = db.collection(CATALOG_META_COLLECTION).document(CATALOG_META_DOCUMENT).get()
+    if not marker.exists:
+        return None
+    return marker.to_dict().get("version")
+
+
+def _read_version_document(version: str) -> Optional[QuestionCatalog]:
+    """Снимок версии из catalogVersions (одно чтение) или None, если документа нет"""
+    version_doc = db.collection(CATALOG_VERSIONS_COLLECTION).document(version).get()
+    if not version_doc.exists:
+        return None
+    questions = [question_from_document(q["id"], q) for q in version_doc.to_dict().get("questions", [])]
+    return QuestionCatalog(version, questions)
+
+
+def _load_catalog(version: Optional[str]) -> QuestionCatalog:
+    if version is not None:
+        catalog = _read_version_document(version)
+        if catalog is not None:
+            logger.info(f"📚 Каталог вопросов загружен: версия {version}, вопросов {len(catalog)}")
+            return catalog
+    
+    # Версия не сохранена отдельным документом (загрузка до версионирования)
+    questions_ref = db.collection(QUESTIONS_COLLECTION).order_by("number").get()
+    questions = []
+    hashes = {}
+    for q in questions_ref:
+        q_data = q.to_dict()
+        questions.append(question_from_document(q.id, q_data))
+        hashes[q.id] = q_data.get("contentHash")
+    
+    # Версию считаем по самим документам: маркер мог смениться между чтениями
+    if hashes and all(hashes.values()):
+        version = catalog_version(hashes)
+    catalog = QuestionCatalog(version, questions)
+    logger.info(f"📚 Каталог вопросов загружен: версия {version}, вопросов {len(catalog)}")
+    return catalog
+
+
+def get_catalog() -> QuestionCatalog:
+    """
+    Текущий снимок каталога. Firestore читается только при первом обращении
+    и когда меняется маркер версии (проверяется не чаще CATALOG_CHECK_INTERVAL).
+    """
+    global _catalog, _checked_at
+
+    catalog = _catalog
+    if catalog is not None and time.monotonic() - _checked_at < CATALOG_CHECK_INTERVAL:
+        return catalog
+
+    with _lock:
+        catalog = _catalog
+        if catalog is not None and time.monotonic() - _checked_at < CATALOG_CHECK_INTERVAL:
+            return catalog
+
+        try:
+            version = _read_version()
+        except Exception as e:
+            if catalog is None:
+                raise
+            # Firestore недоступен - продолжаем отдавать старый снимок
+            logger.error(f"❌ Ошибка проверки версии каталога: {e}")
+            _checked_at = time.monotonic()
+            return catalog
+
+        if catalog is None or catalog.version != version:
+            _catalog = catalog = _cached_version(version) or _load_catalog(version)
+            _remember(catalog)
+        _checked_at = time.monotonic()
+        return catalog
+
+
+def _cached_version(version: Optional[str]) -> Optional[QuestionCatalog]:
+    with _versions_lock:
+        catalog = _versions.get(version)
+        if catalog is not None:
+            _versions.move_to_end(version)
+        return catalog
+
+
+def _remember(catalog: QuestionCatalog) -> None:
+    """Кладем снимок в кэш версий; вытесняем давно не использованные, кроме текущей"""
+    if catalog.version is None:
+        return
+    with _versions_lock:
+        _versions[catalog.version] = catalog
+        _versions.move_to_end(catalog.version)
+        current = _catalog.version if _catalog is not None else None
+        for version in list(_versions):
+            if len(_versions) <= CATALOG_CACHE_SIZE:
+                break
+            if version != current:
+                del _versions[version]
+                logger.info(f"🗑️ Версия каталога {version} вытеснена из памяти")
+
+
+def get_catalog_version(version: Optional[str]) -> Optional[QuestionCatalog]:
+    """
+    Снимок конкретной версии каталога (None - текущая).
+    Возвращает None, если такой версии нет.
+    """
+    catalog = get_catalog()
+    if version is None or version == catalog.version:
+        return catalog
+    
+    cached = _cached_version(version)
+    if cached is not None:
+        return cached
+    
+    with _lock:
+        # Версию могли загрузить, пока ждали блокировку
+        cached = _cached_version(version)
+        if cached is not None:
+            return cached
+        cached = _read_version_document(version)
+        if cached is None:
+            return None
+        logger.info(f"📚 Загружена версия каталога {version} (вопросов {len(cached)})")
+        _remember(cached)
+        return cached
+
+
+def invalidate_catalog() -> None:
+    """Принудительная сверка версии при следующем обращении (например, после загрузки вопросов)"""
+    global _checked_at
+    _checked_at = 0.0
+
+
+async def get_catalog_async(version: Optional[str] = None) -> Optional[QuestionCatalog]:
+    """
+    get_catalog_version для async-обработчиков: снимок из памяти без
+    переключения потоков, а если нужно сходить в Firestore - через пул run_db
+    """
+    catalog = _catalog
+    if catalog is not None and time.monotonic() - _checked_at < CATALOG_CHECK_INTERVAL:
+        if version is None or version == catalog.version:
+            return catalog
+        cached = _cached_version(version)
+        if cached is not None:
+            return cached
+    return await run_db(get_catalog_version, version)
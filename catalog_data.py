@@ -0,0 +1,72 @@
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List
+
+# ============== ФАЙЛ КАТАЛОГА ВОПРОСОВ ==============
+# Единый источник вопросов для скриптов загрузки, API и аналитики:
+# questions_catalog.json (тексты RU/KZ, маски шкал, ключи баллов).
+#
+#   "scales"    - порядок шкал; бит i маски вопроса = scales[i]
+#   "inverted"  - инвертированные (красные в Excel) вопросы
+#   "keys"      - ключи баллов: строка из 160 символов, символ n-1 -
+#                 какой ответ на вопрос n дает балл ("Y" - Да, "N" - Нет)
+#   "questions" - [номер, маска шкал, текст RU, текст KZ]
+
+CATALOG_DATA_PATH = os.getenv(
+    "CATALOG_DATA_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "questions_catalog.json")
+)
+
+CATALOG_DATA_FORMAT = 1
+
+# Ключ по Excel: инвертированные вопросы и вопросы Isk, где балл дает "Нет"
+DEFAULT_KEY = "excel"
+
+
+@lru_cache(maxsize=None)
+def load_catalog_data(path: str = CATALOG_DATA_PATH) -> Dict:
+    """Чтение и проверка файла каталога (один раз на процесс)"""
+    with open(path, "rb") as f:
+        data = json.loads(f.read())
+
+    if data.get("format") != CATALOG_DATA_FORMAT:
+        raise ValueError(f"Неподдерживаемый формат каталога: {data.get('format')}")
+    count = len(data["questions"])
+    for name, key in data["keys"].items():
+        if len(key) != count or set(key) - {"Y", "N"}:
+            raise ValueError(f"Ключ '{name}' не соответствует {count} вопросам")
+    return data
+
+
+def scale_types(mask: int, scales: List[str]) -> List[str]:
+    """Маска шкал -> список шкал вопроса"""
+    return [scale for i, scale in enumerate(scales) if mask >> i & 1]
+
+
+def build_questions(key: str = DEFAULT_KEY, bilingual: bool = True, path: str = CATALOG_DATA_PATH) -> Dict[str, Dict]:
+    """
+    Документы вопросов для Firestore: {id документа: данные вопроса}.
+    bilingual=False - старый формат с одним полем text (русский текст).
+    """
+    data = load_catalog_data(path)
+    points_key = data["keys"][key]
+    inverted = set(data["inverted"])
+
+    questions = {}
+    for i, (q_num, mask, text_ru, text_kz) in enumerate(data["questions"]):
+        no_gives_point = points_key[i] == "N"
+        q_data = {"number": q_num}
+        if bilingual:
+            q_data["text_ru"] = text_ru
+            q_data["text_kz"] = text_kz
+        else:
+            q_data["text"] = text_ru
+        q_data.update({
+            "types": scale_types(mask, data["scales"]),
+            "is_inverted": q_num in inverted,
+            "pointsIfYes": 0 if no_gives_point else 1,
+            "pointsIfNo": 1 if no_gives_point else 0
+        })
+        questions[f"q_{q_num}"] = q_data
+    return questions
@@ -0,0 +1,143 @@
+import hashlib
+import json
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+# ============== СИНХРОНИЗАЦИЯ КАТАЛОГА ВОПРОСОВ ==============
+# Вместо "удалить все и записать заново" сравниваем хэши содержимого
+# и пишем только изменившиеся вопросы. Изменения вопросов и новый маркер
+# версии meta/questions уходят одним batch-коммитом, поэтому читатели
+# видят либо старый каталог целиком, либо новый.
+#
+# Каждая версия дополнительно сохраняется одним неизменяемым документом
+# catalogVersions/{версия}: результаты ссылаются на версию, по которой
+# считались, и ее можно поднять, даже когда текущий каталог уже другой.
+
+QUESTIONS_COLLECTION = "questions"
+CATALOG_META_COLLECTION = "meta"
+CATALOG_META_DOCUMENT = "questions"
+CATALOG_VERSIONS_COLLECTION = "catalogVersions"
+
+# Поля, которые входят в хэш вопроса (служебные поля вроде created_at - нет)
+CONTENT_FIELDS = ("number", "text", "text_ru", "text_kz", "types", "is_inverted", "pointsIfYes", "pointsIfNo")
+
+# Ограничение Firestore на число операций в одном batch
+MAX_BATCH_WRITES = 500
+
+
+def question_hash(q_data: Dict) -> str:
+    """Хэш содержимого вопроса"""
+    content = {field: q_data[field] for field in CONTENT_FIELDS if field in q_data}
+    raw = json.dumps(content, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def catalog_version(hashes: Dict[str, str]) -> str:
+    """Версия каталога - хэш от хэшей всех вопросов"""
+    raw = ";".join(f"{doc_id}:{hashes[doc_id]}" for doc_id in sorted(hashes))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def version_document(version: str, questions: Dict[str, Dict], key: Optional[str] = None) -> Dict:
+    """Документ версии каталога: все вопросы одним списком (по номеру)"""
+    items = sorted(questions.items(), key=lambda item: item[1].get("number", 0))
+    return {
+        "version": version,
+        "key": key,
+        "count": len(items),
+        "questions": [
+            {"id": doc_id, **{field: q_data[field] for field in CONTENT_FIELDS if field in q_data}}
+            for doc_id, q_data in items
+        ],
+        "createdAt": datetime.now()
+    }
+
+
+def publish_version(db, questions: Dict[str, Dict], key: Optional[str] = None) -> Dict:
+    """
+    Сохранение версии каталога без переключения текущей (например, другой ключ
+    баллов). Версия определяется содержимым, поэтому повторная публикация
+    той же версии ничего не пишет.
+    """
+    version = catalog_version({doc_id: question_hash(q_data) for doc_id, q_data in questions.items()})
+    version_ref = db.collection(CATALOG_VERSIONS_COLLECTION).document(version)
+    published = not version_ref.get().exists
+    if published:
+        version_ref.set(version_document(version, questions, key))
+    return {"version": version, "published": published, "count": len(questions)}
+
+
+def _current_hashes(db, verify: bool) -> Tuple[Dict[str, str], Optional[str]]:
+    """
+    Хэши вопросов в базе и версия из маркера: из маркера (1 чтение)
+    или, если маркера с хэшами нет либо verify=True, по всей коллекции
+    """
+    marker = db.collection(CATALOG_META_COLLECTION).document(CATALOG_META_DOCUMENT).get()
+    marker_data = marker.to_dict() if marker.exists else {}
+    if not verify and marker_data.get("hashes") is not None:
+        return dict(marker_data["hashes"]), marker_data.get("version")
+
+    hashes = {}
+    for q in db.collection(QUESTIONS_COLLECTION).get():
+        q_data = q.to_dict()
+        # Для документов без хэша (старые загрузки) считаем его по содержимому
+        hashes[q.id] = q_data.get("contentHash") or question_hash(q_data)
+    return hashes, marker_data.get("version")
+
+
+def sync_questions(db, questions: Dict[str, Dict], verify: bool = False,
+                   progress: Optional[Callable[[str], None]] = None, key: Optional[str] = None) -> Dict:
+    """
+    Синхронизация коллекции questions с каталогом {id документа: данные вопроса}.
+    verify=True - сравнивать с реальными документами, а не с маркером версии.
+    progress - необязательный callback, получает название текущего этапа.
+    key - название ключа баллов (сохраняется в документе версии).
+    """
+    report = progress or (lambda stage: None)
+
+    report("hashing")
+    new_hashes = {doc_id: question_hash(q_data) for doc_id, q_data in questions.items()}
+    report("comparing")
+    old_hashes, old_version = _current_hashes(db, verify)
+
+    changed = [doc_id for doc_id, h in new_hashes.items() if old_hashes.get(doc_id) != h]
+    removed = [doc_id for doc_id in old_hashes if doc_id not in new_hashes]
+    version = catalog_version(new_hashes)
+
+    stats = {
+        "version": version,
+        "written": len(changed),
+        "deleted": len(removed),
+        "unchanged": len(new_hashes) - len(changed),
+    }
+    if not changed and not removed and old_version == version:
+        return stats  # ничего не изменилось - ни одной записи
+
+    if len(changed) + len(removed) + 2 > MAX_BATCH_WRITES:
+        raise ValueError(f"Слишком много изменений для одного коммита: {len(changed) + len(removed)}")
+
+    report("committing")
+    questions_ref = db.collection(QUESTIONS_COLLECTION)
+    batch = db.batch()
+    now = datetime.now()
+    for doc_id in changed:
+        batch.set(questions_ref.document(doc_id), {
+            **questions[doc_id],
+            "contentHash": new_hashes[doc_id],
+            "created_at": now
+        })
+    for doc_id in removed:
+        batch.delete(questions_ref.document(doc_id))
+
+    # Документ версии и маркер в том же коммите - API перечитает каталог вопросов
+    batch.set(db.collection(CATALOG_VERSIONS_COLLECTION).document(version),
+              version_document(version, questions, key))
+    batch.set(db.collection(CATALOG_META_COLLECTION).document(CATALOG_META_DOCUMENT), {
+        "version": version,
+        "key": key,
+        "count": len(new_hashes),
+        "hashes": new_hashes,
+        "updatedAt": now
+    })
+    batch.commit()
+    return stats
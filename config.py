@@ -1,14 +1,178 @@
 import firebase_admin
 from firebase_admin import credentials, firestore, auth
 import os
+import asyncio
+import atexit
+import queue
+import random
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from functools import partial
+from typing import Callable, Dict, Iterable
 from dotenv import load_dotenv
 import logging
+from logging.handlers import QueueHandler, QueueListener
+
+load_dotenv()
 
 # Логирование для отладки
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
 logger = logging.getLogger(__name__)
 
-load_dotenv()
+# ============== БЫСТРОЕ ЛОГИРОВАНИЕ ==============
+class DeferredQueueHandler(QueueHandler):
+    """
+    Кладет запись в очередь с готовым текстом сообщения - аргументы (dict,
+    list с данными пользователя) могут измениться до записи. Оформление
+    (время, уровень, traceback) - в потоке QueueListener.
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def setup_queue_logging() -> None:
+    """
+    Запись логов в отдельном потоке: обработчики корневого логгера
+    переносятся за очередь, обработчик запроса только кладет запись в очередь
+    """
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    if not handlers or any(isinstance(h, QueueHandler) for h in handlers):
+        return
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(DeferredQueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
+
+
+if os.getenv("LOG_QUEUE", "1") == "1":
+    setup_queue_logging()
+
+
+def _parse_sample_rates(value: str) -> dict:
+    """"/test/submit=0.01,/questions=0" -> {"/test/submit": 0.01, "/questions": 0.0}"""
+    rates = {}
+    for item in value.split(","):
+        route, _, rate = item.strip().partition("=")
+        if route and rate:
+            rates[route.strip()] = float(rate)
+    return rates
+
+
+# Доля запросов, для которых пишутся подробные диагностические логи
+LOG_SAMPLE_DEFAULT = float(os.getenv("LOG_SAMPLE_DEFAULT", "0"))
+LOG_SAMPLE_RATES = _parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+
+_verbose = ContextVar("log_verbose", default=False)
+_log_fields = ContextVar("log_fields", default=None)
+
+
+def start_request_log(route: str) -> dict:
+    """Начало запроса: решаем, пишем ли подробные логи, и заводим поля итоговой строки"""
+    rate = LOG_SAMPLE_RATES.get(route, LOG_SAMPLE_DEFAULT)
+    _verbose.set(rate > 0 and random.random() < rate)
+    fields = {}
+    _log_fields.set(fields)
+    return fields
+
+
+def verbose(msg: str, *args) -> None:
+    """Подробный лог - только для выбранных (sampled) запросов или при уровне DEBUG"""
+    if _verbose.get():
+        logger.info(msg, *args)
+    elif logger.isEnabledFor(logging.DEBUG):
+        logger.debug(msg, *args)
+
+
+def log_fields(**fields) -> None:
+    """Добавить поля в итоговую строку лога запроса"""
+    current = _log_fields.get()
+    if current is not None:
+        current.update(fields)
+
+# ============== ДОСТУП К FIRESTORE ИЗ ASYNC-ОБРАБОТЧИКОВ ==============
+# Клиент Firestore синхронный: каждый .get()/.commit() ждет сеть.
+# Обработчики FastAPI асинхронные, поэтому все обращения к базе идут
+# через ограниченный пул потоков и не блокируют event loop.
+# Вызовы сверх лимита ждут своей очереди (FIFO) в event loop, а не в
+# очереди пула потоков - так видно, сколько их и сколько они ждут.
+
+# Сколько запросов к Firestore одновременно выполняется на воркер
+DB_POOL_SIZE = max(1, int(os.getenv("DB_POOL_SIZE", "16")))
+
+_db_executor = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix="firestore")
+_db_slots = asyncio.Semaphore(DB_POOL_SIZE)
+
+_db_metrics = {
+    "calls": 0,
+    "inFlight": 0,
+    "maxInFlight": 0,
+    "waiting": 0,
+    "maxWaiting": 0,
+    "waited": 0,
+    "totalWaitMs": 0.0,
+    "maxWaitMs": 0.0
+}
+
+
+async def run_db(fn: Callable, *args, **kwargs):
+    """
+    Выполнить синхронный вызов Firestore в пуле потоков.
+    Контекст запроса (поля итоговой строки лога) передается в поток.
+    """
+    context = contextvars.copy_context()
+    if _db_slots.locked():
+        # Все места заняты - ждем в очереди и считаем ожидание
+        _db_metrics["waiting"] += 1
+        _db_metrics["maxWaiting"] = max(_db_metrics["maxWaiting"], _db_metrics["waiting"])
+        started = time.perf_counter()
+        try:
+            await _db_slots.acquire()
+        finally:
+            _db_metrics["waiting"] -= 1
+        waited = (time.perf_counter() - started) * 1000
+        _db_metrics["waited"] += 1
+        _db_metrics["totalWaitMs"] += waited
+        _db_metrics["maxWaitMs"] = max(_db_metrics["maxWaitMs"], waited)
+    else:
+        await _db_slots.acquire()
+    
+    _db_metrics["calls"] += 1
+    _db_metrics["inFlight"] += 1
+    _db_metrics["maxInFlight"] = max(_db_metrics["maxInFlight"], _db_metrics["inFlight"])
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            _db_executor, partial(context.run, fn, *args, **kwargs)
+        )
+    finally:
+        _db_metrics["inFlight"] -= 1
+        _db_slots.release()
+
+
+def db_metrics() -> Dict:
+    """Очередь к Firestore: вызовы, занятые места, ожидание места"""
+    return dict(
+        _db_metrics,
+        poolSize=DB_POOL_SIZE,
+        avgWaitMs=round(_db_metrics["totalWaitMs"] / max(1, _db_metrics["waited"]), 1)
+    )
+
+
+async def get_documents(refs: Iterable) -> Dict:
+    """Несколько документов одним запросом: {путь документа: снимок}"""
+    refs = list(refs)
+    if not refs:
+        return {}
+    snapshots = await run_db(lambda: list(db.get_all(refs)))
+    return {snap.reference.path: snap for snap in snapshots}
 
 # ============== FIREBASE INIT ==============
 def init_firebase():
@@ -0,0 +1,133 @@
+import os
+import time
+import asyncio
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Optional
+
+from firebase_admin import auth as firebase_auth
+
+from config import logger
+
+# ============== ПРОВЕРКА FIREBASE ID-ТОКЕНОВ ==============
+# Проверка подписи идет в отдельном пуле потоков, а не в event loop.
+# Проверенные токены кэшируются по хэшу до своего exp: повторный запрос
+# с тем же токеном (ретрай клиента, вход + регистрация) не проверяется заново.
+#
+# Небольшое расхождение часов ("Token used too early") допускается самой
+# проверкой (clock_skew_seconds), без повторов со sleep.
+#
+# Открытые ключи Google (сертификаты подписи) SDK берет через HTTP-кэш;
+# фоновая задача обновляет их заранее, чтобы вход не ждал сети. Публичного
+# способа прогреть этот кэш у SDK нет: используется его внутренний транспорт
+# (firebase-admin закреплен в requirements.txt). Если внутренности SDK
+# изменились, фоновое обновление отключается - ключи скачает первая
+# проверка токена, как без него.
+
+# Допустимое расхождение часов с серверами Google (секунды, 0..60)
+TOKEN_CLOCK_SKEW = min(60, max(0, int(os.getenv("TOKEN_CLOCK_SKEW", "10"))))
+# Сколько проверенных токенов держать в памяти
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+# Потоков для проверки подписи
+TOKEN_VERIFY_WORKERS = int(os.getenv("TOKEN_VERIFY_WORKERS", "4"))
+# Как часто обновлять сертификаты Google (секунды); они живут несколько часов
+TOKEN_CERTS_REFRESH_INTERVAL = float(os.getenv("TOKEN_CERTS_REFRESH_INTERVAL", "1800"))
+
+_verify_executor = ThreadPoolExecutor(max_workers=TOKEN_VERIFY_WORKERS, thread_name_prefix="token")
+
+# sha256 токена -> (claims, exp)
+_verified: "OrderedDict[str, tuple]" = OrderedDict()
+
+
+def _token_hash(id_token: str) -> str:
+    return hashlib.sha256(id_token.encode("utf-8")).hexdigest()
+
+
+def _cached_claims(key: str) -> Optional[Dict]:
+    entry = _verified.get(key)
+    if entry is None:
+        return None
+    claims, expires_at = entry
+    if time.time() >= expires_at:
+        del _verified[key]
+        return None
+    _verified.move_to_end(key)
+    return dict(claims)
+
+
+def _remember(key: str, claims: Dict) -> None:
+    _verified[key] = (claims, claims.get("exp", 0))
+    _verified.move_to_end(key)
+    while len(_verified) > TOKEN_CACHE_SIZE:
+        _verified.popitem(last=False)
+
+
+async def verify_id_token(id_token: str) -> Dict:
+    """
+    Проверенные claims токена (uid, email, ...). Ошибки - как у
+    firebase_auth.verify_id_token (недействительный, просроченный токен).
+    """
+    if not isinstance(id_token, str) or not id_token:
+        raise ValueError("Токен не передан")
+
+    key = _token_hash(id_token)
+    claims = _cached_claims(key)
+    if claims is not None:
+        return claims
+
+    claims = await asyncio.get_running_loop().run_in_executor(
+        _verify_executor,
+        partial(firebase_auth.verify_id_token, id_token, clock_skew_seconds=TOKEN_CLOCK_SKEW)
+    )
+    _remember(key, claims)
+    return dict(claims)
+
+
+def _refresh_certificates() -> bool:
+    """
+    Запрос сертификатов в обход HTTP-кэша SDK - свежий ответ ложится в этот
+    кэш. False - внутренности SDK изменились, прогревать нечего.
+    """
+    try:
+        verifier = firebase_auth._get_client(None)._token_verifier
+        request, cert_url = verifier.request, verifier.id_token_verifier.cert_url
+    except AttributeError as e:
+        logger.warning(f"⚠️ Кэш сертификатов firebase-admin недоступен ({e}) - фоновое обновление отключено")
+        return False
+    response = request(cert_url, "GET", headers={"Cache-Control": "no-cache"})
+    if response.status != 200:
+        raise RuntimeError(f"HTTP {response.status}")
+    return True
+
+
+class CertificateRefresher:
+    """Фоновое обновление сертификатов Google для проверки токенов"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            delay = TOKEN_CERTS_REFRESH_INTERVAL
+            try:
+                if not await loop.run_in_executor(_verify_executor, _refresh_certificates):
+                    return
+            except Exception as e:
+                # Не страшно: SDK скачает ключи сам при первой проверке
+                logger.warning(f"⚠️ Сертификаты Firebase не обновлены: {e}")
+                delay = min(delay, 60)
+            await asyncio.sleep(delay)
+
+
+certificate_refresher = CertificateRefresher()
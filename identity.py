@@ -0,0 +1,327 @@
+import os
+import time
+import inspect
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from urllib.parse import quote
+
+from firebase_admin import firestore
+from google.api_core.exceptions import AlreadyExists
+
+from config import db, logger, run_db
+
+# ============== ИНДЕКС ЛОГИНОВ, EMAIL И FIREBASE UID ==============
+# Вход ищет пользователя прямым чтением документа по ключу вместо запросов
+# по полям users:
+#
+#   identities/{вид}:{значение} -> userId
+#
+# Виды: login, email, uid (firebaseUid). Значения нормализуются (email -
+# в нижнем регистре). Логины повторяются в разных потоках - в индексе
+# последний созданный пользователь, как и раньше при входе.
+#
+# Записи индекса пишутся в том же batch, что и пользователь. Пользователи,
+# созданные до индекса, находятся старым запросом и сразу попадают в индекс;
+# весь индекс можно пересобрать через POST /admin/identities/rebuild. После
+# пересборки старый запрос не нужен: неизвестный логин - одно чтение индекса.
+#
+# Воркер помнит ключ -> userId в памяти, и повторный вход - одно чтение users/{id}.
+#
+# Регистрация выделяет логин по счетчику loginCounters/{базовый логин}
+# ({next: следующий суффикс}) и создает записи индекса login и email одной
+# транзакцией: чтение счетчика и email + коммит, сколько бы ни было занятых
+# логинов с той же базой. Записи индекса создаются с проверкой "не существует",
+# поэтому два одинаковых логина или email не пройдут и при гонке.
+
+IDENTITIES_COLLECTION = "identities"
+LOGIN_COUNTERS_COLLECTION = "loginCounters"
+# Отметка о полной пересборке индекса: после нее старые запросы при регистрации не нужны
+IDENTITIES_META = ("meta", "identities")
+
+# Поле документа пользователя для каждого вида ключа
+IDENTITY_FIELDS = {"login": "login", "email": "email", "uid": "firebaseUid"}
+
+# Сколько ключей воркер держит в памяти
+IDENTITY_CACHE_SIZE = int(os.getenv("IDENTITY_CACHE_SIZE", "100000"))
+
+# Записей в одном batch при пересборке (лимит Firestore - 500)
+REBUILD_BATCH_SIZE = 500
+
+# Попыток транзакции регистрации, если логин заняли в обход счетчика
+REGISTER_ATTEMPTS = 5
+# Сколько занятых логинов подряд проверяет одна транзакция; дальше счетчик
+# сдвигается, и следующая попытка продолжает с нового места
+REGISTER_LOGIN_PROBES = 20
+# Как часто перепроверять отметку о пересборке индекса (секунды)
+INDEX_COMPLETE_CHECK_INTERVAL = 300
+
+
+class EmailTakenError(Exception):
+    """Email уже зарегистрирован"""
+
+
+def normalize_identity(kind: str, value) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    value = unicodedata.normalize("NFC", value.strip())
+    if kind == "email":
+        value = value.lower()
+    return value or None
+
+
+def identity_key(kind: str, value) -> Optional[str]:
+    """Id документа индекса; None - значение пустое"""
+    normalized = normalize_identity(kind, value)
+    if normalized is None:
+        return None
+    # "/" и прочие служебные символы недопустимы в id документа Firestore
+    return f"{kind}:{_document_id(normalized)}"
+
+
+def identity_ref(key: str):
+    return db.collection(IDENTITIES_COLLECTION).document(key)
+
+
+def _document_id(value: str) -> str:
+    return quote(value, safe='@.+-_')
+
+
+def user_identities(user_data: Dict):
+    """(вид, ключ) для всех непустых ключей пользователя"""
+    for kind, field in IDENTITY_FIELDS.items():
+        key = identity_key(kind, user_data.get(field))
+        if key is not None:
+            yield kind, key
+
+
+def index_user(writer, user_id: str, user_data: Dict, kinds=tuple(IDENTITY_FIELDS)) -> None:
+    """Записи индекса для пользователя в batch или транзакцию writer"""
+    now = datetime.now()
+    for kind, key in user_identities(user_data):
+        if kind in kinds:
+            writer.set(identity_ref(key), {"kind": kind, "userId": user_id, "updatedAt": now})
+
+
+class IdentityIndex:
+    """Поиск пользователя по логину, email или Firebase UID"""
+
+    def __init__(self, size: int = IDENTITY_CACHE_SIZE):
+        self.size = size
+        self._user_ids: "OrderedDict[str, str]" = OrderedDict()
+
+    def remember(self, user_id: str, user_data: Dict) -> None:
+        """Ключи пользователя, только что записанные в индекс этим воркером"""
+        for _, key in user_identities(user_data):
+            self._put(key, user_id)
+
+    def _put(self, key: str, user_id: str) -> None:
+        self._user_ids[key] = user_id
+        self._user_ids.move_to_end(key)
+        while len(self._user_ids) > self.size:
+            self._user_ids.popitem(last=False)
+
+    @staticmethod
+    def _matches(snap, kind: str, value: str) -> bool:
+        if snap is None or not snap.exists:
+            return False
+        return normalize_identity(kind, snap.to_dict().get(IDENTITY_FIELDS[kind])) == value
+
+    async def resolve(self, kind: str, value, accept: Optional[Callable] = None):
+        """
+        Снимок документа пользователя или None. accept(user_id, user_data) -
+        проверка (может быть async) найденного по памяти воркера (например, пароль): если не прошла,
+        ключ ищется заново в индексе - другой воркер мог создать пользователя
+        с тем же логином.
+        """
+        key = identity_key(kind, value)
+        if key is None:
+            return None
+        raw, value = value.strip(), normalize_identity(kind, value)
+        users = db.collection("users")
+
+        user_id = self._user_ids.get(key)
+        if user_id is not None:
+            snap = await run_db(users.document(user_id).get)
+            if self._matches(snap, kind, value) and (accept is None or await _accepted(accept, snap)):
+                self._user_ids.move_to_end(key)
+                return snap
+            self._user_ids.pop(key, None)
+
+        entry = await run_db(identity_ref(key).get)
+        if entry.exists:
+            snap = await run_db(users.document(entry.to_dict()["userId"]).get)
+            if self._matches(snap, kind, value):
+                self._put(key, snap.id)
+                return snap
+            logger.warning(f"⚠️ Устаревшая запись индекса {key} - ищем пользователя заново")
+
+        if await _identities_complete_async():
+            return None
+        return await self._legacy_lookup(kind, key, raw)
+
+    async def _legacy_lookup(self, kind: str, key: str, value: str):
+        """Пользователь без записи в индексе: запрос по полю (как до индекса) и починка индекса"""
+        found = await run_db(db.collection("users").where(IDENTITY_FIELDS[kind], "==", value).get)
+        if not found:
+            return None
+        # Несколько пользователей с одним логином - последний созданный
+        snap = max(found, key=lambda s: _created_at(s.to_dict()))
+        await run_db(identity_ref(key).set, {"kind": kind, "userId": snap.id, "updatedAt": datetime.now()})
+        self._put(key, snap.id)
+        logger.info(f"🔧 Ключ {key} добавлен в индекс")
+        return snap
+
+
+async def _accepted(accept: Callable, snap) -> bool:
+    ok = accept(snap.id, snap.to_dict())
+    if inspect.isawaitable(ok):
+        ok = await ok
+    return bool(ok)
+
+
+def _created_at(user_data: Dict) -> float:
+    created_at = user_data.get("createdAt")
+    return created_at.timestamp() if isinstance(created_at, datetime) else float("-inf")
+
+
+def rebuild_identities(progress) -> Dict:
+    """Пересборка индекса по всей коллекции users (фоновая задача)"""
+    progress("reading")
+    newest: Dict[str, tuple] = {}
+    users = db.collection("users").get()
+    for snap in users:
+        user_data = snap.to_dict()
+        created_at = _created_at(user_data)
+        for kind, key in user_identities(user_data):
+            if key not in newest or created_at >= newest[key][2]:
+                newest[key] = (kind, snap.id, created_at)
+
+    progress("writing")
+    now = datetime.now()
+    items = list(newest.items())
+    for i in range(0, len(items), REBUILD_BATCH_SIZE):
+        batch = db.batch()
+        for key, (kind, user_id, _) in items[i:i + REBUILD_BATCH_SIZE]:
+            batch.set(identity_ref(key), {"kind": kind, "userId": user_id, "updatedAt": now})
+        batch.commit()
+
+    db.collection(IDENTITIES_META[0]).document(IDENTITIES_META[1]).set({"complete": True, "rebuiltAt": now})
+    logger.info(f"✅ Индекс пользователей пересобран: {len(items)} ключей, {len(users)} пользователей")
+    return {"users": len(users), "identities": len(items)}
+
+
+_index_complete = False
+_index_checked_at = float("-inf")
+
+
+def identities_complete() -> bool:
+    """Индекс пересобран по всем пользователям - значит, пользователей вне индекса нет"""
+    global _index_complete, _index_checked_at
+    if _index_complete or time.monotonic() - _index_checked_at < INDEX_COMPLETE_CHECK_INTERVAL:
+        return _index_complete
+    snap = db.collection(IDENTITIES_META[0]).document(IDENTITIES_META[1]).get()
+    _index_complete = snap.exists and bool(snap.to_dict().get("complete"))
+    _index_checked_at = time.monotonic()
+    return _index_complete
+
+
+async def _identities_complete_async() -> bool:
+    """identities_complete из обработчика: чтение отметки - только когда истек интервал проверки"""
+    if _index_complete or time.monotonic() - _index_checked_at < INDEX_COMPLETE_CHECK_INTERVAL:
+        return _index_complete
+    return await run_db(identities_complete)
+
+
+def _login_with_suffix(base: str, suffix: int) -> str:
+    return f"{base}{suffix}" if suffix else base
+
+
+def _first_free_suffix(base: str, taken) -> int:
+    """Как раньше: base, base1, base2, ... - первый свободный"""
+    suffix = 0
+    while _login_with_suffix(base, suffix) in taken:
+        suffix += 1
+    return suffix
+
+
+def _max_suffix(base: str, taken) -> int:
+    """Наибольший занятый суффикс: счетчик продолжает после него, а не после первой дыры"""
+    suffixes = [int(login[len(base):]) for login in taken if login[len(base):].isdigit()]
+    return max(suffixes, default=0)
+
+
+def register_user(user_ref, user_data: Dict, base_login: str) -> str:
+    """
+    Создание пользователя с уникальным логином на базе base_login и
+    уникальным email (user_data["email"]) одной транзакцией. Возвращает
+    выделенный логин; EmailTakenError - email уже зарегистрирован.
+    """
+    base = normalize_identity("login", base_login) or "user"
+    counter_ref = db.collection(LOGIN_COUNTERS_COLLECTION).document(_document_id(base))
+    email_key = identity_key("email", user_data.get("email"))
+    # Пока индекс не пересобран, email мог остаться только у старых пользователей
+    legacy_email = user_data.get("email") if not identities_complete() else None
+    users = db.collection("users")
+
+    def run(transaction, check_login: bool) -> Optional[str]:
+        refs = [counter_ref] + ([identity_ref(email_key)] if email_key else [])
+        snapshots = {snap.reference.path: snap for snap in transaction.get_all(refs)}
+        if email_key and snapshots[identity_ref(email_key).path].exists:
+            raise EmailTakenError(user_data.get("email"))
+        if legacy_email and users.where("email", "==", legacy_email).limit(1).get(transaction=transaction):
+            raise EmailTakenError(legacy_email)
+
+        counter = snapshots[counter_ref.path]
+        if counter.exists:
+            suffix = counter.to_dict().get("next", 1)
+            next_suffix = suffix + 1
+        else:
+            # База встречается впервые: занятые логины (в том числе созданные
+            # до счетчиков) - одним запросом по префиксу
+            found = users.where("login", ">=", base).where("login", "<", base + "\uf8ff") \
+                .select(["login"]).get(transaction=transaction)
+            taken = {snap.to_dict().get("login") for snap in found}
+            suffix = _first_free_suffix(base, taken)
+            next_suffix = max(suffix, _max_suffix(base, taken)) + 1
+
+        if check_login:
+            # Логин заняли в обход счетчика (генерация, оплата) - ищем следующий свободный
+            for _ in range(REGISTER_LOGIN_PROBES):
+                login_key = identity_key("login", _login_with_suffix(base, suffix))
+                if not next(iter(transaction.get_all([identity_ref(login_key)]))).exists:
+                    break
+                suffix += 1
+            else:
+                # Все проверенные заняты - сдвигаем счетчик, пользователя не создаем
+                transaction.set(counter_ref, {"base": base, "next": suffix, "updatedAt": datetime.now()})
+                return None
+            next_suffix = max(next_suffix, suffix + 1)
+
+        login = _login_with_suffix(base, suffix)
+        data = dict(user_data, login=login)
+        now = datetime.now()
+        transaction.set(counter_ref, {"base": base, "next": next_suffix, "updatedAt": now})
+        transaction.set(user_ref, data)
+        for kind, key in user_identities(data):
+            entry = {"kind": kind, "userId": user_ref.id, "updatedAt": now}
+            if kind == "uid":
+                transaction.set(identity_ref(key), entry)
+            else:
+                transaction.create(identity_ref(key), entry)
+        return login
+
+    for attempt in range(REGISTER_ATTEMPTS):
+        try:
+            login = firestore.transactional(run)(db.transaction(), attempt > 0)
+            if login is not None:
+                return login
+            logger.warning(f"⚠️ Логины {base} заняты подряд в обход счетчика, продолжаем с суффикса дальше")
+        except AlreadyExists:
+            # Запись индекса уже есть: email - ответит следующая попытка, логин - пропустим
+            logger.warning(f"⚠️ Логин {base} или email заняты параллельно, повторяем регистрацию")
+    raise RuntimeError(f"Не удалось выделить логин для {base}")
+
+
+identity_index = IdentityIndex()
@@ -0,0 +1,73 @@
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from config import logger
+
+# ============== ФОНОВЫЕ ЗАДАЧИ ==============
+# Долгие операции (например, загрузка вопросов) выполняются в пуле потоков,
+# не блокируя event loop. Состояние задачи можно запросить по ее id.
+
+# Сколько завершенных задач храним для запросов статуса
+MAX_FINISHED_JOBS = 50
+
+_jobs: Dict[str, Dict] = {}
+_tasks = set()
+
+
+def get_job(job_id: str) -> Optional[Dict]:
+    return _jobs.get(job_id)
+
+
+def start_job(name: str, fn: Callable[[Callable[[str], None]], Dict]) -> Dict:
+    """
+    Запуск fn(progress) в фоне. Если задача с таким именем уже выполняется,
+    возвращается она, а новая не запускается.
+    """
+    for job in _jobs.values():
+        if job["name"] == name and job["status"] in ("queued", "running"):
+            return job
+
+    job = {
+        "jobId": uuid.uuid4().hex,
+        "name": name,
+        "status": "queued",
+        "stage": None,
+        "createdAt": datetime.now(),
+        "startedAt": None,
+        "finishedAt": None,
+        "result": None,
+        "error": None
+    }
+    _jobs[job["jobId"]] = job
+    _forget_old_jobs()
+
+    task = asyncio.get_running_loop().create_task(_run(job, fn))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
+
+
+async def _run(job: Dict, fn: Callable) -> None:
+    def progress(stage: str) -> None:
+        job["stage"] = stage
+
+    job["status"] = "running"
+    job["startedAt"] = datetime.now()
+    try:
+        job["result"] = await asyncio.get_running_loop().run_in_executor(None, fn, progress)
+        job["status"] = "done"
+        logger.info(f"✅ Задача {job['name']} ({job['jobId']}) завершена: {job['result']}")
+    except Exception as e:
+        job["status"] = "error"
+        job["error"] = str(e)
+        logger.error(f"❌ Задача {job['name']} ({job['jobId']}) завершилась с ошибкой: {e}")
+    finally:
+        job["finishedAt"] = datetime.now()
+
+
+def _forget_old_jobs() -> None:
+    finished = [job for job in _jobs.values() if job["status"] in ("done", "error")]
+    for job in finished[:-MAX_FINISHED_JOBS]:
+        _jobs.pop(job["jobId"], None)
@@ -1,1072 +1,40 @@
-# import firebase_admin
-# from firebase_admin import credentials, firestore
-# from datetime import datetime
-# import logging
-
-# logging.basicConfig(level=logging.INFO)
-# logger = logging.getLogger(__name__)
-
-# # ============== ПОЛНЫЕ ТЕКСТЫ ВСЕХ 160 ВОПРОСОВ ИЗ EXCEL ==============
-# QUESTIONS_RU = {
-#     1: "Иногда мне в голову приходят такие мысли, что лучше никому о них не рассказывать.",
-#     2: "Я охотно принимаю участие во всех собраниях и других общественных мероприятиях.",
-#     3: "Часто какая-нибудь навязчивая мысль не дает мне заснуть.",
-#     4: "Временами у меня бывают приступы смеха или плача, с которыми я никак не могу справиться.",
-#     5: "Я сильно теряюсь, оказавшись неожиданно в центр внимания.",
-#     6: "Бывали случаи, что я не сдерживал своих обещаний.",
-#     7: "Критика, в том виде, в котором ее осуществляют многие люди, скорее выбивают меня из колеи, чем помогают.",
-#     8: "У меня часто болит голова.",
-#     9: "Если мое удачное замечание осталось незамеченным, я его не повторяю.",
-#     10: "Часто я склонен мысленно возвращаться к своим неприятностям, и мне трудно выбросить их из головы.",
-#     11: "Иногда я говорю неправду.",
-#     12: "В компании я чувствую себя неловко и из-за этого произвожу впечатление хуже, чем мог бы.",
-#     13: "Мне бывает трудно заснуть из-за беспокойства по поводу неудачи.",
-#     14: "Вставая утром, я часто чувствую себя усталым и разбитым.",
-#     15: "Раз в неделю или чаще я безо всякой видимой причины внезапно ощущаю жар во всем теле.",
-#     16: "Мне бывает трудно изложить свои мысли словами, поэтому я редко включаюсь в беседу.",
-#     17: "Бывает, что меня беспокоит чувство вины или угрызения совести из-за какого-нибудь пустяка.",
-#     18: "Бывало, что я говорил о вещах, в которых не разбираюсь.",
-#     19: "Бывает, что я передаю слухи.",
-#     20: "У меня бывают очень странные и необычные внутренние переживания.",
-#     21: "Уходя из дома, я часто беспокоюсь о том, что нужно сделать сегодня.",
-#     22: "Бывает, что у меня без особой причины кружится голова.",
-#     23: "Бывает, что я откладываю на завтра то, что нужно сделать сегодня.",
-#     24: "Я смущаюсь вступить в спор даже по хорошо известному мне вопросу.",
-#     25: "Я чрезмерно чувствителен и легко раним.",
-#     26: "Бывало, что я невежливо разговаривал с родителями.",
-#     27: "Иногда, когда я неважно себя чувствую, я бываю раздражительным.",
-#     28: "Мне, безусловно, не хватает уверенности в себе.",
-#     29: "Я часто упускаю возможность из-за своей внутренней нерешительности.",
-#     30: "Я довольно безразличен к тому, что со мной будет.",
-#     31: "Я всегда выполняю то, что мне говорят старшие.",
-#     32: "Я остро и длительно переживаю неудачи.",
-#     33: "Я склонен принимать все слишком близко к сердцу.",
-#     34: "Иногда я хвалю себя.",
-#     35: "Я считаю, что моя семейная жизнь такая же хорошая, как и у большинства моих знакомых.",
-#     36: "Я часто чувствую себя одиноким и никому ненужным.",
-#     37: "Временами я уверен в своей бесполезности.",
-#     38: "Мне часто говорят, что я вспыльчив.",
-#     39: "В игре я предпочитаю выигрывать.",
-#     40: "Мое настроение зависит от общества, в котором я нахожусь.",
-#     41: "Сон у меня обычно богат яркими сновидениями.",
-#     42: "Последние несколько лет большую часть времени я чувствую себя хорошо.",
-#     43: "Сейчас мой вес постоянен (я не худею и не полнею).",
-#     44: "Люблю костюмы яркие и броские.",
-#     45: "В необычной и привлекающей внимание одежде я чувствую себя прекрасно.",
-#     46: "Мне приятно иметь среди своих знакомых значительных людей. Это как бы придает мне вес в собственных глазах.",
-#     47: "Я был бы довольно спокоен, если бы у кого-нибудь из моей семьи были неприятности из-за нарушения закона.",
-#     48: "Больше всего со стороны окружающих я ценю внимание ко мне.",
-#     49: "Я люблю одежду модную и необычную, которая невольно привлекает взоры.",
-#     50: "С моим рассудком творится что-то неладное.",
-#     51: "Когда я пытаюсь что-то сказать, то часто замечаю, что у меня дрожат руки.",
-#     52: "Приключения и риск меня привлекают, когда в них достается первая роль.",
-#     53: "Я всегда стремлюсь быть среди людей, чтобы показать себя.",
-#     54: "Руки у меня такие же ловкие и проворные как и прежде.",
-#     55: "Среди моих знакомых есть люди, которые мне не нравятся.",
-#     56: "Я люблю опекать кого-нибудь, кто мне нравится.",
-#     57: "Я люблю быть первым, чтобы мне подражали, за мной бы следовали другие.",
-#     58: "Думаю, что я человек обреченный.",
-#     59: "С членами моей семьи ссорюсь редко (или не ссорюсь совсем).",
-#     60: "Иногда я ощущаю комок в горле или другие необычные ощущения.",
-#     61: "Я люблю, когда окружающие уделяют мне много внимания.",
-#     62: "Бывает, что я с кем-нибудь посплетничаю.",
-#     63: "Часто я вижу сны, о которых лучше никому не рассказывать.",
-#     64: "Ужасно не люблю всякие правила и ограничения, которые меня стесняют.",
-#     65: "Я очень люблю читать о преступлениях и таинственных приключениях.",
-#     66: "Бывало, что при обсуждении некоторых вопросов, я, особенно не задумываясь, соглашался с мнением других.",
-#     67: "В школе я усваивал материал медленнее, чем другие.",
-#     68: "Мне нравится участвовать в конкурсах художественной самодеятельности.",
-#     69: "Считаю, что очень важно, чтобы результат моей работы стал известен окружающим.",
-#     70: "Моя внешность меня, в общем, устраивает.",
-#     71: "Я вполне уверен в себе.",
-#     72: "Я способен совершить нечто выдающееся.",
-#     73: "Мне нравится выступать перед кем-нибудь.",
-#     74: "Раз в неделю или чаще я бываю очень возбужденным или взволнованным.",
-#     75: "Кто-то управляет моими мыслями.",
-#     76: "Я бы согласился выступать в роли конферансье (ведущего) на концерте у какой-нибудь знаменитости.",
-#     77: "Меня всегда раздражают люди, которые стремятся быть первыми в компании.",
-#     78: "На моё настроение существенно влияет погода.",
-#     79: "Бывает, что неприличная или даже непристойная шутка вызывает у меня смех.",
-#     80: "У меня портится настроение, я чувствую себя плохо, если окружающие не проявляют ко мне должного внимания.",
-#     81: "Мне нравится цитировать необычные (мудрые) высказывания знаменитых людей.",
-#     82: "Счастливей всего я бываю, когда один.",
-#     83: "Кто-то пытается воздействовать на мои мысли.",
-#     84: "В компаниях я почти всегда являюсь центром внимания.",
-#     85: "Я отношусь к таким людям, которые умеют восторгаться и преклоняться перед кем или чем-либо.",
-#     86: "Я часто копаюсь в своих недостатках.",
-#     87: "Даже среди людей я обычно чувствую себя одиноко.",
-#     88: "В компании я люблю рассказывать разные истории для того, чтобы завладеть общим вниманием.",
-#     89: "Мне нравится заводить знакомства с влиятельными и авторитетными людьми.",
-#     90: "Меня легко привести в замешательство.",
-#     91: "Я легко теряю терпение с людьми.",
-#     92: "Для меня свойственна некоторая капризность.",
-#     93: "Мне нравится, когда меня признают главой или зачинщиком.",
-#     94: "Часто мне хочется умереть.",
-#     95: "Почти каждый день случается что-нибудь, что пугает меня.",
-#     96: "Мне доставляет удовольствие совершать рискованные поступки, иногда ради забавы.",
-#     97: "У меня есть такие качества, по которым я определенно превосхожу других людей.",
-#     98: "Я очень последователен в своих религиозных убеждениях.",
-#     99: "Приступы плохого настроения у меня бывают редко.",
-#     100: "Я часто поступаю по настроению, а не по убеждению.",
-#     101: "Часто в споре я перехожу на личности.",
-#     102: "Я заслуживаю сурового наказания за свои поступки.",
-#     103: "У меня были очень необычные мистические переживания.",
-#     104: "Я не пойду на риск, если есть только малая надежда на успех.",
-#     105: "Если со мной поступают несправедливо, то я чувствую, что должен отплатить, хотя бы из принципа.",
-#     106: "У меня были периоды, когда из-за волнения я терял сон.",
-#     107: "Я человек нервный и легковозбудимый.",
-#     108: "Временами меня так и подмывает вступить с кем-нибудь в спор.",
-#     109: "Временами я так настаиваю на своем, что окружающие теряют со мной терпение.",
-#     110: "Мне кажется, что обоняние у меня такое же как и у других (не хуже).",
-#     111: "Все у меня получается плохо, не так, как надо.",
-#     112: "Я не могу до конца выслушать человека, если он, по моему мнению, говорит глупые вещи.",
-#     113: "Иногда мне хочется сделать что-либо опасное или ошеломляющее.",
-#     114: "Я почти всегда ощущаю сухость во рту.",
-#     115: "Большую часть времени я ощущаю себя усталым.",
-#     116: "Иногда я могу не сдержаться и нагрубить, даже если это повредит моим интересам.",
-#     117: "Довольно часто я действую под влиянием минутного настроения.",
-#     118: "Иногда я чувствую, что близок к нервному срыву.",
-#     119: "Меня очень раздражает то, что я забываю, куда кладу вещи.",
-#     120: "Когда на меня кричат, я отвечаю тем же.",
-#     121: "Обычно я готов на все, чтобы победить в споре.",
-#     122: "Я с трудом переношу время ожидания.",
-#     123: "Мне очень трудно приспособиться к новым условиям жизни, работы. Переход к новым условиям жизни, работы кажется невыносимо трудным.",
-#     124: "Часто я не уступаю другим не потому, что дело действительно важное, а просто из-за принципа.",
-#     125: "У меня часто плохое настроение.",
-#     126: "Мне кажется, что по отношению именно ко мне особенно часто поступают несправедливо.",
-#     127: "Я часто чувствую себя несправедливо обиженным.",
-#     128: "Я, наверное, человек раздражительный и вспыльчивый.",
-#     129: "Часто я завожусь с пол-оборота, быстро злюсь.",
-#     130: "Мое мнение часто не совпадает с мнением окружающих.",
-#     131: "Я часто испытываю чувство усталости от жизни и мне не хочется жить.",
-#     132: "Я против того, чтобы надо мной подшучивали.",
-#     133: "Меня сильно раздражают люди, которые лезут без очереди, и я им это высказываю или стараюсь не пускать.",
-#     134: "На меня обращают внимание чаще, чем на других.",
-#     135: "У меня бывают головные боли и головокружения из-за переживаний.",
-#     136: "Иногда я чувствую такую ярость, что хочется что-либо сломать.",
-#     137: "Я довольно часто совершаю поступки, о которых потом приходится сожалеть (чаще, чем другие).",
-#     138: "Я сильно раздражаюсь, если меня торопят или подгоняют.",
-#     139: "Часто у меня бывают периоды, когда мне никого не хочется видеть.",
-#     140: "Мне трудно проснуться в назначенный час.",
-#     141: "Иногда пустяк, сказанный в мой адрес, способен вызвать бурную реакцию.",
-#     142: "Если я считаю, что поступаю правильно, то мнение других людей меня мало интересует.",
-#     143: "Если в моих неудачах кто-то виноват, я не оставляю его безнаказанным.",
-#     144: "В детстве я был капризный и раздражительный.",
-#     145: "Терпеть не могу, если меня перебивают в то время, когда я занят.",
-#     146: "Мне очень трудно, почти невозможно смолчать за оскорбление.",
-#     147: "Мне известны случаи, когда мои родственники лечились у невропатологов и психиатров.",
-#     148: "Иногда я принимаю валериану и другие успокаивающие средства.",
-#     149: "Мне часто что-то быстро надоедает и я меняю (работу, место жительства).",
-#     150: "Я обычно не считаю нужным скрывать свое презрение или отрицательное мнение о ком-то или о чем-то.",
-#     151: "Я живу своими внутренними мыслями и меня мало интересует окружающее.",
-#     152: "Мои идеи и мысли выглядят, как опережающие время.",
-#     153: "Меня трудно рассердить.",
-#     154: "Я не очень лажу с людьми: мне не просто находить с ними общий язык.",
-#     155: "Я – труднодоступный для контакта человек.",
-#     156: "Меня уговорили поступать на эту работу, а самого особого желания нет.",
-#     157: "Люди меня считают спокойным и уравновешенным человеком.",
-#     158: "Среди моих знакомых (родственников) есть люди употребляющие наркотики.",
-#     159: "Временами я сожалею, что живу на этом свете.",
-#     160: "Я имею представление как выглядят некоторые наркотики."
-# }
-# # ============== ВОПРОСЫ ТЕСТА НА КАЗАХСКОМ ЯЗЫКЕ ==============
-# QUESTIONS_KZ = {
-#     1: "Кейде басқаға айтуға болмайтын ойлар басыма келеді.",
-#     2: "Мен барлық жиналыстар мен басқа да қоғамдық іс-шараларға ықыласпен қатысамын.",
-#     3: "Көбінесе бір көңілден кетпейтін ой мені ұйықтатпай қояды.",
-#     4: "Кейде өзімді ұстай алмай күлу немесе жылау ұстамалары болады.",
-#     5: "Кенеттен назар ортасында қалсам, қатты қобалжимын.",
-#     6: "Уәдемде тұрмайтын кездерім болды.",
-#     7: "Көп адамдар жасайтын сын маған көмектескеннен гөрі көңіл-күйімді түсіреді.",
-#     8: "Басым жиі ауырады.",
-#     9: "Егер менің тапқыр сөзім байқалмай қалса, оны қайталамаймын.",
-#     10: "Жиі қиыншылықтарымды ойлап, оларды ұмыта алмай қиналамын.",
-#     11: "Кейде өтірік айтамын.",
-#     12: "Компанияда өзімді ыңғайсыз сезініп, соған байланысты мүмкіндігімнен нашар көрінемін.",
-#     13: "Сәтсіздік туралы уайымдап, ұйықтай алмай қиналамын.",
-#     14: "Таңертең тұрғанда жиі шаршаған және әлсіз сезінемін.",
-#     15: "Аптасына бір рет немесе одан да жиі ешқандай себепсіз дене қызуым көтеріледі.",
-#     16: "Ойымды сөзбен жеткізу қиын, сондықтан әңгімеге сирек араласамын.",
-#     17: "Кейде бір болмашы нәрсе үшін кінәлі сезім немесе өкініш мазалайды.",
-#     18: "Білмейтін нәрселерім жайлы айтқан кездерім болды.",
-#     19: "Өсек таратқан кездерім болады.",
-#     20: "Менің өте оғаш және ерекше ішкі сезімдерім болады.",
-#     21: "Үйден шыққанда жиі бүгін істелуі керек нәрселер туралы уайымдаймын.",
-#     22: "Ешқандай себепсіз басым айналатын кездер болады.",
-#     23: "Бүгін істелуі керек нәрсені ертеңге қалдыратын кездерім болады.",
-#     24: "Жақсы білетін мәселемде де пікірталасқа түсуге ұяламын.",
-#     25: "Мен өте сезімталмын және тез ренжимін.",
-#     26: "Ата-анаммен әдепсіз сөйлескен кездерім болды.",
-#     27: "Кейде өзімді нашар сезінгенде ашушаң боламын.",
-#     28: "Маған сөзсіз өзіме деген сенімділік жетіспейді.",
-#     29: "Іштей шешімсіздігімнен жиі мүмкіндікті жіберіп аламын.",
-#     30: "Мен өз тағдырыма немқұрайлы қараймын.",
-#     31: "Үлкендердің айтқанын әрқашан орындаймын.",
-#     32: "Сәтсіздіктерді қатты және ұзақ бастан кешемін.",
-#     33: "Барлығын жүрекке тым жақын қабылдаймын.",
-#     34: "Кейде өзімді мақтаймын.",
-#     35: "Менің отбасылық өмірім таныстарымның көпшілігінің өміріндей жақсы деп ойлаймын.",
-#     36: "Өзімді жиі жалғыз және ешкімге қажетсіз сезінемін.",
-#     37: "Кейде өзімнің пайдасыз екеніме сенімді боламын.",
-#     38: "Маған жиі ашушаңсың дейді.",
-#     39: "Ойында ұтқанды қалаймын.",
-#     40: "Менің көңіл-күйім өзім жүрген ортаға байланысты.",
-#     41: "Ұйқым әдетте айқын түстерге бай.",
-#     42: "Соңғы бірнеше жылда көп уақыт өзімді жақсы сезінемін.",
-#     43: "Қазір салмағым тұрақты (арымаймын да, семірмеймін де).",
-#     44: "Жарқын әрі көзге түсетін костюмдерді ұнатамын.",
-#     45: "Ерекше және көз тартатын киімде өзімді тамаша сезінемін.",
-#     46: "Таныстарымның арасында маңызды адамдардың болғаны маған ұнайды. Бұл менің өз көзімдегі салмағымды арттырады.",
-#     47: "Егер менің отбасымның біреуі заң бұзғаны үшін қиындыққа тап болса, мен бұған сабырлы қарайтын едім.",
-#     48: "Айналамдағы адамдардың бойынан мен ең алдымен өзіме деген назарды бағалаймын.",
-#     49: "Мен сәнді және ерекше, көз тартатын киімдерді ұнатамын.",
-#     50: "Ақыл-есімде бір оғаштық бар.",
-#     51: "Бірдеңе айтайын дегенде қолымның дірілдегенін жиі байқаймын.",
-#     52: "Маған оқиға мен тәуекел, егер онда басты рөл тиесілі болса, тартымды.",
-#     53: "Мен әрқашан өзімді көрсету үшін адамдар арасында болуға ұмтыламын.",
-#     54: "Қолдарым бұрынғыдай епті және икемді.",
-#     55: "Таныстарымның арасында маған ұнамайтын адамдар бар.",
-#     56: "Маған ұнайтын адамға қамқорлық жасағанды ұнатамын.",
-#     57: "Маған бірінші болып, маған еліктеп, артымнан ергенді ұнатамын.",
-#     58: "Мен бақытсыздыққа ұшыраған адаммын деп ойлаймын.",
-#     59: "Отбасы мүшелерімен сирек ұрсысамын (немесе мүлдем ұрсыспаймын).",
-#     60: "Кейде тамағымда түйіршік немесе басқа да әдеттен тыс сезімдерді байқаймын.",
-#     61: "Мен айналамдағылардың маған көп көңіл бөлгенін ұнатамын.",
-#     62: "Кейде біреумен өсек айтысамын.",
-#     63: "Жиі ешкімге айтпаған дұрыс болатын түстер көремін.",
-#     64: "Мені шектейтін түрлі ережелер мен шектеулерді өте жек көремін.",
-#     65: "Мен қылмыс пен жұмбақ оқиғалар туралы оқығанды өте жақсы көремін.",
-#     66: "Кейбір мәселелерді талқылау кезінде мен ерекше ойланбастан басқалардың пікірімен келісетін кездерім болды.",
-#     67: "Мектепте материалды басқаларға қарағанда баяу меңгеретінмін.",
-#     68: "Маған көркемөнерпаздар байқауларына қатысқан ұнайды.",
-#     69: "Жұмысымның нәтижесі айналамдағыларға белгілі болуы өте маңызды деп есептеймін.",
-#     70: "Сыртқы келбетім, жалпы алғанда, өзіме ұнайды.",
-#     71: "Мен өзіме толық сенімдімін.",
-#     72: "Мен көрнекті бір нәрсе жасауға қабілеттімін.",
-#     73: "Маған біреудің алдында сөйлеген ұнайды.",
-#     74: "Аптасына бір рет немесе одан да жиі мен өте қозған немесе толқыған күйде боламын.",
-#     75: "Біреу менің ойларымды басқарады.",
-#     76: "Мен қандай да бір атақты адамның концертінде конферансье (жүргізуші) рөлінде өнер көрсетуге келісер едім.",
-#     77: "Мені әрқашан компанияда бірінші болуға ұмтылатын адамдар ашуландырады.",
-#     78: "Менің көңіл-күйіме ауа райы айтарлықтай әсер етеді.",
-#     79: "Кейде әдепсіз немесе тіпті былапыт әзіл мені күлдіреді.",
-#     80: "Егер айналамдағылар маған тиісті көңіл бөлмесе, көңіл-күйім бұзылып, өзімді жаман сезінемін.",
-#     81: "Маған атақты адамдардың әдеттен тыс (дана) сөздерін келтірген ұнайды.",
-#     82: "Мен ең бақытты жалғыз қалғанда боламын.",
-#     83: "Біреу менің ойларыма әсер етуге тырысады.",
-#     84: "Компанияларда мен әрдайым дерлік назар орталығында боламын.",
-#     85: "Мен біреуге немесе бір нәрсеге тәнті болып, табына алатын адамдардың қатарына жатамын.",
-#     86: "Мен жиі өзімнің кемшіліктерімді қазбалаймын.",
-#     87: "Тіпті адамдар арасында да мен өзімді әдетте жалғыз сезінемін.",
-#     88: "Компанияда жалпы назарды өзіме аудару үшін әртүрлі әңгімелер айтқанды ұнатамын.",
-#     89: "Маған ықпалды және беделді адамдармен танысқан ұнайды.",
-#     90: "Мені оңай абыржытуға болады.",
-#     91: "Мен адамдармен тез сабырымды жоғалтамын.",
-#     92: "Маған біршама еркелік тән.",
-#     93: "Мені басшы немесе бастамашы деп танығаны маған ұнайды.",
-#     94: "Жиі өлгім келеді.",
-#     95: "Мені қорқытатын нәрсе күн сайын дерлік болады.",
-#     96: "Маған тәуекелді әрекеттер жасау, кейде ойын-сауық үшін, рахат сыйлайды.",
-#     97: "Менде басқа адамдардан сөзсіз басым болатын қасиеттер бар.",
-#     98: "Мен діни нанымдарымда өте дәйектімін.",
-#     99: "Көңіл-күйімнің нашарлау ұстамалары менде сирек болады.",
-#     100: "Мен жиі сенімім бойынша емес, көңіл-күйім бойынша әрекет етемін.",
-#     101: "Жиі дау-дамайда мен жеке басқа көшемін.",
-#     102: "Мен іс-әрекеттерім үшін қатаң жазаға лайықпын.",
-#     103: "Менде өте ерекше мистикалық тәжірибелер болды.",
-#     104: "Егер сәттілікке деген үміт аз болса, мен тәуекелге бармаймын.",
-#     105: "Егер маған әділетсіздік жасалса, мен кек қайтаруым керек деп сезінемін, тіпті принцип бойынша болса да.",
-#     106: "Менде толқудан ұйқымды жоғалтатын кезеңдер болды.",
-#     107: "Мен жүйкесі жұқа және тез қозатын адаммын.",
-#     108: "Кейде мені біреумен пікірталасқа түскім келіп тұрады.",
-#     109: "Кейде мен өз ойымды қатты қорғаймын, айналамдағылар менен сабырын жоғалтады.",
-#     110: "Иіс сезу қабілетім басқалардікіндей (жаман емес) сияқты.",
-#     111: "Бәрі маған жаман, керек емес болып шығады.",
-#     112: "Егер адам менің ойымша ақымақ нәрселер айтса, мен оны соңына дейін тыңдай алмаймын.",
-#     113: "Кейде маған қауіпті немесе таңғаларлық нәрсе жасағым келеді.",
-#     114: "Мен әрдайым дерлік аузымның құрғағанын сеземін.",
-#     115: "Уақыттың көп бөлігінде өзімді шаршаған сезінемін.",
-#     116: "Кейде мен өзімді ұстай алмай, дөрекілік көрсетуім мүмкін, тіпті бұл менің мүдделеріме зиян тигізсе де.",
-#     117: "Жиі минуттық көңіл-күйдің әсерімен әрекет етемін.",
-#     118: "Кейде мен жүйке жұқаруына жақын екенімді сеземін.",
-#     119: "Заттарды қайда қойғанымды ұмытатыным мені қатты ашуландырады.",
-#     120: "Маған айқайлағанда, мен де солай жауап беремін.",
-#     121: "Әдетте дауда жеңу үшін бәріне дайынмын.",
-#     122: "Мен күту уақытын қиналып көтеремін.",
-#     123: "Маған өмірдің, жұмыстың жаңа жағдайларына бейімделу өте қиын. Өмірдің, жұмыстың жаңа жағдайларына көшу төзгісіз қиын болып көрінеді.",
-#     124: "Жиі мен басқаларға іс шынымен маңызды болғандықтан емес, жай ғана принцип бойынша жол бермеймін.",
-#     125: "Менің көңіл-күйім жиі нашар.",
-#     126: "Маған дәл маған қатысты әділетсіздік жиі жасалатын сияқты.",
-#     127: "Мен өзімді жиі әділетсіз ренжігендей сезінемін.",
-#     128: "Мен ашушаң және ызақор адам шығармын.",
-#     129: "Жиі мен жарты бұрылыстан іске қосыламын, тез ашуланамын.",
-#     130: "Менің пікірім жиі айналамдағылардың пікірімен сәйкес келмейді.",
-#     131: "Мен жиі өмірден шаршағанымды сезінемін және өмір сүргім келмейді.",
-#     132: "Мен үстімнен әзілдегендеріне қарсымын.",
-#     133: "Мені кезексіз кіріп келетін адамдар қатты ашуландырады, мен оларға оны айтамын немесе кіргізбеуге тырысамын.",
-#     134: "Маған басқаларға қарағанда жиі көңіл бөледі.",
-#     135: "Қобалжудан бас ауруы және бас айналу болады.",
-#     136: "Кейде мен ондай ашуланамын, бірдеңені сындырғым келеді.",
-#     137: "Мен өкінуге тура келетін әрекеттерді жиі жасаймын (басқаларға қарағанда жиі).",
-#     138: "Егер мені асықтырса немесе тездетсе, қатты ашуланамын.",
-#     139: "Жиі менде ешкімді көргім келмейтін кезеңдер болады.",
-#     140: "Маған белгіленген уақытта ояну қиын.",
-#     141: "Кейде менің атыма айтылған болмашы нәрсе қатты реакция тудыруы мүмкін.",
-#     142: "Егер мен дұрыс әрекет етіп жүрмін деп ойласам, онда басқа адамдардың пікірі мені аз қызықтырады.",
-#     143: "Егер менің сәтсіздіктеріме біреу кінәлі болса, мен оны жазасыз қалдырмаймын.",
-#     144: "Бала кезімде мен ерке және ашушаң едім.",
-#     145: "Мен бос емес кезімде мені бөлетіндерді шыдай алмаймын.",
-#     146: "Маған қорлыққа үндемеу өте қиын, мүмкін емес дерлік.",
-#     147: "Маған туыстарымның невропатологтар мен психиатрларда емделген жағдайлары белгілі.",
-#     148: "Кейде мен валериана және басқа да тыныштандыратын дәрілерді қабылдаймын.",
-#     149: "Маған бір нәрсе тез жалықтырады және мен ауыстырамын (жұмысты, тұрғылықты жерді).",
-#     150: "Мен әдетте біреуге немесе бір нәрсеге деген менсінбеушілігімді немесе теріс пікірімді жасыруды қажет деп санамаймын.",
-#     151: "Мен өзімнің ішкі ойларыммен өмір сүремін және мені қоршаған орта аз қызықтырады.",
-#     152: "Менің идеяларым мен ойларым уақытты озат болып көрінеді.",
-#     153: "Мені ашуландыру қиын.",
-#     154: "Мен адамдармен өте жақсы тіл табыса алмаймын: олармен ортақ тіл табу маған оңай емес.",
-#     155: "Мен – байланысқа қиын адаммын.",
-#     156: "Мені бұл жұмысқа түсуге көндірді, ал өзімнің ерекше ықыласым жоқ.",
-#     157: "Адамдар мені сабырлы және теңгерімді адам деп санайды.",
-#     158: "Менің таныстарымның (туыстарымның) арасында есірткі қолданатын адамдар бар.",
-#     159: "Кейде осы дүниеде өмір сүріп жатқаныма өкінемін.",
-#     160: "Мен кейбір есірткілердің қандай болатыны туралы түсінігім бар."
-# }
-# # Матрица принадлежности вопросов к шкалам
-# QUESTION_SCALES = {
-#     1:  {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     2:  {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     3:  {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-#     4:  {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 1},
-#     5:  {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-#     6:  {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     7:  {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-#     8:  {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     9:  {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-#     10: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 1},
-#     11: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     12: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-#     13: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-#     14: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-#     15: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     16: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-#     17: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-#     18: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     19: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     20: {"Isk": 0, "Con": 1, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 1},
-#     21: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-#     22: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     23: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     24: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-#     25: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     26: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     27: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     28: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-#     29: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-#     30: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     31: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     32: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 1},
-#     33: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 1},
-#     34: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     35: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     36: {"Isk": 0, "Con": 1, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 1},
-#     37: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 1},
-#     38: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     39: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     40: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     41: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     42: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     43: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     44: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     45: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     46: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     47: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     48: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     49: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     50: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     51: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     52: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     53: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     54: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     55: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     56: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     57: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     58: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     59: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     60: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 1},
-#     61: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     62: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     63: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     64: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     65: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     66: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     67: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     68: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     69: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     70: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     71: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     72: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     73: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     74: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     75: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     76: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     77: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     78: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     79: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     80: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     81: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     82: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     83: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     84: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     85: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     86: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     87: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     88: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     89: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     90: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     91: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     92: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     93: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     94: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     95: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     96: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     97: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-#     98: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     99: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     100: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     101: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     102: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     103: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     104: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     105: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     106: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     107: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     108: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     109: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     110: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     111: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     112: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     113: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     114: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     115: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     116: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     117: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     118: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     119: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     120: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     121: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     122: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     123: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     124: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     125: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-#     126: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     127: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     128: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-#     129: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-#     130: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     131: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     132: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     133: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-#     134: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     135: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     136: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-#     137: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-#     138: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-#     139: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     140: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     141: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     142: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     143: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     144: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     145: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-#     146: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-#     147: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     148: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     149: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     150: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     151: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     152: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     153: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     154: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-#     155: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     156: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     157: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-#     158: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-#     159: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-#     160: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-# }
-
-# # Инвертированные вопросы (красные в Excel)
-# INVERTED_QUESTIONS = {35, 42, 43, 71, 110, 153, 157}
-
-# def load_bilingual_questions():
-#     """Загрузка двуязычных вопросов в Firebase"""
-#     try:
-#         # Инициализация Firebase
-#         cred = credentials.Certificate("firebase-key.json")
-#         firebase_admin.initialize_app(cred)
-#         db = firestore.client()
-        
-#         print("🔥 Подключение к Firebase успешно!")
-        
-#         # Очищаем старые вопросы
-#         questions_ref = db.collection("questions")
-#         old_questions = questions_ref.get()
-#         batch = db.batch()
-#         for q in old_questions:
-#             batch.delete(q.reference)
-#         batch.commit()
-#         print(f"✅ Удалено {len(old_questions)} старых вопросов")
-        
-#         # Загружаем новые вопросы с двумя языками
-#         batch = db.batch()
-#         count = 0
-        
-#         for q_num in range(1, 161):
-#             if q_num in QUESTION_SCALES:
-#                 scale_map = QUESTION_SCALES[q_num]
-#                 types = [scale for scale, val in scale_map.items() if val == 1]
-                
-#                 q_ref = questions_ref.document(f"q_{q_num}")
-#                 q_data = {
-#                     "number": q_num,
-#                     "text_ru": QUESTIONS_RU.get(q_num, f"Вопрос {q_num}"),
-#                     "text_kz": QUESTIONS_KZ.get(q_num, f"Сұрақ {q_num}"),
-#                     "types": types,
-#                     "is_inverted": q_num in INVERTED_QUESTIONS,
-#                     "pointsIfYes": 0 if q_num in INVERTED_QUESTIONS else 1,
-#                     "pointsIfNo": 1 if q_num in INVERTED_QUESTIONS else 0,
-#                     "created_at": datetime.now()
-#                 }
-                
-#                 batch.set(q_ref, q_data)
-#                 count += 1
-                
-#                 if q_num % 20 == 0:
-#                     print(f"⏳ Подготовлено {q_num}/160 вопросов...")
-        
-#         batch.commit()
-#         print(f"\n✅ УСПЕХ! Загружено {count} двуязычных вопросов!")
-#         print(f"   - С инверсией: {len([q for q in INVERTED_QUESTIONS if q <= 160])}")
-        
-#         # Проверка
-#         check = questions_ref.limit(1).get()
-#         if check:
-#             print(f"\n📝 Пример вопроса в базе:")
-#             print(f"   ID: {check[0].id}")
-#             print(f"   Русский: {check[0].to_dict().get('text_ru')}")
-#             print(f"   Казахский: {check[0].to_dict().get('text_kz')}")
-        
-#     except Exception as e:
-#         print(f"❌ Ошибка: {e}")
-
-# if __name__ == "__main__":
-#     load_bilingual_questions()
+import sys
 import firebase_admin
 from firebase_admin import credentials, firestore
-from datetime import datetime
 import logging
 
+from catalog_data import DEFAULT_KEY, build_questions, load_catalog_data
+from catalog_sync import publish_version, sync_questions
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# ============== ПОЛНЫЕ ТЕКСТЫ ВСЕХ 160 ВОПРОСОВ ИЗ EXCEL ==============
-QUESTIONS_RU = {
-    1: "Иногда мне в голову приходят такие мысли, что лучше никому о них не рассказывать.",
-    2: "Я охотно принимаю участие во всех собраниях и других общественных мероприятиях.",
-    3: "Часто какая-нибудь навязчивая мысль не дает мне заснуть.",
-    4: "Временами у меня бывают приступы смеха или плача, с которыми я никак не могу справиться.",
-    5: "Я сильно теряюсь, оказавшись неожиданно в центр внимания.",
-    6: "Бывали случаи, что я не сдерживал своих обещаний.",
-    7: "Критика, в том виде, в котором ее осуществляют многие люди, скорее выбивают меня из колеи, чем помогают.",
-    8: "У меня часто болит голова.",
-    9: "Если мое удачное замечание осталось незамеченным, я его не повторяю.",
-    10: "Часто я склонен мысленно возвращаться к своим неприятностям, и мне трудно выбросить их из головы.",
-    11: "Иногда я говорю неправду.",
-    12: "В компании я чувствую себя неловко и из-за этого произвожу впечатление хуже, чем мог бы.",
-    13: "Мне бывает трудно заснуть из-за беспокойства по поводу неудачи.",
-    14: "Вставая утром, я часто чувствую себя усталым и разбитым.",
-    15: "Раз в неделю или чаще я безо всякой видимой причины внезапно ощущаю жар во всем теле.",
-    16: "Мне бывает трудно изложить свои мысли словами, поэтому я редко включаюсь в беседу.",
-    17: "Бывает, что меня беспокоит чувство вины или угрызения совести из-за какого-нибудь пустяка.",
-    18: "Бывало, что я говорил о вещах, в которых не разбираюсь.",
-    19: "Бывает, что я передаю слухи.",
-    20: "У меня бывают очень странные и необычные внутренние переживания.",
-    21: "Уходя из дома, я часто беспокоюсь о том, что нужно сделать сегодня.",
-    22: "Бывает, что у меня без особой причины кружится голова.",
-    23: "Бывает, что я откладываю на завтра то, что нужно сделать сегодня.",
-    24: "Я смущаюсь вступить в спор даже по хорошо известному мне вопросу.",
-    25: "Я чрезмерно чувствителен и легко раним.",
-    26: "Бывало, что я невежливо разговаривал с родителями.",
-    27: "Иногда, когда я неважно себя чувствую, я бываю раздражительным.",
-    28: "Мне, безусловно, не хватает уверенности в себе.",
-    29: "Я часто упускаю возможность из-за своей внутренней нерешительности.",
-    30: "Я довольно безразличен к тому, что со мной будет.",
-    31: "Я всегда выполняю то, что мне говорят старшие.",
-    32: "Я остро и длительно переживаю неудачи.",
-    33: "Я склонен принимать все слишком близко к сердцу.",
-    34: "Иногда я хвалю себя.",
-    35: "Я считаю, что моя семейная жизнь такая же хорошая, как и у большинства моих знакомых.",
-    36: "Я часто чувствую себя одиноким и никому ненужным.",
-    37: "Временами я уверен в своей бесполезности.",
-    38: "Мне часто говорят, что я вспыльчив.",
-    39: "В игре я предпочитаю выигрывать.",
-    40: "Мое настроение зависит от общества, в котором я нахожусь.",
-    41: "Сон у меня обычно богат яркими сновидениями.",
-    42: "Последние несколько лет большую часть времени я чувствую себя хорошо.",
-    43: "Сейчас мой вес постоянен (я не худею и не полнею).",
-    44: "Люблю костюмы яркие и броские.",
-    45: "В необычной и привлекающей внимание одежде я чувствую себя прекрасно.",
-    46: "Мне приятно иметь среди своих знакомых значительных людей. Это как бы придает мне вес в собственных глазах.",
-    47: "Я был бы довольно спокоен, если бы у кого-нибудь из моей семьи были неприятности из-за нарушения закона.",
-    48: "Больше всего со стороны окружающих я ценю внимание ко мне.",
-    49: "Я люблю одежду модную и необычную, которая невольно привлекает взоры.",
-    50: "С моим рассудком творится что-то неладное.",
-    51: "Когда я пытаюсь что-то сказать, то часто замечаю, что у меня дрожат руки.",
-    52: "Приключения и риск меня привлекают, когда в них достается первая роль.",
-    53: "Я всегда стремлюсь быть среди людей, чтобы показать себя.",
-    54: "Руки у меня такие же ловкие и проворные как и прежде.",
-    55: "Среди моих знакомых есть люди, которые мне не нравятся.",
-    56: "Я люблю опекать кого-нибудь, кто мне нравится.",
-    57: "Я люблю быть первым, чтобы мне подражали, за мной бы следовали другие.",
-    58: "Думаю, что я человек обреченный.",
-    59: "С членами моей семьи ссорюсь редко (или не ссорюсь совсем).",
-    60: "Иногда я ощущаю комок в горле или другие необычные ощущения.",
-    61: "Я люблю, когда окружающие уделяют мне много внимания.",
-    62: "Бывает, что я с кем-нибудь посплетничаю.",
-    63: "Часто я вижу сны, о которых лучше никому не рассказывать.",
-    64: "Ужасно не люблю всякие правила и ограничения, которые меня стесняют.",
-    65: "Я очень люблю читать о преступлениях и таинственных приключениях.",
-    66: "Бывало, что при обсуждении некоторых вопросов, я, особенно не задумываясь, соглашался с мнением других.",
-    67: "В школе я усваивал материал медленнее, чем другие.",
-    68: "Мне нравится участвовать в конкурсах художественной самодеятельности.",
-    69: "Считаю, что очень важно, чтобы результат моей работы стал известен окружающим.",
-    70: "Моя внешность меня, в общем, устраивает.",
-    71: "Я вполне уверен в себе.",
-    72: "Я способен совершить нечто выдающееся.",
-    73: "Мне нравится выступать перед кем-нибудь.",
-    74: "Раз в неделю или чаще я бываю очень возбужденным или взволнованным.",
-    75: "Кто-то управляет моими мыслями.",
-    76: "Я бы согласился выступать в роли конферансье (ведущего) на концерте у какой-нибудь знаменитости.",
-    77: "Меня всегда раздражают люди, которые стремятся быть первыми в компании.",
-    78: "На моё настроение существенно влияет погода.",
-    79: "Бывает, что неприличная или даже непристойная шутка вызывает у меня смех.",
-    80: "У меня портится настроение, я чувствую себя плохо, если окружающие не проявляют ко мне должного внимания.",
-    81: "Мне нравится цитировать необычные (мудрые) высказывания знаменитых людей.",
-    82: "Счастливей всего я бываю, когда один.",
-    83: "Кто-то пытается воздействовать на мои мысли.",
-    84: "В компаниях я почти всегда являюсь центром внимания.",
-    85: "Я отношусь к таким людям, которые умеют восторгаться и преклоняться перед кем или чем-либо.",
-    86: "Я часто копаюсь в своих недостатках.",
-    87: "Даже среди людей я обычно чувствую себя одиноко.",
-    88: "В компании я люблю рассказывать разные истории для того, чтобы завладеть общим вниманием.",
-    89: "Мне нравится заводить знакомства с влиятельными и авторитетными людьми.",
-    90: "Меня легко привести в замешательство.",
-    91: "Я легко теряю терпение с людьми.",
-    92: "Для меня свойственна некоторая капризность.",
-    93: "Мне нравится, когда меня признают главой или зачинщиком.",
-    94: "Часто мне хочется умереть.",
-    95: "Почти каждый день случается что-нибудь, что пугает меня.",
-    96: "Мне доставляет удовольствие совершать рискованные поступки, иногда ради забавы.",
-    97: "У меня есть такие качества, по которым я определенно превосхожу других людей.",
-    98: "Я очень последователен в своих религиозных убеждениях.",
-    99: "Приступы плохого настроения у меня бывают редко.",
-    100: "Я часто поступаю по настроению, а не по убеждению.",
-    101: "Часто в споре я перехожу на личности.",
-    102: "Я заслуживаю сурового наказания за свои поступки.",
-    103: "У меня были очень необычные мистические переживания.",
-    104: "Я не пойду на риск, если есть только малая надежда на успех.",
-    105: "Если со мной поступают несправедливо, то я чувствую, что должен отплатить, хотя бы из принципа.",
-    106: "У меня были периоды, когда из-за волнения я терял сон.",
-    107: "Я человек нервный и легковозбудимый.",
-    108: "Временами меня так и подмывает вступить с кем-нибудь в спор.",
-    109: "Временами я так настаиваю на своем, что окружающие теряют со мной терпение.",
-    110: "Мне кажется, что обоняние у меня такое же как и у других (не хуже).",
-    111: "Все у меня получается плохо, не так, как надо.",
-    112: "Я не могу до конца выслушать человека, если он, по моему мнению, говорит глупые вещи.",
-    113: "Иногда мне хочется сделать что-либо опасное или ошеломляющее.",
-    114: "Я почти всегда ощущаю сухость во рту.",
-    115: "Большую часть времени я ощущаю себя усталым.",
-    116: "Иногда я могу не сдержаться и нагрубить, даже если это повредит моим интересам.",
-    117: "Довольно часто я действую под влиянием минутного настроения.",
-    118: "Иногда я чувствую, что близок к нервному срыву.",
-    119: "Меня очень раздражает то, что я забываю, куда кладу вещи.",
-    120: "Когда на меня кричат, я отвечаю тем же.",
-    121: "Обычно я готов на все, чтобы победить в споре.",
-    122: "Я с трудом переношу время ожидания.",
-    123: "Мне очень трудно приспособиться к новым условиям жизни, работы. Переход к новым условиям жизни, работы кажется невыносимо трудным.",
-    124: "Часто я не уступаю другим не потому, что дело действительно важное, а просто из-за принципа.",
-    125: "У меня часто плохое настроение.",
-    126: "Мне кажется, что по отношению именно ко мне особенно часто поступают несправедливо.",
-    127: "Я часто чувствую себя несправедливо обиженным.",
-    128: "Я, наверное, человек раздражительный и вспыльчивый.",
-    129: "Часто я завожусь с пол-оборота, быстро злюсь.",
-    130: "Мое мнение часто не совпадает с мнением окружающих.",
-    131: "Я часто испытываю чувство усталости от жизни и мне не хочется жить.",
-    132: "Я против того, чтобы надо мной подшучивали.",
-    133: "Меня сильно раздражают люди, которые лезут без очереди, и я им это высказываю или стараюсь не пускать.",
-    134: "На меня обращают внимание чаще, чем на других.",
-    135: "У меня бывают головные боли и головокружения из-за переживаний.",
-    136: "Иногда я чувствую такую ярость, что хочется что-либо сломать.",
-    137: "Я довольно часто совершаю поступки, о которых потом приходится сожалеть (чаще, чем другие).",
-    138: "Я сильно раздражаюсь, если меня торопят или подгоняют.",
-    139: "Часто у меня бывают периоды, когда мне никого не хочется видеть.",
-    140: "Мне трудно проснуться в назначенный час.",
-    141: "Иногда пустяк, сказанный в мой адрес, способен вызвать бурную реакцию.",
-    142: "Если я считаю, что поступаю правильно, то мнение других людей меня мало интересует.",
-    143: "Если в моих неудачах кто-то виноват, я не оставляю его безнаказанным.",
-    144: "В детстве я был капризный и раздражительный.",
-    145: "Терпеть не могу, если меня перебивают в то время, когда я занят.",
-    146: "Мне очень трудно, почти невозможно смолчать за оскорбление.",
-    147: "Мне известны случаи, когда мои родственники лечились у невропатологов и психиатров.",
-    148: "Иногда я принимаю валериану и другие успокаивающие средства.",
-    149: "Мне часто что-то быстро надоедает и я меняю (работу, место жительства).",
-    150: "Я обычно не считаю нужным скрывать свое презрение или отрицательное мнение о ком-то или о чем-то.",
-    151: "Я живу своими внутренними мыслями и меня мало интересует окружающее.",
-    152: "Мои идеи и мысли выглядят, как опережающие время.",
-    153: "Меня трудно рассердить.",
-    154: "Я не очень лажу с людьми: мне не просто находить с ними общий язык.",
-    155: "Я – труднодоступный для контакта человек.",
-    156: "Меня уговорили поступать на эту работу, а самого особого желания нет.",
-    157: "Люди меня считают спокойным и уравновешенным человеком.",
-    158: "Среди моих знакомых (родственников) есть люди употребляющие наркотики.",
-    159: "Временами я сожалею, что живу на этом свете.",
-    160: "Я имею представление как выглядят некоторые наркотики."
-}
-# ============== ВОПРОСЫ ТЕСТА НА КАЗАХСКОМ ЯЗЫКЕ ==============
-QUESTIONS_KZ = {
-    1: "Кейде басқаға айтуға болмайтын ойлар басыма келеді.",
-    2: "Мен барлық жиналыстар мен басқа да қоғамдық іс-шараларға ықыласпен қатысамын.",
-    3: "Көбінесе бір көңілден кетпейтін ой мені ұйықтатпай қояды.",
-    4: "Кейде өзімді ұстай алмай күлу немесе жылау ұстамалары болады.",
-    5: "Кенеттен назар ортасында қалсам, қатты қобалжимын.",
-    6: "Уәдемде тұрмайтын кездерім болды.",
-    7: "Көп адамдар жасайтын сын маған көмектескеннен гөрі көңіл-күйімді түсіреді.",
-    8: "Басым жиі ауырады.",
-    9: "Егер менің тапқыр сөзім байқалмай қалса, оны қайталамаймын.",
-    10: "Жиі қиыншылықтарымды ойлап, оларды ұмыта алмай қиналамын.",
-    11: "Кейде өтірік айтамын.",
-    12: "Компанияда өзімді ыңғайсыз сезініп, соған байланысты мүмкіндігімнен нашар көрінемін.",
-    13: "Сәтсіздік туралы уайымдап, ұйықтай алмай қиналамын.",
-    14: "Таңертең тұрғанда жиі шаршаған және әлсіз сезінемін.",
-    15: "Аптасына бір рет немесе одан да жиі ешқандай себепсіз дене қызуым көтеріледі.",
-    16: "Ойымды сөзбен жеткізу қиын, сондықтан әңгімеге сирек араласамын.",
-    17: "Кейде бір болмашы нәрсе үшін кінәлі сезім немесе өкініш мазалайды.",
-    18: "Білмейтін нәрселерім жайлы айтқан кездерім болды.",
-    19: "Өсек таратқан кездерім болады.",
-    20: "Менің өте оғаш және ерекше ішкі сезімдерім болады.",
-    21: "Үйден шыққанда жиі бүгін істелуі керек нәрселер туралы уайымдаймын.",
-    22: "Ешқандай себепсіз басым айналатын кездер болады.",
-    23: "Бүгін істелуі керек нәрсені ертеңге қалдыратын кездерім болады.",
-    24: "Жақсы білетін мәселемде де пікірталасқа түсуге ұяламын.",
-    25: "Мен өте сезімталмын және тез ренжимін.",
-    26: "Ата-анаммен әдепсіз сөйлескен кездерім болды.",
-    27: "Кейде өзімді нашар сезінгенде ашушаң боламын.",
-    28: "Маған сөзсіз өзіме деген сенімділік жетіспейді.",
-    29: "Іштей шешімсіздігімнен жиі мүмкіндікті жіберіп аламын.",
-    30: "Мен өз тағдырыма немқұрайлы қараймын.",
-    31: "Үлкендердің айтқанын әрқашан орындаймын.",
-    32: "Сәтсіздіктерді қатты және ұзақ бастан кешемін.",
-    33: "Барлығын жүрекке тым жақын қабылдаймын.",
-    34: "Кейде өзімді мақтаймын.",
-    35: "Менің отбасылық өмірім таныстарымның көпшілігінің өміріндей жақсы деп ойлаймын.",
-    36: "Өзімді жиі жалғыз және ешкімге қажетсіз сезінемін.",
-    37: "Кейде өзімнің пайдасыз екеніме сенімді боламын.",
-    38: "Маған жиі ашушаңсың дейді.",
-    39: "Ойында ұтқанды қалаймын.",
-    40: "Менің көңіл-күйім өзім жүрген ортаға байланысты.",
-    41: "Ұйқым әдетте айқын түстерге бай.",
-    42: "Соңғы бірнеше жылда көп уақыт өзімді жақсы сезінемін.",
-    43: "Қазір салмағым тұрақты (арымаймын да, семірмеймін де).",
-    44: "Жарқын әрі көзге түсетін костюмдерді ұнатамын.",
-    45: "Ерекше және көз тартатын киімде өзімді тамаша сезінемін.",
-    46: "Таныстарымның арасында маңызды адамдардың болғаны маған ұнайды. Бұл менің өз көзімдегі салмағымды арттырады.",
-    47: "Егер менің отбасымның біреуі заң бұзғаны үшін қиындыққа тап болса, мен бұған сабырлы қарайтын едім.",
-    48: "Айналамдағы адамдардың бойынан мен ең алдымен өзіме деген назарды бағалаймын.",
-    49: "Мен сәнді және ерекше, көз тартатын киімдерді ұнатамын.",
-    50: "Ақыл-есімде бір оғаштық бар.",
-    51: "Бірдеңе айтайын дегенде қолымның дірілдегенін жиі байқаймын.",
-    52: "Маған оқиға мен тәуекел, егер онда басты рөл тиесілі болса, тартымды.",
-    53: "Мен әрқашан өзімді көрсету үшін адамдар арасында болуға ұмтыламын.",
-    54: "Қолдарым бұрынғыдай епті және икемді.",
-    55: "Таныстарымның арасында маған ұнамайтын адамдар бар.",
-    56: "Маған ұнайтын адамға қамқорлық жасағанды ұнатамын.",
-    57: "Маған бірінші болып, маған еліктеп, артымнан ергенді ұнатамын.",
-    58: "Мен бақытсыздыққа ұшыраған адаммын деп ойлаймын.",
-    59: "Отбасы мүшелерімен сирек ұрсысамын (немесе мүлдем ұрсыспаймын).",
-    60: "Кейде тамағымда түйіршік немесе басқа да әдеттен тыс сезімдерді байқаймын.",
-    61: "Мен айналамдағылардың маған көп көңіл бөлгенін ұнатамын.",
-    62: "Кейде біреумен өсек айтысамын.",
-    63: "Жиі ешкімге айтпаған дұрыс болатын түстер көремін.",
-    64: "Мені шектейтін түрлі ережелер мен шектеулерді өте жек көремін.",
-    65: "Мен қылмыс пен жұмбақ оқиғалар туралы оқығанды өте жақсы көремін.",
-    66: "Кейбір мәселелерді талқылау кезінде мен ерекше ойланбастан басқалардың пікірімен келісетін кездерім болды.",
-    67: "Мектепте материалды басқаларға қарағанда баяу меңгеретінмін.",
-    68: "Маған көркемөнерпаздар байқауларына қатысқан ұнайды.",
-    69: "Жұмысымның нәтижесі айналамдағыларға белгілі болуы өте маңызды деп есептеймін.",
-    70: "Сыртқы келбетім, жалпы алғанда, өзіме ұнайды.",
-    71: "Мен өзіме толық сенімдімін.",
-    72: "Мен көрнекті бір нәрсе жасауға қабілеттімін.",
-    73: "Маған біреудің алдында сөйлеген ұнайды.",
-    74: "Аптасына бір рет немесе одан да жиі мен өте қозған немесе толқыған күйде боламын.",
-    75: "Біреу менің ойларымды басқарады.",
-    76: "Мен қандай да бір атақты адамның концертінде конферансье (жүргізуші) рөлінде өнер көрсетуге келісер едім.",
-    77: "Мені әрқашан компанияда бірінші болуға ұмтылатын адамдар ашуландырады.",
-    78: "Менің көңіл-күйіме ауа райы айтарлықтай әсер етеді.",
-    79: "Кейде әдепсіз немесе тіпті былапыт әзіл мені күлдіреді.",
-    80: "Егер айналамдағылар маған тиісті көңіл бөлмесе, көңіл-күйім бұзылып, өзімді жаман сезінемін.",
-    81: "Маған атақты адамдардың әдеттен тыс (дана) сөздерін келтірген ұнайды.",
-    82: "Мен ең бақытты жалғыз қалғанда боламын.",
-    83: "Біреу менің ойларыма әсер етуге тырысады.",
-    84: "Компанияларда мен әрдайым дерлік назар орталығында боламын.",
-    85: "Мен біреуге немесе бір нәрсеге тәнті болып, табына алатын адамдардың қатарына жатамын.",
-    86: "Мен жиі өзімнің кемшіліктерімді қазбалаймын.",
-    87: "Тіпті адамдар арасында да мен өзімді әдетте жалғыз сезінемін.",
-    88: "Компанияда жалпы назарды өзіме аудару үшін әртүрлі әңгімелер айтқанды ұнатамын.",
-    89: "Маған ықпалды және беделді адамдармен танысқан ұнайды.",
-    90: "Мені оңай абыржытуға болады.",
-    91: "Мен адамдармен тез сабырымды жоғалтамын.",
-    92: "Маған біршама еркелік тән.",
-    93: "Мені басшы немесе бастамашы деп танығаны маған ұнайды.",
-    94: "Жиі өлгім келеді.",
-    95: "Мені қорқытатын нәрсе күн сайын дерлік болады.",
-    96: "Маған тәуекелді әрекеттер жасау, кейде ойын-сауық үшін, рахат сыйлайды.",
-    97: "Менде басқа адамдардан сөзсіз басым болатын қасиеттер бар.",
-    98: "Мен діни нанымдарымда өте дәйектімін.",
-    99: "Көңіл-күйімнің нашарлау ұстамалары менде сирек болады.",
-    100: "Мен жиі сенімім бойынша емес, көңіл-күйім бойынша әрекет етемін.",
-    101: "Жиі дау-дамайда мен жеке басқа көшемін.",
-    102: "Мен іс-әрекеттерім үшін қатаң жазаға лайықпын.",
-    103: "Менде өте ерекше мистикалық тәжірибелер болды.",
-    104: "Егер сәттілікке деген үміт аз болса, мен тәуекелге бармаймын.",
-    105: "Егер маған әділетсіздік жасалса, мен кек қайтаруым керек деп сезінемін, тіпті принцип бойынша болса да.",
-    106: "Менде толқудан ұйқымды жоғалтатын кезеңдер болды.",
-    107: "Мен жүйкесі жұқа және тез қозатын адаммын.",
-    108: "Кейде мені біреумен пікірталасқа түскім келіп тұрады.",
-    109: "Кейде мен өз ойымды қатты қорғаймын, айналамдағылар менен сабырын жоғалтады.",
-    110: "Иіс сезу қабілетім басқалардікіндей (жаман емес) сияқты.",
-    111: "Бәрі маған жаман, керек емес болып шығады.",
-    112: "Егер адам менің ойымша ақымақ нәрселер айтса, мен оны соңына дейін тыңдай алмаймын.",
-    113: "Кейде маған қауіпті немесе таңғаларлық нәрсе жасағым келеді.",
-    114: "Мен әрдайым дерлік аузымның құрғағанын сеземін.",
-    115: "Уақыттың көп бөлігінде өзімді шаршаған сезінемін.",
-    116: "Кейде мен өзімді ұстай алмай, дөрекілік көрсетуім мүмкін, тіпті бұл менің мүдделеріме зиян тигізсе де.",
-    117: "Жиі минуттық көңіл-күйдің әсерімен әрекет етемін.",
-    118: "Кейде мен жүйке жұқаруына жақын екенімді сеземін.",
-    119: "Заттарды қайда қойғанымды ұмытатыным мені қатты ашуландырады.",
-    120: "Маған айқайлағанда, мен де солай жауап беремін.",
-    121: "Әдетте дауда жеңу үшін бәріне дайынмын.",
-    122: "Мен күту уақытын қиналып көтеремін.",
-    123: "Маған өмірдің, жұмыстың жаңа жағдайларына бейімделу өте қиын. Өмірдің, жұмыстың жаңа жағдайларына көшу төзгісіз қиын болып көрінеді.",
-    124: "Жиі мен басқаларға іс шынымен маңызды болғандықтан емес, жай ғана принцип бойынша жол бермеймін.",
-    125: "Менің көңіл-күйім жиі нашар.",
-    126: "Маған дәл маған қатысты әділетсіздік жиі жасалатын сияқты.",
-    127: "Мен өзімді жиі әділетсіз ренжігендей сезінемін.",
-    128: "Мен ашушаң және ызақор адам шығармын.",
-    129: "Жиі мен жарты бұрылыстан іске қосыламын, тез ашуланамын.",
-    130: "Менің пікірім жиі айналамдағылардың пікірімен сәйкес келмейді.",
-    131: "Мен жиі өмірден шаршағанымды сезінемін және өмір сүргім келмейді.",
-    132: "Мен үстімнен әзілдегендеріне қарсымын.",
-    133: "Мені кезексіз кіріп келетін адамдар қатты ашуландырады, мен оларға оны айтамын немесе кіргізбеуге тырысамын.",
-    134: "Маған басқаларға қарағанда жиі көңіл бөледі.",
-    135: "Қобалжудан бас ауруы және бас айналу болады.",
-    136: "Кейде мен ондай ашуланамын, бірдеңені сындырғым келеді.",
-    137: "Мен өкінуге тура келетін әрекеттерді жиі жасаймын (басқаларға қарағанда жиі).",
-    138: "Егер мені асықтырса немесе тездетсе, қатты ашуланамын.",
-    139: "Жиі менде ешкімді көргім келмейтін кезеңдер болады.",
-    140: "Маған белгіленген уақытта ояну қиын.",
-    141: "Кейде менің атыма айтылған болмашы нәрсе қатты реакция тудыруы мүмкін.",
-    142: "Егер мен дұрыс әрекет етіп жүрмін деп ойласам, онда басқа адамдардың пікірі мені аз қызықтырады.",
-    143: "Егер менің сәтсіздіктеріме біреу кінәлі болса, мен оны жазасыз қалдырмаймын.",
-    144: "Бала кезімде мен ерке және ашушаң едім.",
-    145: "Мен бос емес кезімде мені бөлетіндерді шыдай алмаймын.",
-    146: "Маған қорлыққа үндемеу өте қиын, мүмкін емес дерлік.",
-    147: "Маған туыстарымның невропатологтар мен психиатрларда емделген жағдайлары белгілі.",
-    148: "Кейде мен валериана және басқа да тыныштандыратын дәрілерді қабылдаймын.",
-    149: "Маған бір нәрсе тез жалықтырады және мен ауыстырамын (жұмысты, тұрғылықты жерді).",
-    150: "Мен әдетте біреуге немесе бір нәрсеге деген менсінбеушілігімді немесе теріс пікірімді жасыруды қажет деп санамаймын.",
-    151: "Мен өзімнің ішкі ойларыммен өмір сүремін және мені қоршаған орта аз қызықтырады.",
-    152: "Менің идеяларым мен ойларым уақытты озат болып көрінеді.",
-    153: "Мені ашуландыру қиын.",
-    154: "Мен адамдармен өте жақсы тіл табыса алмаймын: олармен ортақ тіл табу маған оңай емес.",
-    155: "Мен – байланысқа қиын адаммын.",
-    156: "Мені бұл жұмысқа түсуге көндірді, ал өзімнің ерекше ықыласым жоқ.",
-    157: "Адамдар мені сабырлы және теңгерімді адам деп санайды.",
-    158: "Менің таныстарымның (туыстарымның) арасында есірткі қолданатын адамдар бар.",
-    159: "Кейде осы дүниеде өмір сүріп жатқаныма өкінемін.",
-    160: "Мен кейбір есірткілердің қандай болатыны туралы түсінігім бар."
-}
-# Матрица принадлежности вопросов к шкалам
-QUESTION_SCALES = {
-    1:  {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    2:  {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    3:  {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    4:  {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 1},
-    5:  {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    6:  {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    7:  {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    8:  {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    9:  {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    10: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 1},
-    11: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    12: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    13: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    14: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    15: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    16: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    17: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    18: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    19: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    20: {"Isk": 0, "Con": 1, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 1},
-    21: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    22: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    23: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    24: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    25: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    26: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    27: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    28: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    29: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    30: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    31: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    32: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 1},
-    33: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 1},
-    34: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    35: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    36: {"Isk": 0, "Con": 1, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 1},
-    37: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 1},
-    38: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    39: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    40: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    41: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    42: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    43: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    44: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    45: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    46: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    47: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    48: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    49: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    50: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    51: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    52: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    53: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    54: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    55: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    56: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    57: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    58: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    59: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    60: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 1},
-    61: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    62: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    63: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    64: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    65: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    66: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    67: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    68: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    69: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    70: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    71: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    72: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    73: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    74: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    75: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    76: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    77: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    78: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    79: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    80: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    81: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    82: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    83: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    84: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    85: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    86: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    87: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    88: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    89: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    90: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    91: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    92: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    93: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    94: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    95: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    96: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    97: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    98: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    99: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    100: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    101: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    102: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    103: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    104: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    105: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    106: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    107: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    108: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    109: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    110: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    111: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    112: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    113: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    114: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    115: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    116: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    117: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    118: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    119: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    120: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    121: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    122: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    123: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    124: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    125: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    126: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    127: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    128: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    129: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    130: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    131: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    132: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    133: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    134: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    135: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    136: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    137: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    138: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    139: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    140: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    141: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    142: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    143: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    144: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    145: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    146: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    147: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    148: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    149: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    150: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    151: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    152: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    153: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    154: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    155: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    156: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    157: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    158: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    159: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    160: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-}
+# Тексты вопросов, шкалы и ключи баллов хранятся в questions_catalog.json
+
+def build_bilingual_questions(key: str = DEFAULT_KEY) -> dict:
+    """Двуязычный каталог: {id документа: данные вопроса}"""
+    return build_questions(key, bilingual=True)
 
-# Инвертированные вопросы (красные в Excel)
-INVERTED_QUESTIONS = {35, 42, 43, 71, 110, 153, 157}
+def sync_catalog(db, verify: bool = False, progress=None, key: str = DEFAULT_KEY, activate: bool = True) -> dict:
+    """
+    Синхронизация каталога с Firestore через переданный клиент
+    (используется и скриптом, и API). Пишем только изменившиеся вопросы,
+    версия меняется одним коммитом.
+    activate=False - только сохранить версию, текущий каталог не менять.
+    """
+    questions = build_bilingual_questions(key)
+    if not activate:
+        return publish_version(db, questions, key)
+    stats = sync_questions(db, questions, verify=verify, progress=progress, key=key)
+    stats["count"] = len(questions)
+    return stats
 
-# ВОПРОСЫ ГДЕ "НЕТ" ДАЕТ БАЛЛ (из колонки E в Excel)
-QUESTIONS_WHERE_NO_GIVES_POINT = {
-    1, 6, 11, 18, 19, 23, 26, 27, 34, 39, 46, 55, 62, 66, 79
-}
+def key_from_argv() -> str:
+    """Ключ баллов из аргумента --key=<название> (по умолчанию ключ по Excel)"""
+    for arg in sys.argv[1:]:
+        if arg.startswith("--key="):
+            return arg.removeprefix("--key=")
+    return DEFAULT_KEY
 
 def load_bilingual_questions():
     """Загрузка двуязычных вопросов в Firebase"""
@@ -1078,72 +46,28 @@ def load_bilingual_questions():
         
         print("🔥 Подключение к Firebase успешно!")
         
-        # Очищаем старые вопросы
-        questions_ref = db.collection("questions")
-        old_questions = questions_ref.get()
-        batch = db.batch()
-        for q in old_questions:
-            batch.delete(q.reference)
-        batch.commit()
-        print(f"✅ Удалено {len(old_questions)} старых вопросов")
-        
-        # Загружаем новые вопросы с двумя языками
-        batch = db.batch()
-        count = 0
+        if "--publish-only" in sys.argv:
+            # Сохранить версию (например, с другим ключом) без переключения
+            stats = sync_catalog(db, key=key_from_argv(), activate=False)
+            print(f"\n✅ Версия {stats['version']} ({stats['count']} вопросов) "
+                  f"{'сохранена' if stats['published'] else 'уже существует'}")
+            return
         
-        for q_num in range(1, 161):
-            if q_num in QUESTION_SCALES:
-                scale_map = QUESTION_SCALES[q_num]
-                types = [scale for scale, val in scale_map.items() if val == 1]
-                
-                # Определяем баллы за ответы на основе Excel
-                if q_num in INVERTED_QUESTIONS:
-                    # Красные вопросы: Да=0, Нет=1
-                    pointsIfYes = 0
-                    pointsIfNo = 1
-                elif q_num in QUESTIONS_WHERE_NO_GIVES_POINT:
-                    # Вопросы из колонки E (Нет дает балл)
-                    pointsIfYes = 0
-                    pointsIfNo = 1
-                else:
-                    # Обычные вопросы из колонки D (Да дает балл)
-                    pointsIfYes = 1
-                    pointsIfNo = 0
-                
-                q_ref = questions_ref.document(f"q_{q_num}")
-                q_data = {
-                    "number": q_num,
-                    "text_ru": QUESTIONS_RU.get(q_num, f"Вопрос {q_num}"),
-                    "text_kz": QUESTIONS_KZ.get(q_num, f"Сұрақ {q_num}"),
-                    "types": types,
-                    "is_inverted": q_num in INVERTED_QUESTIONS,
-                    "pointsIfYes": pointsIfYes,
-                    "pointsIfNo": pointsIfNo,
-                    "created_at": datetime.now()
-                }
-                
-                batch.set(q_ref, q_data)
-                count += 1
-                
-                if q_num % 20 == 0:
-                    print(f"⏳ Подготовлено {q_num}/160 вопросов...")
+        stats = sync_catalog(db, verify="--verify" in sys.argv, key=key_from_argv())
+        count = stats["count"]
         
-        batch.commit()
-        print(f"\n✅ УСПЕХ! Загружено {count} двуязычных вопросов!")
-        print(f"   - С инверсией (красные): {len([q for q in INVERTED_QUESTIONS if q <= 160])}")
-        print(f"   - 'Нет' дает балл (Isk): {len([q for q in QUESTIONS_WHERE_NO_GIVES_POINT if q <= 160])}")
-        print(f"   - 'Да' дает балл: {count - len(INVERTED_QUESTIONS) - len(QUESTIONS_WHERE_NO_GIVES_POINT)}")
+        data = load_catalog_data()
+        inverted = len(data["inverted"])
+        no_gives_point = data["keys"][key_from_argv()].count("N")
         
-        # Проверка
-        check = questions_ref.limit(1).get()
-        if check:
-            print(f"\n📝 Пример вопроса в базе:")
-            print(f"   ID: {check[0].id}")
-            print(f"   Русский: {check[0].to_dict().get('text_ru')}")
-            print(f"   Казахский: {check[0].to_dict().get('text_kz')}")
+        print(f"\n✅ УСПЕХ! Каталог из {count} двуязычных вопросов, версия {stats['version']}")
+        print(f"   - Записано: {stats['written']}, удалено: {stats['deleted']}, без изменений: {stats['unchanged']}")
+        print(f"   - С инверсией (красные): {inverted}")
+        print(f"   - 'Нет' дает балл (Isk): {no_gives_point - inverted}")
+        print(f"   - 'Да' дает балл: {count - no_gives_point}")
         
     except Exception as e:
         print(f"❌ Ошибка: {e}")
 
 if __name__ == "__main__":
-    load_bilingual_questions()
\ No newline at end of file
+    load_bilingual_questions()
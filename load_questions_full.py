@@ -1,342 +1,36 @@
 # Это чисто русский файл,с казахским переводом другой
+import sys
 import firebase_admin
 from firebase_admin import credentials, firestore
-from datetime import datetime
 import logging
 
+from catalog_data import build_questions as build_catalog_questions, load_catalog_data
+from catalog_sync import publish_version, sync_questions
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# ============== ПОЛНЫЕ ТЕКСТЫ ВСЕХ 160 ВОПРОСОВ ИЗ EXCEL ==============
-QUESTIONS_TEXTS = {
-    1: "Иногда мне в голову приходят такие мысли, что лучше никому о них не рассказывать.",
-    2: "Я охотно принимаю участие во всех собраниях и других общественных мероприятиях.",
-    3: "Часто какая-нибудь навязчивая мысль не дает мне заснуть.",
-    4: "Временами у меня бывают приступы смеха или плача, с которыми я никак не могу справиться.",
-    5: "Я сильно теряюсь, оказавшись неожиданно в центр внимания.",
-    6: "Бывали случаи, что я не сдерживал своих обещаний.",
-    7: "Критика, в том виде, в котором ее осуществляют многие люди, скорее выбивают меня из колеи, чем помогают.",
-    8: "У меня часто болит голова.",
-    9: "Если мое удачное замечание осталось незамеченным, я его не повторяю.",
-    10: "Часто я склонен мысленно возвращаться к своим неприятностям, и мне трудно выбросить их из головы.",
-    11: "Иногда я говорю неправду.",
-    12: "В компании я чувствую себя неловко и из-за этого произвожу впечатление хуже, чем мог бы.",
-    13: "Мне бывает трудно заснуть из-за беспокойства по поводу неудачи.",
-    14: "Вставая утром, я часто чувствую себя усталым и разбитым.",
-    15: "Раз в неделю или чаще я безо всякой видимой причины внезапно ощущаю жар во всем теле.",
-    16: "Мне бывает трудно изложить свои мысли словами, поэтому я редко включаюсь в беседу.",
-    17: "Бывает, что меня беспокоит чувство вины или угрызения совести из-за какого-нибудь пустяка.",
-    18: "Бывало, что я говорил о вещах, в которых не разбираюсь.",
-    19: "Бывает, что я передаю слухи.",
-    20: "У меня бывают очень странные и необычные внутренние переживания.",
-    21: "Уходя из дома, я часто беспокоюсь о том, что нужно сделать сегодня.",
-    22: "Бывает, что у меня без особой причины кружится голова.",
-    23: "Бывает, что я откладываю на завтра то, что нужно сделать сегодня.",
-    24: "Я смущаюсь вступить в спор даже по хорошо известному мне вопросу.",
-    25: "Я чрезмерно чувствителен и легко раним.",
-    26: "Бывало, что я невежливо разговаривал с родителями.",
-    27: "Иногда, когда я неважно себя чувствую, я бываю раздражительным.",
-    28: "Мне, безусловно, не хватает уверенности в себе.",
-    29: "Я часто упускаю возможность из-за своей внутренней нерешительности.",
-    30: "Я довольно безразличен к тому, что со мной будет.",
-    31: "Я всегда выполняю то, что мне говорят старшие.",
-    32: "Я остро и длительно переживаю неудачи.",
-    33: "Я склонен принимать все слишком близко к сердцу.",
-    34: "Иногда я хвалю себя.",
-    35: "Я считаю, что моя семейная жизнь такая же хорошая, как и у большинства моих знакомых.",
-    36: "Я часто чувствую себя одиноким и никому ненужным.",
-    37: "Временами я уверен в своей бесполезности.",
-    38: "Мне часто говорят, что я вспыльчив.",
-    39: "В игре я предпочитаю выигрывать.",
-    40: "Мое настроение зависит от общества, в котором я нахожусь.",
-    41: "Сон у меня обычно богат яркими сновидениями.",
-    42: "Последние несколько лет большую часть времени я чувствую себя хорошо.",
-    43: "Сейчас мой вес постоянен (я не худею и не полнею).",
-    44: "Люблю костюмы яркие и броские.",
-    45: "В необычной и привлекающей внимание одежде я чувствую себя прекрасно.",
-    46: "Мне приятно иметь среди своих знакомых значительных людей. Это как бы придает мне вес в собственных глазах.",
-    47: "Я был бы довольно спокоен, если бы у кого-нибудь из моей семьи были неприятности из-за нарушения закона.",
-    48: "Больше всего со стороны окружающих я ценю внимание ко мне.",
-    49: "Я люблю одежду модную и необычную, которая невольно привлекает взоры.",
-    50: "С моим рассудком творится что-то неладное.",
-    51: "Когда я пытаюсь что-то сказать, то часто замечаю, что у меня дрожат руки.",
-    52: "Приключения и риск меня привлекают, когда в них достается первая роль.",
-    53: "Я всегда стремлюсь быть среди людей, чтобы показать себя.",
-    54: "Руки у меня такие же ловкие и проворные как и прежде.",
-    55: "Среди моих знакомых есть люди, которые мне не нравятся.",
-    56: "Я люблю опекать кого-нибудь, кто мне нравится.",
-    57: "Я люблю быть первым, чтобы мне подражали, за мной бы следовали другие.",
-    58: "Думаю, что я человек обреченный.",
-    59: "С членами моей семьи ссорюсь редко (или не ссорюсь совсем).",
-    60: "Иногда я ощущаю комок в горле или другие необычные ощущения.",
-    61: "Я люблю, когда окружающие уделяют мне много внимания.",
-    62: "Бывает, что я с кем-нибудь посплетничаю.",
-    63: "Часто я вижу сны, о которых лучше никому не рассказывать.",
-    64: "Ужасно не люблю всякие правила и ограничения, которые меня стесняют.",
-    65: "Я очень люблю читать о преступлениях и таинственных приключениях.",
-    66: "Бывало, что при обсуждении некоторых вопросов, я, особенно не задумываясь, соглашался с мнением других.",
-    67: "В школе я усваивал материал медленнее, чем другие.",
-    68: "Мне нравится участвовать в конкурсах художественной самодеятельности.",
-    69: "Считаю, что очень важно, чтобы результат моей работы стал известен окружающим.",
-    70: "Моя внешность меня, в общем, устраивает.",
-    71: "Я вполне уверен в себе.",
-    72: "Я способен совершить нечто выдающееся.",
-    73: "Мне нравится выступать перед кем-нибудь.",
-    74: "Раз в неделю или чаще я бываю очень возбужденным или взволнованным.",
-    75: "Кто-то управляет моими мыслями.",
-    76: "Я бы согласился выступать в роли конферансье (ведущего) на концерте у какой-нибудь знаменитости.",
-    77: "Меня всегда раздражают люди, которые стремятся быть первыми в компании.",
-    78: "На моё настроение существенно влияет погода.",
-    79: "Бывает, что неприличная или даже непристойная шутка вызывает у меня смех.",
-    80: "У меня портится настроение, я чувствую себя плохо, если окружающие не проявляют ко мне должного внимания.",
-    81: "Мне нравится цитировать необычные (мудрые) высказывания знаменитых людей.",
-    82: "Счастливей всего я бываю, когда один.",
-    83: "Кто-то пытается воздействовать на мои мысли.",
-    84: "В компаниях я почти всегда являюсь центром внимания.",
-    85: "Я отношусь к таким людям, которые умеют восторгаться и преклоняться перед кем или чем-либо.",
-    86: "Я часто копаюсь в своих недостатках.",
-    87: "Даже среди людей я обычно чувствую себя одиноко.",
-    88: "В компании я люблю рассказывать разные истории для того, чтобы завладеть общим вниманием.",
-    89: "Мне нравится заводить знакомства с влиятельными и авторитетными людьми.",
-    90: "Меня легко привести в замешательство.",
-    91: "Я легко теряю терпение с людьми.",
-    92: "Для меня свойственна некоторая капризность.",
-    93: "Мне нравится, когда меня признают главой или зачинщиком.",
-    94: "Часто мне хочется умереть.",
-    95: "Почти каждый день случается что-нибудь, что пугает меня.",
-    96: "Мне доставляет удовольствие совершать рискованные поступки, иногда ради забавы.",
-    97: "У меня есть такие качества, по которым я определенно превосхожу других людей.",
-    98: "Я очень последователен в своих религиозных убеждениях.",
-    99: "Приступы плохого настроения у меня бывают редко.",
-    100: "Я часто поступаю по настроению, а не по убеждению.",
-    101: "Часто в споре я перехожу на личности.",
-    102: "Я заслуживаю сурового наказания за свои поступки.",
-    103: "У меня были очень необычные мистические переживания.",
-    104: "Я не пойду на риск, если есть только малая надежда на успех.",
-    105: "Если со мной поступают несправедливо, то я чувствую, что должен отплатить, хотя бы из принципа.",
-    106: "У меня были периоды, когда из-за волнения я терял сон.",
-    107: "Я человек нервный и легковозбудимый.",
-    108: "Временами меня так и подмывает вступить с кем-нибудь в спор.",
-    109: "Временами я так настаиваю на своем, что окружающие теряют со мной терпение.",
-    110: "Мне кажется, что обоняние у меня такое же как и у других (не хуже).",
-    111: "Все у меня получается плохо, не так, как надо.",
-    112: "Я не могу до конца выслушать человека, если он, по моему мнению, говорит глупые вещи.",
-    113: "Иногда мне хочется сделать что-либо опасное или ошеломляющее.",
-    114: "Я почти всегда ощущаю сухость во рту.",
-    115: "Большую часть времени я ощущаю себя усталым.",
-    116: "Иногда я могу не сдержаться и нагрубить, даже если это повредит моим интересам.",
-    117: "Довольно часто я действую под влиянием минутного настроения.",
-    118: "Иногда я чувствую, что близок к нервному срыву.",
-    119: "Меня очень раздражает то, что я забываю, куда кладу вещи.",
-    120: "Когда на меня кричат, я отвечаю тем же.",
-    121: "Обычно я готов на все, чтобы победить в споре.",
-    122: "Я с трудом переношу время ожидания.",
-    123: "Мне очень трудно приспособиться к новым условиям жизни, работы. Переход к новым условиям жизни, работы кажется невыносимо трудным.",
-    124: "Часто я не уступаю другим не потому, что дело действительно важное, а просто из-за принципа.",
-    125: "У меня часто плохое настроение.",
-    126: "Мне кажется, что по отношению именно ко мне особенно часто поступают несправедливо.",
-    127: "Я часто чувствую себя несправедливо обиженным.",
-    128: "Я, наверное, человек раздражительный и вспыльчивый.",
-    129: "Часто я завожусь с пол-оборота, быстро злюсь.",
-    130: "Мое мнение часто не совпадает с мнением окружающих.",
-    131: "Я часто испытываю чувство усталости от жизни и мне не хочется жить.",
-    132: "Я против того, чтобы надо мной подшучивали.",
-    133: "Меня сильно раздражают люди, которые лезут без очереди, и я им это высказываю или стараюсь не пускать.",
-    134: "На меня обращают внимание чаще, чем на других.",
-    135: "У меня бывают головные боли и головокружения из-за переживаний.",
-    136: "Иногда я чувствую такую ярость, что хочется что-либо сломать.",
-    137: "Я довольно часто совершаю поступки, о которых потом приходится сожалеть (чаще, чем другие).",
-    138: "Я сильно раздражаюсь, если меня торопят или подгоняют.",
-    139: "Часто у меня бывают периоды, когда мне никого не хочется видеть.",
-    140: "Мне трудно проснуться в назначенный час.",
-    141: "Иногда пустяк, сказанный в мой адрес, способен вызвать бурную реакцию.",
-    142: "Если я считаю, что поступаю правильно, то мнение других людей меня мало интересует.",
-    143: "Если в моих неудачах кто-то виноват, я не оставляю его безнаказанным.",
-    144: "В детстве я был капризный и раздражительный.",
-    145: "Терпеть не могу, если меня перебивают в то время, когда я занят.",
-    146: "Мне очень трудно, почти невозможно смолчать за оскорбление.",
-    147: "Мне известны случаи, когда мои родственники лечились у невропатологов и психиатров.",
-    148: "Иногда я принимаю валериану и другие успокаивающие средства.",
-    149: "Мне часто что-то быстро надоедает и я меняю (работу, место жительства).",
-    150: "Я обычно не считаю нужным скрывать свое презрение или отрицательное мнение о ком-то или о чем-то.",
-    151: "Я живу своими внутренними мыслями и меня мало интересует окружающее.",
-    152: "Мои идеи и мысли выглядят, как опережающие время.",
-    153: "Меня трудно рассердить.",
-    154: "Я не очень лажу с людьми: мне не просто находить с ними общий язык.",
-    155: "Я – труднодоступный для контакта человек.",
-    156: "Меня уговорили поступать на эту работу, а самого особого желания нет.",
-    157: "Люди меня считают спокойным и уравновешенным человеком.",
-    158: "Среди моих знакомых (родственников) есть люди употребляющие наркотики.",
-    159: "Временами я сожалею, что живу на этом свете.",
-    160: "Я имею представление как выглядят некоторые наркотики."
-}
+# Тексты вопросов и шкалы хранятся в questions_catalog.json.
+# Этот загрузчик использует старый ключ: балл за "Нет" только у инвертированных вопросов.
+POINTS_KEY = "inverted-only"
 
-# Матрица принадлежности вопросов к шкалам
-QUESTION_SCALES = {
-    1:  {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    2:  {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    3:  {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    4:  {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 1},
-    5:  {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    6:  {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    7:  {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    8:  {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    9:  {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    10: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 1},
-    11: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    12: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    13: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    14: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    15: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    16: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    17: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    18: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    19: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    20: {"Isk": 0, "Con": 1, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 1},
-    21: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    22: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    23: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    24: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    25: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    26: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    27: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    28: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    29: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 0},
-    30: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    31: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    32: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 1},
-    33: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 1},
-    34: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    35: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    36: {"Isk": 0, "Con": 1, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 1},
-    37: {"Isk": 0, "Con": 0, "Ast": 1, "Ist": 0, "Psi": 0, "NPN": 1},
-    38: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    39: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    40: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    41: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    42: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    43: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    44: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    45: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    46: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    47: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    48: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    49: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    50: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    51: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    52: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    53: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    54: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    55: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    56: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    57: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    58: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    59: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    60: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 1},
-    61: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    62: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    63: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    64: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    65: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    66: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    67: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    68: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    69: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    70: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    71: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    72: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    73: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    74: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    75: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    76: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    77: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    78: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    79: {"Isk": 1, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    80: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    81: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    82: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    83: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    84: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    85: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    86: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    87: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    88: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    89: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    90: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    91: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    92: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    93: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    94: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    95: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    96: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    97: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 1, "Psi": 0, "NPN": 0},
-    98: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    99: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    100: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    101: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    102: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    103: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    104: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    105: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    106: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    107: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    108: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    109: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    110: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    111: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    112: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    113: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    114: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    115: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    116: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    117: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    118: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    119: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    120: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    121: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    122: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    123: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    124: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    125: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    126: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    127: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    128: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    129: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    130: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    131: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    132: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    133: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    134: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    135: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    136: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    137: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    138: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    139: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    140: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    141: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    142: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    143: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    144: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    145: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    146: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    147: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    148: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    149: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    150: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    151: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    152: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    153: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    154: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 1},
-    155: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    156: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    157: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 1, "NPN": 0},
-    158: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-    159: {"Isk": 0, "Con": 1, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 1},
-    160: {"Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0},
-}
+def build_questions() -> dict:
+    """Каталог: {id документа: данные вопроса}"""
+    return build_catalog_questions(POINTS_KEY, bilingual=False)
 
-# Инвертированные вопросы (красные в Excel)
-INVERTED_QUESTIONS = {35, 42, 43, 71, 110, 153, 157}
+def sync_catalog(db, verify: bool = False, progress=None, activate: bool = True) -> dict:
+    """
+    Синхронизация каталога с Firestore через переданный клиент
+    (используется и скриптом, и API). Пишем только изменившиеся вопросы,
+    версия меняется одним коммитом.
+    activate=False - только сохранить версию, текущий каталог не менять.
+    """
+    questions = build_questions()
+    if not activate:
+        return publish_version(db, questions, POINTS_KEY)
+    stats = sync_questions(db, questions, verify=verify, progress=progress, key=POINTS_KEY)
+    stats["count"] = len(questions)
+    return stats
 
 def load_questions():
     """Загрузка всех вопросов в Firebase"""
@@ -348,60 +42,22 @@ def load_questions():
         
         print("🔥 Подключение к Firebase успешно!")
         
-        # Очищаем старые вопросы
-        questions_ref = db.collection("questions")
-        old_questions = questions_ref.get()
-        batch = db.batch()
-        for q in old_questions:
-            batch.delete(q.reference)
-        batch.commit()
-        print(f"✅ Удалено {len(old_questions)} старых вопросов")
-        
-        # Загружаем новые вопросы
-        batch = db.batch()
-        count = 0
+        if "--publish-only" in sys.argv:
+            stats = sync_catalog(db, activate=False)
+            print(f"\n✅ Версия {stats['version']} ({stats['count']} вопросов) "
+                  f"{'сохранена' if stats['published'] else 'уже существует'}")
+            return
         
-        for q_num in range(1, 161):
-            if q_num in QUESTION_SCALES:
-                scale_map = QUESTION_SCALES[q_num]
-                types = [scale for scale, val in scale_map.items() if val == 1]
-                
-                q_ref = questions_ref.document(f"q_{q_num}")
-                q_data = {
-                    "number": q_num,
-                    "text": QUESTIONS_TEXTS.get(q_num, f"Вопрос {q_num}"),
-                    "types": types,
-                    "is_inverted": q_num in INVERTED_QUESTIONS,
-                    "pointsIfYes": 0 if q_num in INVERTED_QUESTIONS else 1,
-                    "pointsIfNo": 1 if q_num in INVERTED_QUESTIONS else 0,
-                    "created_at": datetime.now()
-                }
-                
-                batch.set(q_ref, q_data)
-                count += 1
-                
-                # Выводим прогресс
-                if q_num % 20 == 0:
-                    print(f"⏳ Подготовлено {q_num}/160 вопросов...")
+        stats = sync_catalog(db, verify="--verify" in sys.argv)
+        count = stats["count"]
         
-        batch.commit()
-        print(f"\n✅ УСПЕХ! Загружено {count} вопросов в Firebase!")
-        print(f"   - С инверсией: {len([q for q in INVERTED_QUESTIONS if q <= 160])}")
+        print(f"\n✅ УСПЕХ! Каталог из {count} вопросов, версия {stats['version']}")
+        print(f"   - Записано: {stats['written']}, удалено: {stats['deleted']}, без изменений: {stats['unchanged']}")
+        print(f"   - С инверсией: {len(load_catalog_data()['inverted'])}")
         print(f"   - Без типов: {160 - count}")
         
-        # Проверка
-        check = questions_ref.get()
-        print(f"   - Проверка: в базе {len(check)} документов")
-        
-        # Показываем пример
-        sample = questions_ref.limit(1).get()
-        if sample:
-            print(f"\n📝 Пример вопроса:")
-            print(f"   ID: {sample[0].id}")
-            print(f"   Данные: {sample[0].to_dict()}")
-        
     except Exception as e:
         print(f"❌ Ошибка: {e}")
 
 if __name__ == "__main__":
-    load_questions()
\ No newline at end of file
+    load_questions()
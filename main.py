@@ -1,29 +1,54 @@
-from fastapi import FastAPI, HTTPException, Depends, status, Request
+from fastapi import FastAPI, HTTPException, Depends, status, Request, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, Response
+from fastapi.encoders import jsonable_encoder
 import secrets
 import string
 import asyncio
+import time
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from functools import partial
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 import json
 import re
 import firebase_admin
-from firebase_admin import auth as firebase_auth, credentials
+from firebase_admin import credentials, firestore
 
-from config import db, logger
+from config import db, logger, start_request_log, verbose, log_fields, run_db, get_documents
 from models import (
-    UserCreate, UserResponse, TestSubmit, UserLogin, 
+    UserCreate, UserResponse, TestSubmit, ProgressUpdate, UserLogin, 
     ScoreResult, ScaleType, SCALE_MAX_SCORES
 )
 from scoring import (
     calculate_score, 
     get_interpretation, 
     get_recommendation, 
+    decode_answer_bits,
+    pack_answer_bits,
+    encode_answer_bits,
     # QUESTION_SCALES,
     # INVERTED_QUESTIONS
 )
+from catalog import get_catalog, get_catalog_async, invalidate_catalog
+from jobs import start_job, get_job
+from answer_sheets import ANSWER_SHEETS_COLLECTION, build_answer_sheet, answers_from_sheet
+from spool import (
+    REJECTED_COLLECTION, SPOOL_CHECK_TIMEOUT, SPOOL_DIR, SPOOL_ENABLED, PermanentSpoolError, SubmissionSpool
+)
+from sheet_import import import_sheets, sheet_format
+from progress import ProgressStore, progress_ref
+from identity import EmailTakenError, identity_index, index_user, rebuild_identities, register_user
+from batches import current_batch_cache, current_batch_ref
+from firebase_tokens import certificate_refresher, verify_id_token
+from passwords import PasswordCheck, PasswordQueueFull, hash_passwords, password_metrics
+from admission import admission_metrics, admit
+from sessions import (
+    SESSION_REQUIRED, Session, SessionError, bearer_token, issue_session, read_session, renew_session
+)
+import passwords
+from load_questions_bilingual import sync_catalog as sync_bilingual_catalog
+from catalog_data import DEFAULT_KEY as DEFAULT_CATALOG_KEY, load_catalog_data
 
 
 # ЭТО Импорт тестовой оплаты - НЕ ИСПОЛЬЗОВАТЬ В ПРОДАКШЕНЕ
@@ -45,6 +70,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Одна итоговая строка лога на запрос вместо десятка сообщений в обработчиках
+@app.middleware("http")
+async def request_summary_log(request: Request, call_next):
+    started = time.perf_counter()
+    fields = start_request_log(request.url.path)
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        extra = "".join(f" {key}={value}" for key, value in fields.items())
+        logger.info(
+            "request method=%s route=%s status=%d ms=%.1f%s",
+            request.method, getattr(route, "path", request.url.path), status_code,
+            (time.perf_counter() - started) * 1000, extra
+        )
+
 # ============== ИНИЦИАЛИЗАЦИЯ FIREBASE ADMIN SDK ==============
 try:
     firebase_admin.get_app()
@@ -66,13 +110,87 @@ async def startup_event():
     else:
         logger.info("✅ Firebase подключен успешно")
         try:
-            questions_ref = db.collection("questions").limit(1).get()
-            if not questions_ref:
+            # Прогреваем каталог вопросов, чтобы первый тестируемый не ждал Firestore
+            if not len(await run_db(get_catalog)):
                 logger.warning("⚠️ Коллекция 'questions' пуста. Загрузите вопросы!")
         except Exception as e:
             logger.error(f"❌ Ошибка доступа к Firestore: {e}")
+    
+    if SPOOL_ENABLED:
+        try:
+            submission_spool.start()
+            logger.info(f"✅ Спул отправок: {SPOOL_DIR}")
+        except Exception as e:
+            # Нет доступа к диску - результаты пишутся в Firestore сразу
+            logger.error(f"❌ Спул отправок недоступен, запись без него: {e}")
+    
+    progress_store.start()
+    if db is not None:
+        current_batch_cache.start()
+    if firebase_admin._apps:
+        # Ключи Google для проверки токенов - заранее и в фоне
+        certificate_refresher.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    certificate_refresher.stop()
+    passwords.shutdown()
+    current_batch_cache.stop()
+    await progress_store.stop()
+    await submission_spool.stop()
 
 # ============== ВСПОМОГАТЕЛЬНЫЕ ФУНКЦИИ ==============
+# Пользователей в одном batch при генерации: документ + запись индекса логина
+USERS_PER_BATCH = 500 // 2
+
+def password_queue_full() -> HTTPException:
+    """Все места в очереди проверки паролей заняты - просим повторить вход"""
+    logger.warning("⚠️ Очередь проверки паролей переполнена")
+    return HTTPException(status_code=503, detail="Сервер перегружен, повторите вход", headers={"Retry-After": "1"})
+
+# ============== ТОКЕН СЕССИИ ==============
+def request_session(request: Request):
+    """
+    (user_id, сессия) запроса: по подписанному токену Authorization: Bearer,
+    иначе (старые клиенты) по X-User-Id без сессии. Плохой токен - 401.
+    """
+    token = bearer_token(request.headers.get("Authorization"))
+    if token is not None:
+        try:
+            session = read_session(token)
+        except SessionError as e:
+            logger.warning(f"⚠️ Токен сессии отклонен: {e}")
+            raise HTTPException(status_code=401, detail="Сессия недействительна, войдите заново")
+        return session.user_id, session
+    if SESSION_REQUIRED:
+        raise HTTPException(status_code=401, detail="Требуется вход")
+    return request.headers.get("X-User-Id"), None
+
+def path_session(request: Request, user_id: str) -> Optional[Session]:
+    """Сессия для роутов с user_id в пути: чужие данные - только администратору"""
+    if bearer_token(request.headers.get("Authorization")) is None and not SESSION_REQUIRED:
+        return None
+    _, session = request_session(request)
+    if session.user_id != user_id and not session.is_admin:
+        raise HTTPException(status_code=403, detail="Нет доступа")
+    return session
+
+def require_admin(request: Request) -> Optional[Session]:
+    """
+    Зависимость роутов /admin/*: токен сессии с признаком администратора.
+    Без токена, пока SESSION_REQUIRED=0, пропускаем (старая админка).
+    """
+    token = bearer_token(request.headers.get("Authorization"))
+    if token is None:
+        if not SESSION_REQUIRED:
+            return None
+        raise HTTPException(status_code=401, detail="Требуется вход администратора")
+    _, session = request_session(request)
+    if not session.is_admin:
+        logger.warning(f"⚠️ Пользователь {session.user_id} без прав администратора обратился к {request.url.path}")
+        raise HTTPException(status_code=403, detail="Нет доступа")
+    return session
+
 def generate_password(length: int = 8) -> str:
     alphabet = string.ascii_letters + string.digits
     return ''.join(secrets.choice(alphabet) for _ in range(length))
@@ -86,37 +204,66 @@ def clean_filename(text: str) -> str:
         return f"Test{numbers[0]}"
     return "user"
 
+def pick_encoding(accept_encoding: str, payload) -> Optional[str]:
+    """Выбор сжатия по Accept-Encoding: br, затем gzip, иначе без сжатия"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    if payload.br is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Сравнение If-None-Match с ETag (любой вариант сжатия того же тела)"""
+    if not if_none_match:
+        return False
+    base = etag.strip('"')
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        tag = tag.removeprefix("W/").strip('"')
+        if tag in (base, f"{base}-gzip", f"{base}-br"):
+            return True
+    return False
+
 # ============== АДМИН РОУТЫ ==============
-@app.post("/admin/generate-users", tags=["Admin"])
+@app.post("/admin/generate-users", tags=["Admin"], dependencies=[Depends(require_admin)])
 async def generate_users(data: UserCreate):
     try:
         logger.info(f"👤 Генерация {data.count} пользователей")
         
-        # Получаем или создаем номер потока
-        batch_ref = db.collection("batches").document("current")
-        batch_data = batch_ref.get()
+        # Получаем или создаем номер потока (из памяти воркера)
+        current_batch = await current_batch_cache.get()
         
-        if batch_data.exists:
-            current_batch = batch_data.to_dict().get("batchNumber", 1)
-        else:
+        if current_batch is None:
             current_batch = 1
-            batch_ref.set({"batchNumber": 1, "createdAt": datetime.now()})
+            await run_db(current_batch_ref().set, {"batchNumber": 1, "createdAt": datetime.now()})
+            current_batch_cache.set(current_batch)
         
         users = []
-        batch = db.batch()
+        created = []
         users_ref = db.collection("users")
         
         # Считаем пользователей в текущем потоке
-        existing = users_ref.where("batch", "==", current_batch).get()
+        existing = await run_db(users_ref.where("batch", "==", current_batch).get)
         start_num = len(existing) + 1
         
-        for i in range(data.count):
+        # Пароль отдаем один раз в ответе, в Firestore - только хэш (в пуле процессов)
+        plain_passwords = [generate_password(8) for _ in range(data.count)]
+        password_hashes = await hash_passwords(plain_passwords)
+        
+        for i, (password, password_hash) in enumerate(zip(plain_passwords, password_hashes)):
             login = f"Тестируемый{start_num + i}"
-            password = generate_password(8)
             user_ref = db.collection("users").document()
             user_data = {
                 "login": login,
-                "password": password,
+                "passwordHash": password_hash,
                 "isCompleted": False,
                 "completedAt": None,
                 "createdAt": datetime.now(),
@@ -124,10 +271,20 @@ async def generate_users(data: UserCreate):
                 "batch": current_batch,  # 👈 НОМЕР ПОТОКА
                 "paymentId": None
             }
-            batch.set(user_ref, user_data)
+            created.append((user_ref, user_data))
             users.append({"login": login, "password": password})
         
-        batch.commit()
+        # Пользователь + запись индекса логина - две записи; batch Firestore - до 500
+        batches = []
+        for start in range(0, len(created), USERS_PER_BATCH):
+            batch = db.batch()
+            for user_ref, user_data in created[start:start + USERS_PER_BATCH]:
+                batch.set(user_ref, user_data)
+                index_user(batch, user_ref.id, user_data)
+            batches.append(batch)
+        await asyncio.gather(*(run_db(batch.commit) for batch in batches))
+        for user_ref, user_data in created:
+            identity_index.remember(user_ref.id, user_data)
         logger.info(f"✅ Создано {len(users)} пользователей в потоке {current_batch}")
         
         return JSONResponse({
@@ -141,12 +298,13 @@ async def generate_users(data: UserCreate):
         logger.error(f"❌ Ошибка генерации пользователей: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/admin/new-batch", tags=["Admin"])
+@app.post("/admin/new-batch", tags=["Admin"], dependencies=[Depends(require_admin)])
 async def create_new_batch():
     """Создание нового потока тестируемых"""
     try:
-        batch_ref = db.collection("batches").document("current")
-        batch_data = batch_ref.get()
+        # Номер читаем из Firestore, а не из памяти: другой воркер мог уже сменить поток
+        batch_ref = current_batch_ref()
+        batch_data = await run_db(batch_ref.get)
         
         if batch_data.exists:
             current_batch = batch_data.to_dict().get("batchNumber", 1)
@@ -154,10 +312,12 @@ async def create_new_batch():
         else:
             new_batch = 1
         
-        batch_ref.set({
+        await run_db(batch_ref.set, {
             "batchNumber": new_batch,
             "createdAt": datetime.now()
         })
+        # Остальные воркеры узнают о новом потоке через слушатель batches/current
+        current_batch_cache.set(new_batch)
         
         logger.info(f"✅ Создан новый поток #{new_batch}")
         
@@ -171,11 +331,11 @@ async def create_new_batch():
         logger.error(f"❌ Ошибка создания потока: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/admin/batches", tags=["Admin"])
+@app.get("/admin/batches", tags=["Admin"], dependencies=[Depends(require_admin)])
 async def get_batches():
     """Получение списка всех потоков"""
     try:
-        users_ref = db.collection("users").get()
+        users_ref = await run_db(db.collection("users").get)
         
         # Группируем пользователей по потокам
         batches = {}
@@ -208,11 +368,11 @@ async def get_batches():
         logger.error(f"❌ Ошибка получения потоков: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/admin/users/{user_id}", tags=["Admin"])
+@app.get("/admin/users/{user_id}", tags=["Admin"], dependencies=[Depends(require_admin)])
 async def get_user(user_id: str):
     """Получение данных конкретного пользователя"""
     try:
-        user_ref = db.collection("users").document(user_id).get()
+        user_ref = await run_db(db.collection("users").document(user_id).get)
         if not user_ref.exists:
             raise HTTPException(status_code=404, detail="Пользователь не найден")
         
@@ -231,7 +391,7 @@ async def get_user_history(user_id: str):
     """Получение истории тестирований пользователя"""
     try:
         # Ищем все результаты этого пользователя
-        results_ref = db.collection("results").where("userId", "==", user_id).get()
+        results_ref = await run_db(db.collection("results").where("userId", "==", user_id).get)
         
         history = []
         for res in results_ref:
@@ -251,21 +411,22 @@ async def get_user_history(user_id: str):
         logger.error(f"❌ Ошибка получения истории: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/admin/export/users-pdf", tags=["Admin"])
+@app.post("/admin/export/users-pdf", tags=["Admin"], dependencies=[Depends(require_admin)])
 async def export_users_pdf(request: Request):
     try:
         data = await request.json()
         users = data.get('users', [])
         
         if not users:
-            users_ref = db.collection("users").get()
+            users_ref = await run_db(db.collection("users").get)
             users = []
             for user in users_ref:
                 user_data = user.to_dict()
                 if user_data.get("login") != "admin":
+                    # Пароль хранится только хэшем - в выгрузке из базы его нет
                     users.append({
                         "login": user_data.get("login"),
-                        "password": user_data.get("password", "********")
+                        "password": "********"
                     })
         
         # PDF теперь генерируется на фронтенде
@@ -281,16 +442,18 @@ async def export_users_pdf(request: Request):
         logger.error(f"❌ Ошибка генерации списка: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/admin/export/summary", tags=["Admin"])
+@app.get("/admin/export/summary", tags=["Admin"], dependencies=[Depends(require_admin)])
 async def export_summary_pdf():
     try:
         results_ref = db.collection("results")
-        results = results_ref.get()
+        results = await run_db(results_ref.get)
         result_list = []
         
+        # Пользователи всех результатов - одним запросом вместо запроса на каждого
+        user_snaps = await get_documents(db.collection("users").document(res.id) for res in results)
         for res in results:
             res_data = res.to_dict()
-            user_ref = db.collection("users").document(res.id).get()
+            user_ref = user_snaps[db.collection("users").document(res.id).path]
             if user_ref.exists:
                 user_data = user_ref.to_dict()
                 res_data["user"] = {"login": user_data.get("login")}
@@ -309,17 +472,20 @@ async def export_summary_pdf():
         logger.error(f"❌ Ошибка генерации ведомости: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/admin/export/user/{user_id}", tags=["Admin"])
+@app.get("/admin/export/user/{user_id}", tags=["Admin"], dependencies=[Depends(require_admin)])
 async def export_individual_pdf(user_id: str):
     try:
-        user_ref = db.collection("users").document(user_id).get()
+        # Пользователь и результат не зависят друг от друга - читаем параллельно
+        user_ref, results_ref = await asyncio.gather(
+            run_db(db.collection("users").document(user_id).get),
+            run_db(db.collection("results").document(user_id).get)
+        )
         if not user_ref.exists:
             raise HTTPException(status_code=404, detail="Пользователь не найден")
         
         user_data = user_ref.to_dict()
         user_data["id"] = user_ref.id
         
-        results_ref = db.collection("results").document(user_id).get()
         if results_ref.exists:
             user_data["results"] = results_ref.to_dict()
         
@@ -341,17 +507,21 @@ async def export_individual_pdf(user_id: str):
         logger.error(f"❌ Ошибка генерации отчета: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/admin/users", tags=["Admin"])
+@app.get("/admin/users", tags=["Admin"], dependencies=[Depends(require_admin)])
 async def get_all_users():
     try:
-        users_ref = db.collection("users")
-        users = users_ref.get()
+        # Пользователи и результаты - два параллельных запроса вместо запроса на каждого
+        users, results = await asyncio.gather(
+            run_db(db.collection("users").get),
+            run_db(db.collection("results").get)
+        )
+        results_by_id = {res.id: res for res in results}
         result = []
         for user in users:
             user_data = user.to_dict()
             user_data["id"] = user.id
-            results_ref = db.collection("results").document(user.id).get()
-            if results_ref.exists:
+            results_ref = results_by_id.get(user.id)
+            if results_ref is not None:
                 user_data["results"] = results_ref.to_dict()
             result.append(user_data)
         return {"users": result}
@@ -359,15 +529,17 @@ async def get_all_users():
         logger.error(f"❌ Ошибка получения пользователей: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/admin/results", tags=["Admin"])
+@app.get("/admin/results", tags=["Admin"], dependencies=[Depends(require_admin)])
 async def get_all_results():
     try:
         results_ref = db.collection("results")
-        results = results_ref.get()
+        results = await run_db(results_ref.get)
         result_list = []
+        # Пользователи всех результатов - одним запросом вместо запроса на каждого
+        user_snaps = await get_documents(db.collection("users").document(res.id) for res in results)
         for res in results:
             res_data = res.to_dict()
-            user_ref = db.collection("users").document(res.id).get()
+            user_ref = user_snaps[db.collection("users").document(res.id).path]
             if user_ref.exists:
                 user_data = user_ref.to_dict()
                 res_data["user"] = {
@@ -433,7 +605,19 @@ async def get_all_results():
 #         raise HTTPException(status_code=500, detail="Внутренняя ошибка сервера")
 import asyncio  # 👈 ДОБАВЬ ЭТОТ ИМПОРТ В НАЧАЛО ФАЙЛА
 
-@app.post("/auth/firebase-login", tags=["Auth"])
+async def record_firebase_login(user_id: str, user_data: Dict, firebase_uid: str) -> None:
+    """Отметка входа через Firebase; новый Firebase UID - сразу в индекс"""
+    batch = db.batch()
+    batch.update(db.collection("users").document(user_id), {
+        "firebaseUid": firebase_uid,
+        "lastLoginAt": datetime.now()
+    })
+    if user_data.get("firebaseUid") != firebase_uid:
+        index_user(batch, user_id, {"firebaseUid": firebase_uid}, kinds=("uid",))
+    await run_db(batch.commit)
+    identity_index.remember(user_id, {"firebaseUid": firebase_uid})
+
+@app.post("/auth/firebase-login", tags=["Auth"], dependencies=[Depends(admit("/auth/firebase-login"))])
 async def firebase_login(request: Request):
     try:
         data = await request.json()
@@ -441,57 +625,41 @@ async def firebase_login(request: Request):
         login = data.get('login')
         password = data.get('password')
         
-        logger.info(f"🔐 Firebase вход: {login}")
+        verbose("🔐 Firebase вход: %s", login)
         
-        # 👇 RETRY МЕХАНИЗМ ДЛЯ ОШИБКИ ВРЕМЕНИ
-        max_retries = 3
-        decoded_token = None
-        firebase_uid = None
-        email_from_token = None
+        # Расхождение часов ("Token used too early") допускает сама проверка - без повторов
+        try:
+            decoded_token = await verify_id_token(id_token)
+            firebase_uid = decoded_token['uid']
+            email_from_token = decoded_token.get('email', '')
+            verbose("✅ Firebase токен верифицирован: %s, email: %s", firebase_uid, email_from_token)
+        except Exception as e:
+            logger.error(f"❌ Ошибка верификации токена: {e}")
+            raise HTTPException(status_code=401, detail="Недействительный токен")
         
-        for attempt in range(max_retries):
-            try:
-                decoded_token = firebase_auth.verify_id_token(id_token)
-                firebase_uid = decoded_token['uid']
-                email_from_token = decoded_token.get('email', '')
-                logger.info(f"✅ Firebase токен верифицирован: {firebase_uid}, email: {email_from_token}")
-                break
-            except Exception as e:
-                error_str = str(e)
-                if "Token used too early" in error_str and attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 1  # 1, 2, 3 секунды
-                    logger.warning(f"⏰ Ошибка времени (попытка {attempt + 1}/{max_retries}), ожидание {wait_time}с...")
-                    await asyncio.sleep(wait_time)
-                    continue
-                else:
-                    logger.error(f"❌ Ошибка верификации токена: {e}")
-                    raise HTTPException(status_code=401, detail="Недействительный токен")
-        
-        # Ищем пользователя по логину или email
-        users_ref = db.collection("users").where("login", "==", login).get()
-        
-        if not users_ref and '@' in login:
-            users_ref = db.collection("users").where("email", "==", login).get()
-            logger.info(f"📝 Поиск по email: {login}, найдено: {len(users_ref)}")
-        
-        if not users_ref:
+        # Ищем пользователя по логину или email (индекс identities)
+        # Для зарегистрированных через email пароль не проверяем
+        password_ok = PasswordCheck(password, require_password=False)
+        user = await identity_index.resolve("login", login, accept=password_ok)
+        
+        if user is None and login and '@' in login:
+            user = await identity_index.resolve("email", login, accept=password_ok)
+            verbose("📝 Поиск по email: %s, найден: %s", login, user is not None)
+        
+        if user is None:
             logger.warning(f"❌ Пользователь {login} не найден в БД")
             raise HTTPException(status_code=401, detail="Неверный логин или пароль")
         
-        user = users_ref[0]
         user_data = user.to_dict()
         
-        # Для зарегистрированных через email пароль не проверяем
-        if user_data.get("password") and user_data.get("password") != password:
+        if not await password_ok(user.id, user_data):
             logger.warning(f"❌ Неверный пароль для {login}")
             raise HTTPException(status_code=401, detail="Неверный логин или пароль")
         
-        db.collection("users").document(user.id).update({
-            "firebaseUid": firebase_uid,
-            "lastLoginAt": datetime.now()
-        })
+        await record_firebase_login(user.id, user_data, firebase_uid)
         
-        logger.info(f"✅ Успешный Firebase вход: {user_data.get('login')}")
+        log_fields(user=user.id)
+        is_completed = user_data.get("isCompleted", False) or submission_spool.pending_for_user(user.id) is not None
         
         # 👇 ВАЖНО: ВОЗВРАЩАЕМ ВСЕ ПОЛЯ!
         return {
@@ -499,51 +667,73 @@ async def firebase_login(request: Request):
             "userId": user.id,
             "login": user_data.get("login"),        # 👈 ЭТО ПОЛЕ НУЖНО!
             "userLogin": user_data.get("login"),    # 👈 ДУБЛИРУЕМ ДЛЯ НАДЕЖНОСТИ
-            "isCompleted": user_data.get("isCompleted", False)
+            "isCompleted": is_completed,
+            **issue_session(user.id, user_data, completed=is_completed)
         }
         
     except HTTPException:
         raise
+    except PasswordQueueFull:
+        raise password_queue_full()
     except Exception as e:
         logger.error(f"❌ Ошибка Firebase авторизации: {e}")
         raise HTTPException(status_code=500, detail="Внутренняя ошибка сервера")
+def firebase_admin_matches(user_data: Dict, decoded_token: Dict) -> bool:
+    """
+    Токен Firebase принадлежит администратору: custom claim admin, уже
+    привязанный к администратору UID или (пока UID не привязан)
+    подтвержденный email из записи администратора.
+    """
+    if decoded_token.get("admin") is True:
+        return True
+    bound_uid = user_data.get("firebaseUid")
+    if bound_uid:
+        return bound_uid == decoded_token.get("uid")
+    admin_email = (user_data.get("email") or "").strip().lower()
+    token_email = (decoded_token.get("email") or "").strip().lower()
+    return bool(admin_email) and decoded_token.get("email_verified") is True and token_email == admin_email
+
 @app.post("/auth/firebase-admin", tags=["Auth"])
 async def firebase_admin_login(request: Request):
     try:
         data = await request.json()
         id_token = data.get('idToken')
         
-        logger.info(f"🔐 Firebase вход администратора")
+        verbose("🔐 Firebase вход администратора")
         
         try:
-            decoded_token = firebase_auth.verify_id_token(id_token)
+            decoded_token = await verify_id_token(id_token)
             firebase_uid = decoded_token['uid']
             email = decoded_token.get('email', '')
-            logger.info(f"✅ Firebase токен верифицирован: {firebase_uid}, email: {email}")
+            verbose("✅ Firebase токен верифицирован: %s, email: %s", firebase_uid, email)
         except Exception as e:
             logger.error(f"❌ Ошибка верификации токена: {e}")
             raise HTTPException(status_code=401, detail="Недействительный токен")
         
-        users_ref = db.collection("users").where("login", "==", "admin").where("isAdmin", "==", True).get()
+        is_admin = lambda user_id, data: bool(data.get("isAdmin"))
+        user = await identity_index.resolve("login", "admin", accept=is_admin)
         
-        if not users_ref:
+        if user is None or not is_admin(user.id, user.to_dict()):
             logger.warning(f"❌ Администратор не найден в БД")
             raise HTTPException(status_code=401, detail="Администратор не найден")
         
-        user = users_ref[0]
+        user_data = user.to_dict()
+        if not firebase_admin_matches(user_data, decoded_token):
+            logger.warning(f"❌ Firebase аккаунт {firebase_uid} не привязан к администратору")
+            raise HTTPException(status_code=403, detail="Нет доступа")
         
-        db.collection("users").document(user.id).update({
-            "firebaseUid": firebase_uid,
-            "lastLoginAt": datetime.now()
-        })
+        # Привязку к другому UID (вход по custom claim) не перезаписываем
+        if user_data.get("firebaseUid") in (None, "", firebase_uid):
+            await record_firebase_login(user.id, user_data, firebase_uid)
         
-        logger.info(f"✅ Успешный Firebase вход администратора")
+        verbose("✅ Успешный Firebase вход администратора")
         
         return {
             "success": True,
             "userId": user.id,
             "login": "admin",
-            "isAdmin": True
+            "isAdmin": True,
+            **issue_session(user.id, user_data)
         }
         
     except HTTPException:
@@ -587,81 +777,43 @@ async def firebase_admin_login(request: Request):
 #         logger.error(f"❌ Ошибка авторизации: {e}")
 #         raise HTTPException(status_code=500, detail="Внутренняя ошибка сервера")
 
-@app.post("/auth/login", tags=["Auth"])
+@app.post("/auth/login", tags=["Auth"], dependencies=[Depends(admit("/auth/login"))])
 async def login(credentials: UserLogin):
     try:
-        logger.info(f"🔐 Попытка входа: login='{credentials.login}'")
-        
-        # Получаем текущий активный поток
-        batch_ref = db.collection("batches").document("current")
-        batch_data = batch_ref.get()
-        current_batch = batch_data.to_dict().get("batchNumber", 1) if batch_data.exists else 1
-        
-        logger.info(f"📊 Текущий поток: {current_batch}")
-        
-        # Ищем пользователя с таким логином И в текущем потоке
-        users_ref = db.collection("users")\
-            .where("login", "==", credentials.login)\
-            .where("batch", "==", current_batch)\
-            .get()
-        
-        logger.info(f"📊 Найдено пользователей в потоке {current_batch}: {len(users_ref)}")
-        
-        if not users_ref:
-            # Если не нашли в текущем потоке, пробуем найти в любом (для старых пользователей)
-            logger.info(f"📊 Пользователь не найден в потоке {current_batch}, ищем во всех...")
-            users_ref = db.collection("users").where("login", "==", credentials.login).get()
-            
-            if not users_ref:
-                raise HTTPException(status_code=401, detail="Неверный логин или пароль")
-            
-            logger.info(f"📊 Найдено пользователей всего: {len(users_ref)}")
-            
-            # Если несколько - берем последнего по дате
-            users_list = []
-            for user_doc in users_ref:
-                user_data = user_doc.to_dict()
-                created_at = user_data.get("createdAt")
-                users_list.append({
-                    "id": user_doc.id,
-                    "data": user_data,
-                    "createdAt": created_at,
-                    "batch": user_data.get("batch")
-                })
-            
-            users_list.sort(key=lambda x: x.get("createdAt") or datetime.min, reverse=True)
-            latest_user = users_list[0]
-            logger.info(f"👤 Выбран пользователь из потока {latest_user['batch']}")
-        else:
-            # Нашли в текущем потоке
-            user_doc = users_ref[0]
-            latest_user = {
-                "id": user_doc.id,
-                "data": user_doc.to_dict()
-            }
+        verbose("🔐 Попытка входа: login='%s'", credentials.login)
         
-        user_id = latest_user["id"]
-        user_data = latest_user["data"]
+        # Логин в индексе указывает на последнего созданного пользователя
+        # с этим логином - того, что из текущего (самого нового) потока
+        password_ok = PasswordCheck(credentials.password)
+        user = await identity_index.resolve("login", credentials.login, accept=password_ok)
+        if user is None:
+            raise HTTPException(status_code=401, detail="Неверный логин или пароль")
         
-        # Проверка пароля
-        stored_password = user_data.get("password")
+        user_id = user.id
+        user_data = user.to_dict()
+        verbose("👤 Выбран пользователь из потока %s", user_data.get("batch"))
         
-        if stored_password != credentials.password:
-            logger.warning(f"❌ Неверный пароль для {credentials.login}")
+        # Проверка пароля (хэш - в пуле процессов; результат уже посчитан при поиске)
+        if not await password_ok(user_id, user_data):
+            logger.warning("❌ Неверный пароль для %s", credentials.login)
             raise HTTPException(status_code=401, detail="Неверный логин или пароль")
         
-        # Остальной код...
+        log_fields(user=user_id)
+        is_completed = user_data.get("isCompleted", False) or submission_spool.pending_for_user(user_id) is not None
         
         return {
             "success": True,
             "userId": user_id,
             "login": user_data.get("login"),
-            "isCompleted": user_data.get("isCompleted", False),
-            "batch": user_data.get("batch")  # Добавим batch в ответ
+            "isCompleted": is_completed,
+            "batch": user_data.get("batch"),  # Добавим batch в ответ
+            **issue_session(user_id, user_data, completed=is_completed)
         }
         
     except HTTPException:
         raise
+    except PasswordQueueFull:
+        raise password_queue_full()
     except Exception as e:
         logger.error(f"❌ Ошибка авторизации: {e}")
         raise HTTPException(status_code=500, detail="Внутренняя ошибка сервера")
@@ -669,28 +821,60 @@ async def login(credentials: UserLogin):
 @app.post("/auth/admin-login", tags=["Auth"])
 async def admin_login(credentials: UserLogin):
     try:
-        users_ref = db.collection("users").where("login", "==", credentials.login).where("isAdmin", "==", True).get()
-        if not users_ref:
-            raise HTTPException(status_code=401, detail="Неверный логин или пароль")
+        password_ok = PasswordCheck(credentials.password)
         
-        user = users_ref[0]
-        user_data = user.to_dict()
+        async def admin_ok(user_id: str, data: Dict) -> bool:
+            return bool(data.get("isAdmin")) and await password_ok(user_id, data)
         
-        if user_data.get("password") != credentials.password:
+        user = await identity_index.resolve("login", credentials.login, accept=admin_ok)
+        if user is None or not await admin_ok(user.id, user.to_dict()):
             raise HTTPException(status_code=401, detail="Неверный логин или пароль")
         
+        user_data = user.to_dict()
+        
         return {
             "success": True,
             "userId": user.id,
             "login": user_data.get("login"),
-            "isAdmin": True
+            "isAdmin": True,
+            **issue_session(user.id, user_data)
         }
     except HTTPException:
         raise
+    except PasswordQueueFull:
+        raise password_queue_full()
     except Exception as e:
         logger.error(f"❌ Ошибка авторизации администратора: {e}")
         raise HTTPException(status_code=500, detail="Внутренняя ошибка сервера")
 
+@app.post("/auth/session/refresh", tags=["Auth"])
+async def refresh_session(request: Request):
+    """Новый токен по действующему: перечитываем пользователя (поток, прохождение могли измениться)"""
+    try:
+        token = bearer_token(request.headers.get("Authorization"))
+        if token is None:
+            raise HTTPException(status_code=401, detail="Требуется вход")
+        _, session = request_session(request)
+        
+        user = await run_db(db.collection("users").document(session.user_id).get)
+        if not user.exists:
+            raise HTTPException(status_code=401, detail="Пользователь не найден")
+        
+        user_data = user.to_dict()
+        is_completed = user_data.get("isCompleted", False) or submission_spool.pending_for_user(user.id) is not None
+        return {
+            "success": True,
+            "userId": user.id,
+            "isCompleted": is_completed,
+            **issue_session(user.id, user_data, completed=is_completed)
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Ошибка обновления сессии: {e}")
+        raise HTTPException(status_code=500, detail="Внутренняя ошибка сервера")
+
 # ============== ОПЛАТА ==============
 # @app.post("/payment/create-order", tags=["Payment"])
 # async def create_payment_order(request: Request):
@@ -736,7 +920,7 @@ async def create_payment_order(request: Request):
         order_id = str(uuid.uuid4())
         
         # Сохраняем в Firebase с информацией о покупателе
-        db.collection("payments").document(order_id).set({
+        await run_db(db.collection("payments").document(order_id).set, {
             "orderId": order_id,
             "amount": amount,
             "testCount": test_count,
@@ -834,7 +1018,7 @@ async def create_payment_order(request: Request):
 @app.post("/payment/check/{order_id}", tags=["Payment"])
 async def check_payment(order_id: str):
     try:
-        payment_ref = db.collection("payments").document(order_id).get()
+        payment_ref = await run_db(db.collection("payments").document(order_id).get)
         
         if not payment_ref.exists:
             raise HTTPException(status_code=404, detail="Заказ не найден")
@@ -845,29 +1029,27 @@ async def check_payment(order_id: str):
         
         if current_status == "pending":
             # Имитация оплаты (для теста)
-            db.collection("payments").document(order_id).update({
+            await run_db(db.collection("payments").document(order_id).update, {
                 "status": "paid",
                 "paidAt": datetime.now()
             })
             
             users = generate_users_after_payment(payment_data.get("testCount", 1))
+            password_hashes = await hash_passwords([user_data["password"] for user_data in users])
             
             batch = db.batch()
             generated_users = []
+            created = []
             
             # Получаем текущий номер потока
-            batch_ref = db.collection("batches").document("current")
-            batch_data = batch_ref.get()
-            if batch_data.exists:
-                current_batch = batch_data.to_dict().get("batchNumber", 1)
-            else:
-                current_batch = 1
+            current_batch = await current_batch_cache.get() or 1
             
-            for user_data in users:
+            for user_data, password_hash in zip(users, password_hashes):
                 user_ref = db.collection("users").document()
+                # Открытый пароль покупатель видит один раз - в ответе; нигде не храним
                 user_data_db = {
                     "login": user_data["login"],
-                    "password": user_data["password"],
+                    "passwordHash": password_hash,
                     "isCompleted": False,
                     "completedAt": None,
                     "createdAt": datetime.now(),
@@ -877,16 +1059,20 @@ async def check_payment(order_id: str):
                     "purchasedBy": buyer_user_id  # 👈 КТО КУПИЛ (ОЧЕНЬ ВАЖНО!)
                 }
                 batch.set(user_ref, user_data_db)
+                index_user(batch, user_ref.id, user_data_db)
+                created.append((user_ref.id, user_data_db))
                 generated_users.append({
                     "userId": user_ref.id,  # 👈 ДОБАВЛЯЕМ userId
                     "login": user_data["login"],
                     "password": user_data["password"]
                 })
             
-            batch.commit()
+            await run_db(batch.commit)
+            for user_id, user_data_db in created:
+                identity_index.remember(user_id, user_data_db)
             
-            db.collection("payments").document(order_id).update({
-                "users": generated_users,
+            await run_db(db.collection("payments").document(order_id).update, {
+                "users": [{"userId": u["userId"], "login": u["login"]} for u in generated_users],
                 "status": "completed"
             })
             
@@ -908,8 +1094,12 @@ async def check_payment(order_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 # ============== ТЕСТИРОВАНИЕ ==============
-@app.get("/questions", tags=["Test"])
-async def get_questions(request: Request):
+@app.get("/questions", tags=["Test"], dependencies=[Depends(admit("/questions"))])
+async def get_questions(request: Request, version: Optional[str] = None):
+    """
+    Вопросы текущей версии каталога или конкретной (?version=...),
+    например, чтобы продолжить начатый тест после смены каталога
+    """
     try:
         lang = request.headers.get("Accept-Language", "ru")
         if lang.startswith("kk"):
@@ -917,26 +1107,37 @@ async def get_questions(request: Request):
         else:
             lang = "ru"
         
-        logger.info(f"📝 Запрос вопросов на языке: {lang}")
+        log_fields(lang=lang)
+        
+        catalog = await get_catalog_async(version)
+        if catalog is None:
+            raise HTTPException(status_code=404, detail="Версия каталога не найдена")
+        
+        # Тело ответа уже сериализовано и сжато для каждой версии каталога
+        payload = catalog.payloads[lang]
+        encoding = pick_encoding(request.headers.get("Accept-Encoding", ""), payload)
+        etag = payload.etag if encoding is None else f'{payload.etag[:-1]}-{encoding}"'
+        headers = {
+            "ETag": etag,
+            "Vary": "Accept-Language, Accept-Encoding",
+            "Cache-Control": "no-cache",
+            "X-Catalog-Version": catalog.version or ""
+        }
         
-        questions_ref = db.collection("questions").order_by("number").get()
+        if etag_matches(request.headers.get("If-None-Match"), payload.etag):
+            return Response(status_code=304, headers=headers)
         
-        questions = []
-        for q in questions_ref:
-            q_data = q.to_dict()
-            text_field = "text_ru" if lang == "ru" else "text_kz"
-            
-            questions.append({
-                "id": q.id,
-                "number": q_data.get("number"),
-                "text": q_data.get(text_field, q_data.get("text_ru", "Вопрос")),
-                "types": q_data.get("types", []),
-                "is_inverted": q_data.get("is_inverted", False)
-            })
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
         
-        logger.info(f"✅ Загружено {len(questions)} вопросов на языке {lang}")
-        return {"questions": questions}
+        return Response(
+            content=payload.encoded(encoding),
+            media_type="application/json",
+            headers=headers
+        )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Ошибка получения вопросов: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1038,120 +1239,334 @@ async def get_questions(request: Request):
 #     except Exception as e:
 #         logger.error(f"❌ Ошибка при отправке теста: {e}")
 #         raise HTTPException(status_code=500, detail=str(e))
+# Ограничение длины ключа идемпотентности (заголовок Idempotency-Key)
+MAX_IDEMPOTENCY_KEY_LENGTH = 200
+
+def submission_response(result_data: Dict, session: Optional[Session] = None) -> Dict:
+    """Ответ /test/submit по документу результата (с сессией - и новый токен: тест пройден)"""
+    renewed = renew_session(session, completed=True) if session is not None else None
+    return {
+        "success": True,
+        "scores": result_data.get("scores"),
+        "interpretations": result_data.get("interpretations"),
+        "interpretationsKz": result_data.get("interpretationsKz"),
+        "recommendation": result_data.get("recommendation"),
+        "maxScores": result_data.get("maxScores", SCALE_MAX_SCORES),
+        "catalogVersion": result_data.get("catalogVersion"),
+        **(renewed or {})
+    }
+
+def replay_response(stored: Dict, session: Optional[Session] = None) -> JSONResponse:
+    """Повтор уже выполненной отправки - сохраненный результат"""
+    log_fields(replayed=1)
+    return JSONResponse(
+        content=jsonable_encoder(submission_response(stored, session)),
+        headers={"Idempotent-Replayed": "true"}
+    )
+
+async def replayed_submission(user_id: str, idempotency_key: str) -> Optional[Dict]:
+    """Результат отправки с этим Idempotency-Key (из спула или Firestore) или None"""
+    pending = submission_spool.pending_for_user(user_id)
+    if pending is not None:
+        return pending["result"] if pending["idempotencyKey"] == idempotency_key else None
+    results_snap = await run_db(db.collection("results").document(user_id).get)
+    if results_snap.exists:
+        stored = results_snap.to_dict()
+        if stored.get("idempotencyKey") == idempotency_key:
+            return stored
+    return None
+
+def check_submission(snapshots: Dict, user_id: str, idempotency_key: Optional[str]) -> Optional[Dict]:
+    """
+    Можно ли записать попытку: None - можно, сохраненный результат - это повтор
+    с тем же Idempotency-Key; иначе 404 / 400. snapshots - {путь: снимок}
+    документа пользователя и (если есть ключ) его результата.
+    """
+    user_snap = snapshots[db.collection("users").document(user_id).path]
+    if not user_snap.exists:
+        logger.error(f"❌ Пользователь {user_id} не найден")
+        raise HTTPException(status_code=404, detail="Пользователь не найден")
+    
+    if user_snap.to_dict().get("isCompleted"):
+        results_snap = snapshots.get(db.collection("results").document(user_id).path)
+        if results_snap is not None and results_snap.exists:
+            stored = results_snap.to_dict()
+            if stored.get("idempotencyKey") == idempotency_key:
+                return stored
+        logger.warning(f"⚠️ Пользователь {user_id} уже прошел тест")
+        raise HTTPException(status_code=400, detail="Тест уже пройден")
+    return None
+
+def commit_submission(user_id: str, idempotency_key: Optional[str], result_data: Dict, sheet: Dict,
+                      clear_progress: bool = False) -> Optional[Dict]:
+    """
+    Проверка и запись попытки одной транзакцией Firestore: если тест еще
+    не пройден - пишем результат, лист ответов и отметку о прохождении
+    (clear_progress - и удаляем автосохранение попытки) и возвращаем None. Если тест уже пройден с тем же Idempotency-Key -
+    возвращаем сохраненный результат без записей, иначе ошибка 400.
+    Параллельные отправки сериализуются транзакцией: пройдет только одна.
+    """
+    user_ref = db.collection("users").document(user_id)
+    results_ref = db.collection("results").document(user_id)
+    
+    @firestore.transactional
+    def run(transaction) -> Optional[Dict]:
+        # Результат читаем, только если есть ключ - чтобы узнать повтор
+        refs = [user_ref, results_ref] if idempotency_key else [user_ref]
+        snapshots = {snap.reference.path: snap for snap in transaction.get_all(refs)}
+        stored = check_submission(snapshots, user_id, idempotency_key)
+        if stored is not None:
+            return stored
+        
+        transaction.set(results_ref, result_data)
+        transaction.set(db.collection(ANSWER_SHEETS_COLLECTION).document(user_id), sheet)
+        transaction.update(user_ref, {
+            "isCompleted": True,
+            "completedAt": result_data["completedAt"]
+        })
+        if clear_progress:
+            transaction.delete(progress_ref(user_id))
+        return None
+    
+    return run(db.transaction())
+
+def apply_spooled_submission(record: Dict) -> None:
+    """Перенос отправки из спула в Firestore - та же транзакция, что и без спула"""
+    try:
+        commit_submission(record["userId"], record["idempotencyKey"], record["result"], record["sheet"],
+                          record.get("clearProgress", False))
+    except HTTPException as e:
+        raise PermanentSpoolError(e.detail)
+
+submission_spool = SubmissionSpool(SPOOL_DIR, apply_spooled_submission)
+
+async def spool_submission(user_id: str, idempotency_key: Optional[str], result_data: Dict, sheet: Dict,
+                           clear_progress: bool = False) -> Tuple[Optional[Dict], bool]:
+    """
+    Write-behind: проверка и запись попытки в локальный журнал вместо Firestore.
+    Возвращает (сохраненный результат, если это повтор, иначе None; проверен
+    ли пользователь по Firestore). Без проверки результат не окончательный:
+    параллельную отправку через другой воркер отвергнет только перенос спула.
+    Пользователь перечитывается всегда: отправка меняет состояние, и токену
+    сессии (выданному, возможно, до прохождения на другом устройстве) здесь не верим.
+    """
+    refs = [db.collection("users").document(user_id)]
+    if idempotency_key:
+        refs.append(db.collection("results").document(user_id))
+    checked = True
+    try:
+        snapshots = await asyncio.wait_for(get_documents(refs), SPOOL_CHECK_TIMEOUT)
+    except asyncio.TimeoutError:
+        # Firestore тормозит - не ждем: повтор и "уже пройден" проверит перенос спула
+        logger.warning(f"⚠️ Проверка пользователя {user_id} не уложилась в {SPOOL_CHECK_TIMEOUT}с")
+        checked = False
+    else:
+        stored = check_submission(snapshots, user_id, idempotency_key)
+        if stored is not None:
+            return stored, checked
+    
+    # Отправка, которая еще в журнале (проверяем после ожидания Firestore)
+    pending = submission_spool.pending_for_user(user_id)
+    if pending is not None:
+        if idempotency_key and pending["idempotencyKey"] == idempotency_key:
+            return pending["result"], checked
+        logger.warning(f"⚠️ Пользователь {user_id} уже прошел тест")
+        raise HTTPException(status_code=400, detail="Тест уже пройден")
+    
+    # Ключ нужен всегда: по нему перенос спула после сбоя узнает свою запись
+    result_data["idempotencyKey"] = idempotency_key or f"spool-{uuid.uuid4().hex}"
+    await submission_spool.append(user_id, result_data["idempotencyKey"], result_data, sheet, clear_progress)
+    return None, checked
+
+# ============== АВТОСОХРАНЕНИЕ ОТВЕТОВ ==============
+progress_store = ProgressStore()
+
+def check_progress_user(user_snap) -> None:
+    """Автосохранение только для существующего пользователя, не прошедшего тест"""
+    if not user_snap.exists:
+        raise HTTPException(status_code=404, detail="Пользователь не найден")
+    if user_snap.to_dict().get("isCompleted") or submission_spool.pending_for_user(user_snap.id) is not None:
+        raise HTTPException(status_code=400, detail="Тест уже пройден")
+
+async def resume_progress(user_id: str, catalog_version: Optional[str]):
+    """Попытка пользователя: из памяти воркера, иначе из progress/{user_id}"""
+    state = progress_store.get(user_id)
+    if state is not None and catalog_version in (None, state.catalog.version):
+        return state
+    
+    if catalog_version is None:
+        # Продолжаем по той версии каталога, по которой попытка начата
+        snap = await run_db(progress_ref(user_id).get)
+        if snap.exists:
+            catalog_version = snap.to_dict().get("catalogVersion")
+    catalog = await get_catalog_async(catalog_version)
+    if catalog is None:
+        raise HTTPException(status_code=400, detail="Неизвестная версия каталога")
+    return await progress_store.load(user_id, catalog, check_progress_user)
+
+def apply_progress_answers(state, answers: List[UserResponse]) -> None:
+    """Дельты ответов в состояние попытки (id вопроса -> номер по каталогу попытки)"""
+    by_id = state.catalog.by_id
+    numbers = []
+    for answer in answers:
+        question = by_id.get(answer.question_id)
+        if question is None:
+            raise HTTPException(status_code=400, detail=f"Неизвестный вопрос: {answer.question_id}")
+        numbers.append((question.number, answer.answer))
+    for number, answer in numbers:
+        state.apply(number, answer)
+
+def progress_response(state) -> Dict:
+    answer_bits, answered_bits = state.bits()
+    return {
+        "catalogVersion": state.catalog.version,
+        "answerBits": encode_answer_bits(answer_bits),
+        "answeredBits": encode_answer_bits(answered_bits),
+        "answered": state.count,
+        "total": state.catalog.engine.size,
+        # Дельты, которые еще ждут записи в Firestore
+        "pending": len(state.pending)
+    }
+
 @app.post("/test/submit", tags=["Test"])
 async def submit_test(test_data: TestSubmit, request: Request):
     """
     Отправка ответов и подсчет результатов
     """
     try:
-        user_id = request.headers.get("X-User-Id")
-        logger.info(f"📝 Получена отправка теста от user_id: {user_id}")
-        logger.info(f"📦 Количество ответов: {len(test_data.answers)}")
-        
-        # Проверяем существование пользователя
-        user_ref = db.collection("users").document(user_id).get()
+        user_id, session = request_session(request)
+        idempotency_key = request.headers.get("Idempotency-Key")
+        if idempotency_key is not None and not 0 < len(idempotency_key) <= MAX_IDEMPOTENCY_KEY_LENGTH:
+            raise HTTPException(status_code=400, detail="Некорректный Idempotency-Key")
+        if test_data.from_progress:
+            answers_format = "progress"
+        else:
+            answers_format = "bits" if test_data.answer_bits is not None else "list"
+        log_fields(user=user_id, format=answers_format)
+        verbose("📝 Отправка теста от user_id: %s, ответов: %d", user_id, len(test_data.answers))
         
-        if not user_ref.exists:
-            logger.error(f"❌ Пользователь {user_id} не найден")
+        if not user_id:
             raise HTTPException(status_code=404, detail="Пользователь не найден")
-        
-        user_data = user_ref.to_dict()
-        
-        if user_data.get("isCompleted"):
-            logger.warning(f"⚠️ Пользователь {user_id} уже прошел тест")
+        if session is not None and session.completed and idempotency_key is None:
+            # Токен выдан уже после прохождения - Firestore не нужен
             raise HTTPException(status_code=400, detail="Тест уже пройден")
         
-        # ============== СОХРАНЕНИЕ ОТВЕТОВ ==============
-        answers_ref = db.collection("users").document(user_id).collection("answers")
-        batch = db.batch()
-        
-        # Загружаем все вопросы для быстрого доступа
-        questions_ref = db.collection("questions").get()
-        questions_dict = {}
-        questions_by_number = {}  # 👈 ДОБАВЛЯЕМ ОТДЕЛЬНЫЙ СЛОВАРЬ ПО НОМЕРАМ
-        
-        for q in questions_ref:
-            q_data = q.to_dict()
-            questions_dict[q.id] = q_data
-            questions_by_number[q_data.get('number')] = q_data  # По номеру
-
-        saved_count = 0
-        for answer in test_data.answers:
-            answer_doc = answers_ref.document()
-            
-            # Получаем данные вопроса
-            question_data = questions_dict.get(answer.question_id, {})
-            q_number = question_data.get("number", 0)
+        progress = None
+        if test_data.from_progress:
+            if idempotency_key is not None:
+                # Повтор: автосохранение уже удалено, отдаем сохраненный результат
+                stored = await replayed_submission(user_id, idempotency_key)
+                if stored is not None:
+                    return replay_response(stored, session)
+            # Попытка уже в памяти (автосохранение): суммы по шкалам готовы
+            progress = await resume_progress(user_id, test_data.catalog_version)
+            # Ответы могли сохраняться и через другой воркер - сверяемся с Firestore
+            progress = await progress_store.refresh(progress)
+            catalog = progress.catalog
+        else:
+            # Номера и баллы вопросов берем из каталога в памяти той версии,
+            # по которой пользователь отвечал
+            catalog = await get_catalog_async(test_data.catalog_version)
+            if catalog is None:
+                raise HTTPException(status_code=400, detail="Неизвестная версия каталога")
+        log_fields(catalog=catalog.version)
+        
+        if progress is not None:
+            # ============== ЗАВЕРШЕНИЕ ПО АВТОСОХРАНЕНИЮ ==============
+            apply_progress_answers(progress, test_data.answers)
+            if not progress.count:
+                raise HTTPException(status_code=400, detail="Нет сохраненных ответов")
+            answer_bits, answered_bits = progress.bits()
+            if progress.complete:
+                answered_bits = None
+            scores = progress.scores()
+        elif test_data.answer_bits is not None:
+            # ============== КОМПАКТНЫЙ ФОРМАТ: 160 ОТВЕТОВ БИТАМИ ==============
+            try:
+                answer_bits = decode_answer_bits(test_data.answer_bits, catalog.engine.size)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            answered_bits = None
             
-            # Вычисляем баллы за ответ
-            if answer.answer:  # ответ Да
-                points = question_data.get('pointsIfYes', 1)
-                answer_text = "Да"
-            else:  # ответ Нет
-                points = question_data.get('pointsIfNo', 0)
-                answer_text = "Нет"
+            scores = catalog.engine.score_bits(answer_bits)
+        else:
+            # Ответы списком: id вопроса -> номер по каталогу
+            answers_for_scoring = []
+            for answer in test_data.answers:
+                question = catalog.by_id.get(answer.question_id)
+                answers_for_scoring.append({
+                    "question_number": question.number if question else 0,
+                    "answer": answer.answer
+                })
             
-            answer_data = {
-                "questionId": answer.question_id,
-                "questionNumber": q_number,
-                "answer": answer.answer,
-                "answerText": answer_text,
-                "points": points,
-                "submittedAt": datetime.now()
-            }
+            # Те же ответы битами - для листа ответов
+            size = catalog.engine.size
+            answer_bits = pack_answer_bits(
+                ((a["question_number"], a["answer"]) for a in answers_for_scoring), size
+            )
+            answered_bits = pack_answer_bits(
+                ((a["question_number"], True) for a in answers_for_scoring), size
+            )
+            if int.from_bytes(answered_bits, "little") == catalog.engine.all_mask:
+                answered_bits = None  # ответы на все вопросы - маска не нужна
             
-            batch.set(answer_doc, answer_data)
-            saved_count += 1
+            # ============== ПОДСЧЕТ БАЛЛОВ ==============
+            # Скомпилированный ключ каталога дает тот же результат, что calculate_score
+            scores = catalog.engine.score(answers_for_scoring)
         
-        batch.commit()
-        logger.info(f"✅ Сохранено {saved_count} ответов в коллекцию answers")
-        
-        # ============== ПОДСЧЕТ БАЛЛОВ ==============
-        answers_for_scoring = []
-        for answer in test_data.answers:
-            question_data = questions_dict.get(answer.question_id, {})
-            q_number = question_data.get("number", 0)
-            
-            answers_for_scoring.append({
-                "question_number": q_number,
-                "answer": answer.answer
-            })
-        
-        # 👇 ВАЖНО: ПЕРЕДАЕМ questions_by_number (словарь по номерам)
-        scores = calculate_score(answers_for_scoring, questions_by_number)
-        
-        interpretations = {}
-        for scale in ["Isk", "Con", "Ast", "Ist", "Psi", "NPN"]:
-            interpretations[scale] = get_interpretation(scale, scores.get(scale, 0))
+        # Готовые строки из таблиц каталога (русский и казахский)
+        interpretations = catalog.engine.interpret(scores)
+        interpretations_kz = catalog.engine.interpret(scores, "kz")
         
         recommendation = get_recommendation(scores)
         
         # ============== СОХРАНЕНИЕ РЕЗУЛЬТАТОВ ==============
+        completed_at = datetime.now()
         result_data = {
             "userId": user_id,
             "scores": scores,
             "interpretations": interpretations,
+            "interpretationsKz": interpretations_kz,
             "recommendation": recommendation,
-            "completedAt": datetime.now(),
-            "maxScores": {k: v for k, v in SCALE_MAX_SCORES.items()}
+            "completedAt": completed_at,
+            "maxScores": {k: v for k, v in SCALE_MAX_SCORES.items()},
+            # Версия каталога (ключ баллов), по которой посчитан результат
+            "catalogVersion": catalog.version
         }
         
-        db.collection("results").document(user_id).set(result_data)
+        if idempotency_key is not None:
+            result_data["idempotencyKey"] = idempotency_key
         
-        db.collection("users").document(user_id).update({
-            "isCompleted": True,
-            "completedAt": datetime.now()
-        })
+        sheet = build_answer_sheet(catalog, user_id, answer_bits, answered_bits, completed_at)
+        # Автосохранение удаляется той же записью, что и результат
+        clear_progress = progress is not None or progress_store.get(user_id) is not None
+        checked = True
+        if submission_spool.started:
+            # Ответ сразу после записи в локальный журнал, в Firestore - в фоне
+            stored, checked = await spool_submission(user_id, idempotency_key, result_data, sheet, clear_progress)
+        else:
+            # Проверка "тест еще не пройден", результат, лист ответов и отметка
+            # о прохождении - одной транзакцией
+            stored = await run_db(commit_submission, user_id, idempotency_key, result_data, sheet, clear_progress)
+        progress_store.finalize(user_id)
+        if not checked:
+            # Ответы в журнале, но прохождение не проверено - результат окончательно
+            # решит перенос спула; клиент заберет его через /test/result
+            log_fields(unchecked=1)
+            return JSONResponse(status_code=202, content={
+                "success": True,
+                "pending": True,
+                "idempotencyKey": result_data["idempotencyKey"],
+                "message": "Ответы приняты, результат будет доступен позже"
+            })
+        if stored is not None:
+            # Повтор уже выполненной отправки - отдаем сохраненный результат
+            return replay_response(stored, session)
         
-        logger.info(f"✅ Тест завершен. Рекомендация: {recommendation}")
+        log_fields(recommendation=recommendation.replace(" ", "_"))
+        verbose("📈 Баллы: %s", scores)
         
-        return {
-            "success": True,
-            "scores": scores,
-            "interpretations": interpretations,
-            "recommendation": recommendation,
-            "maxScores": SCALE_MAX_SCORES
-        }
+        return submission_response(result_data, session)
         
     except HTTPException:
         raise
@@ -1159,6 +1574,45 @@ async def submit_test(test_data: TestSubmit, request: Request):
         logger.error(f"❌ Ошибка при отправке теста: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/test/progress", tags=["Test"])
+async def save_test_progress(update: ProgressUpdate, request: Request):
+    """
+    Автосохранение: новые и измененные ответы. Запись в Firestore -
+    фоном, не чаще раза в несколько секунд на пользователя
+    """
+    try:
+        user_id, _ = request_session(request)
+        log_fields(user=user_id, answers=len(update.answers))
+        if not user_id:
+            raise HTTPException(status_code=404, detail="Пользователь не найден")
+        
+        state = await resume_progress(user_id, update.catalog_version)
+        apply_progress_answers(state, update.answers)
+        return progress_response(state)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Ошибка автосохранения теста: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/test/progress", tags=["Test"])
+async def get_test_progress(request: Request, version: Optional[str] = None):
+    """Сохраненные ответы для продолжения теста после перезагрузки страницы"""
+    try:
+        user_id, _ = request_session(request)
+        log_fields(user=user_id)
+        if not user_id:
+            raise HTTPException(status_code=404, detail="Пользователь не найден")
+        
+        return progress_response(await resume_progress(user_id, version))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Ошибка чтения прогресса теста: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/auth/register", tags=["Auth"])
 async def register(request: Request):
     """
@@ -1170,46 +1624,26 @@ async def register(request: Request):
         email = data.get('email')
         login = data.get('login', email.split('@')[0])
         
-        logger.info(f"📝 Регистрация нового пользователя: {email}")
+        verbose("📝 Регистрация нового пользователя: %s", email)
         
         # 1. Верифицируем Firebase токен
         try:
-            decoded_token = firebase_auth.verify_id_token(id_token)
+            decoded_token = await verify_id_token(id_token)
             firebase_uid = decoded_token['uid']
-            logger.info(f"✅ Firebase токен верифицирован: {firebase_uid}")
+            verbose("✅ Firebase токен верифицирован: %s", firebase_uid)
         except Exception as e:
             logger.error(f"❌ Ошибка верификации токена: {e}")
             raise HTTPException(status_code=401, detail="Недействительный токен")
         
-        # 2. Проверяем, нет ли уже такого email в Firestore
-        existing = db.collection("users").where("email", "==", email).get()
-        if existing:
-            logger.warning(f"❌ Email {email} уже зарегистрирован")
-            raise HTTPException(status_code=400, detail="Email уже зарегистрирован")
-        
-        # 3. Создаем пользователя в Firestore
+        # 2. Создаем пользователя в Firestore
         user_ref = db.collection("users").document()
         
-        # Генерируем уникальный логин
-        base_login = login
-        counter = 1
-        while True:
-            existing_login = db.collection("users").where("login", "==", base_login).get()
-            if not existing_login:
-                break
-            base_login = f"{login}{counter}"
-            counter += 1
-        
-        # Получаем текущий номер потока
-        batch_ref = db.collection("batches").document("current")
-        batch_data = batch_ref.get()
-        if batch_data.exists:
-            current_batch = batch_data.to_dict().get("batchNumber", 1)
-        else:
+        # Текущий номер потока
+        current_batch = await current_batch_cache.get()
+        if current_batch is None:
             current_batch = 1
         
         user_data = {
-            "login": base_login,
             "email": email,
             "firebaseUid": firebase_uid,
             "isCompleted": False,
@@ -1222,15 +1656,24 @@ async def register(request: Request):
             "password": None  # Пароль хранится только в Firebase Auth
         }
         
-        user_ref.set(user_data)
+        # 3. Уникальный логин (login, login1, login2, ...) и проверка email -
+        # одной транзакцией вместе с записью пользователя
+        try:
+            base_login = await run_db(register_user, user_ref, user_data, login)
+        except EmailTakenError:
+            logger.warning(f"❌ Email {email} уже зарегистрирован")
+            raise HTTPException(status_code=400, detail="Email уже зарегистрирован")
+        user_data["login"] = base_login
+        identity_index.remember(user_ref.id, user_data)
         
-        logger.info(f"✅ Пользователь создан в Firestore: {base_login}")
+        verbose("✅ Пользователь создан в Firestore: %s", base_login)
         
         return {
             "success": True,
             "userId": user_ref.id,
             "login": base_login,
-            "message": "Пользователь успешно зарегистрирован"
+            "message": "Пользователь успешно зарегистрирован",
+            **issue_session(user_ref.id, user_data)
         }
         
     except HTTPException:
@@ -1240,15 +1683,29 @@ async def register(request: Request):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/test/result/{user_id}", tags=["Test"])
-async def get_result(user_id: str):
+async def get_result(user_id: str, request: Request):
     try:
-        result_ref = db.collection("results").document(user_id).get()
-        if not result_ref.exists:
-            raise HTTPException(status_code=404, detail="Результаты не найдены")
-        
-        result_data = result_ref.to_dict()
-        user_ref = db.collection("users").document(user_id).get()
-        if user_ref.exists:
+        session = path_session(request, user_id)
+        if session is not None and session.user_id == user_id:
+            # Логин - из токена сессии
+            result_ref, user_ref = await run_db(db.collection("results").document(user_id).get), None
+        else:
+            result_ref, user_ref = await asyncio.gather(
+                run_db(db.collection("results").document(user_id).get),
+                run_db(db.collection("users").document(user_id).get)
+            )
+        if result_ref.exists:
+            result_data = result_ref.to_dict()
+        else:
+            # Результат мог еще не дойти из спула до Firestore
+            pending = submission_spool.pending_for_user(user_id)
+            if pending is None:
+                raise HTTPException(status_code=404, detail="Результаты не найдены")
+            result_data = dict(pending["result"])
+        
+        if user_ref is None:
+            result_data["login"] = session.login
+        elif user_ref.exists:
             user_data = user_ref.to_dict()
             result_data["login"] = user_data.get("login")
         
@@ -1260,18 +1717,25 @@ async def get_result(user_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/user/profile/{user_id}", tags=["User"])
-async def get_user_profile(user_id: str):
+async def get_user_profile(user_id: str, request: Request):
     """Получение профиля пользователя со всей историей"""
     try:
-        # Данные пользователя
-        user_ref = db.collection("users").document(user_id).get()
-        if not user_ref.exists:
-            raise HTTPException(status_code=404, detail="Пользователь не найден")
-        
-        user_data = user_ref.to_dict()
+        session = path_session(request, user_id)
+        if session is not None and session.user_id == user_id:
+            # Логин и дата создания - из токена сессии, читаем только историю
+            results_ref = await run_db(db.collection("results").where("userId", "==", user_id).get)
+            user_data = {"login": session.login, "createdAt": session.created_at}
+        else:
+            # Данные пользователя и все его результаты (история тестов) - параллельно
+            user_ref, results_ref = await asyncio.gather(
+                run_db(db.collection("users").document(user_id).get),
+                run_db(db.collection("results").where("userId", "==", user_id).get)
+            )
+            if not user_ref.exists:
+                raise HTTPException(status_code=404, detail="Пользователь не найден")
+            
+            user_data = user_ref.to_dict()
         
-        # Все результаты пользователя (история тестов)
-        results_ref = db.collection("results").where("userId", "==", user_id).get()
         history = []
         for res in results_ref:
             res_data = res.to_dict()
@@ -1304,6 +1768,8 @@ async def get_user_profile(user_id: str):
             "history": history
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Ошибка получения профиля: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1342,14 +1808,17 @@ async def get_user_profile(user_id: str):
 #         raise HTTPException(status_code=500, detail=str(e))
 @app.get("/user/accesses/{user_id}", tags=["User"])
 async def get_user_accesses(user_id: str):
-    """Получение всех логинов/паролей, купленных пользователем"""
+    """
+    Получение всех логинов, купленных пользователем. Пароли не хранятся в
+    открытом виде - покупатель видит их один раз, в ответе /payment/check
+    """
     try:
-        logger.info(f"🔑 Запрос доступов для пользователя: {user_id}")
+        verbose("🔑 Запрос доступов для пользователя: %s", user_id)
         
         # Ищем все аккаунты, купленные этим пользователем
-        accounts = db.collection("users").where("purchasedBy", "==", user_id).get()
+        accounts = await run_db(db.collection("users").where("purchasedBy", "==", user_id).get)
         
-        logger.info(f"📊 Найдено доступов: {len(accounts)}")
+        verbose("📊 Найдено доступов: %d", len(accounts))
         
         accesses = []
         for acc in accounts:
@@ -1357,7 +1826,6 @@ async def get_user_accesses(user_id: str):
             accesses.append({
                 "userId": acc.id,
                 "login": acc_data.get("login"),
-                "password": acc_data.get("password"),
                 "isCompleted": acc_data.get("isCompleted", False),
                 "completedAt": acc_data.get("completedAt"),
                 "paymentId": acc_data.get("paymentId")
@@ -1369,35 +1837,84 @@ async def get_user_accesses(user_id: str):
         logger.error(f"❌ Ошибка получения доступов: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/admin/user-answers/{user_id}", tags=["Admin"])
+@app.post("/admin/import-sheets", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def import_answer_sheets(file: UploadFile = File(...), catalog_version: Optional[str] = None):
+    """
+    Импорт бумажных бланков: CSV (login и ответы строкой answers или столбцами q1..q160)
+    или JSONL ({"login", "answers"} / {"login", "answer_bits"}).
+    Возвращает число записанных бланков и ошибки по строкам.
+    """
+    try:
+        catalog = await get_catalog_async(catalog_version)
+        if catalog is None:
+            raise HTTPException(status_code=400, detail="Неизвестная версия каталога")
+        
+        report = await import_sheets(
+            file.file,
+            sheet_format(file.filename, file.content_type),
+            catalog,
+            pending=lambda user_id: submission_spool.pending_for_user(user_id) is not None
+        )
+        log_fields(imported=report["imported"], failed=report["failed"])
+        logger.info(f"📥 Импорт бланков {file.filename}: записано {report['imported']}, "
+                    f"с ошибками {report['failed']}, {report['seconds']}с")
+        
+        return {"success": True, **report}
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        # Неверный заголовок или формат файла
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ Ошибка импорта бланков: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await file.close()
+
+@app.get("/admin/user-answers/{user_id}", tags=["Admin"], dependencies=[Depends(require_admin)])
 async def get_user_answers(user_id: str):
     """
     Получение всех ответов пользователя (для админа)
     """
     try:
-        # Проверяем существование пользователя
-        user_ref = db.collection("users").document(user_id).get()
+        # Пользователь, результат и лист ответов - одним запросом
+        refs = {
+            "user": db.collection("users").document(user_id),
+            "results": db.collection("results").document(user_id),
+            "sheet": db.collection(ANSWER_SHEETS_COLLECTION).document(user_id)
+        }
+        by_path = await get_documents(refs.values())
+        snapshots = {name: by_path[ref.path] for name, ref in refs.items()}
+        
+        user_ref = snapshots["user"]
         if not user_ref.exists:
             raise HTTPException(status_code=404, detail="Пользователь не найден")
         
-        # Получаем все ответы из подколлекции
-        answers_ref = db.collection("users").document(user_id).collection("answers")
-        answers = answers_ref.order_by("questionNumber").get()
-        
-        result = []
-        for ans in answers:
-            ans_data = ans.to_dict()
-            result.append({
-                "questionNumber": ans_data.get("questionNumber"),
-                "answer": ans_data.get("answer"),
-                "answerText": ans_data.get("answerText", "Да" if ans_data.get("answer") else "Нет"),
-                "points": ans_data.get("points", 0),
-                "submittedAt": ans_data.get("submittedAt")
-            })
-        
-        # Получаем результаты пользователя
-        results_ref = db.collection("results").document(user_id).get()
+        results_ref = snapshots["results"]
         results_data = results_ref.to_dict() if results_ref.exists else None
+        sheet_ref = snapshots["sheet"]
+        
+        if sheet_ref.exists:
+            # Все ответы попытки - в одном документе
+            sheet = sheet_ref.to_dict()
+            catalog = await get_catalog_async(sheet.get("catalogVersion")) or await get_catalog_async()
+            result = answers_from_sheet(sheet, catalog)
+        else:
+            # Старый формат: по документу на ответ в подколлекции
+            answers_ref = db.collection("users").document(user_id).collection("answers")
+            answers = await run_db(answers_ref.order_by("questionNumber").get)
+            
+            result = []
+            for ans in answers:
+                ans_data = ans.to_dict()
+                result.append({
+                    "questionNumber": ans_data.get("questionNumber"),
+                    "answer": ans_data.get("answer"),
+                    "answerText": ans_data.get("answerText", "Да" if ans_data.get("answer") else "Нет"),
+                    "points": ans_data.get("points", 0),
+                    "submittedAt": ans_data.get("submittedAt")
+                })
         
         return {
             "userId": user_id,
@@ -1457,32 +1974,127 @@ async def get_user_answers(user_id: str):
 #         logger.error(f"❌ Ошибка загрузки вопросов: {e}")
 #         raise HTTPException(status_code=500, detail=str(e))
 # ============== ЗАГРУЗКА ВОПРОСОВ ==============
-@app.post("/admin/load-questions", tags=["Admin"])
-async def load_questions_from_excel():
+def run_question_load(progress, key: str = DEFAULT_CATALOG_KEY, activate: bool = True) -> Dict:
+    """Синхронизация вопросов через клиент Firestore приложения (в фоновом потоке)"""
+    stats = sync_bilingual_catalog(db, progress=progress, key=key, activate=activate)
+    if not activate:
+        return {**stats, "catalogVersion": get_catalog().version}
+    
+    progress("reloading")
+    invalidate_catalog()
+    stats["catalogVersion"] = get_catalog().version
+    return stats
+
+@app.post("/admin/load-questions", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def load_questions_from_excel(key: str = DEFAULT_CATALOG_KEY, activate: bool = True):
     """
-    Загрузка вопросов из Excel в Firebase
-    ВНИМАНИЕ: Эта функция использует данные из load_bilingual_questions.py
+    Загрузка вопросов в Firebase (фоновая задача)
+    Данные берутся из questions_catalog.json, статус - GET /admin/load-questions/{job_id}
+    key - ключ баллов из файла каталога; activate=false - только сохранить версию,
+    не переключая текущий каталог
     """
     try:
-        # Просто вызываем существующий скрипт
-        import subprocess
-        import sys
+        if key not in load_catalog_data()["keys"]:
+            raise HTTPException(status_code=400, detail=f"Неизвестный ключ баллов: {key}")
         
-        result = subprocess.run([sys.executable, "load_bilingual_questions.py"], 
-                               capture_output=True, text=True)
+        job = start_job(f"load-questions:{key}", partial(run_question_load, key=key, activate=activate))
         
-        if result.returncode == 0:
-            logger.info(f"✅ Вопросы успешно загружены")
-            logger.info(f"📋 Вывод: {result.stdout}")
-            return {"success": True, "message": "Вопросы загружены", "output": result.stdout}
-        else:
-            logger.error(f"❌ Ошибка загрузки: {result.stderr}")
-            raise HTTPException(status_code=500, detail=result.stderr)
+        return JSONResponse(status_code=202, content={
+            "success": True,
+            "jobId": job["jobId"],
+            "status": job["status"],
+            "message": "Загрузка вопросов запущена"
+        })
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Ошибка загрузки вопросов: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/admin/load-questions/{job_id}", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def get_load_questions_status(job_id: str):
+    """Статус загрузки вопросов: этап, результат и версия каталога"""
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Задача не найдена")
+    
+    return {
+        "jobId": job["jobId"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "createdAt": job["createdAt"],
+        "startedAt": job["startedAt"],
+        "finishedAt": job["finishedAt"],
+        "result": job["result"],
+        "catalogVersion": (job["result"] or {}).get("catalogVersion"),
+        "error": job["error"]
+    }
+
+@app.get("/admin/rejected-submissions", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def get_rejected_submissions(limit: int = 100):
+    """Отправки, отвергнутые при переносе спула (например, повторная отправка через другой воркер)"""
+    try:
+        query = db.collection(REJECTED_COLLECTION).order_by(
+            "rejectedAt", direction=firestore.Query.DESCENDING
+        ).limit(max(1, min(limit, 1000)))
+        rejected = []
+        for snap in await run_db(query.get):
+            entry = snap.to_dict()
+            entry["id"] = snap.id
+            rejected.append(entry)
+        return {"rejected": rejected}
+        
+    except Exception as e:
+        logger.error(f"❌ Ошибка получения отвергнутых результатов: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/admin/metrics/passwords", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def get_password_metrics():
+    """Пул проверки паролей: проверки, отказы при переполнении очереди, время"""
+    return password_metrics()
+
+@app.get("/admin/metrics/admission", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def get_admission_metrics():
+    """Очереди допуска по роутам (глубина, ожидание, отказы) и очередь к Firestore"""
+    return admission_metrics()
+
+@app.post("/admin/identities/rebuild", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def rebuild_identity_index():
+    """
+    Пересборка индекса логинов, email и Firebase UID по всем пользователям (в фоне).
+    Статус - GET /admin/identities/rebuild/{job_id}
+    """
+    try:
+        job = start_job("rebuild-identities", rebuild_identities)
+        return JSONResponse(status_code=202, content={
+            "success": True,
+            "jobId": job["jobId"],
+            "status": job["status"],
+            "message": "Пересборка индекса запущена"
+        })
+    except Exception as e:
+        logger.error(f"❌ Ошибка запуска пересборки индекса: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/admin/identities/rebuild/{job_id}", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def get_rebuild_identities_status(job_id: str):
+    """Статус пересборки индекса пользователей"""
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Задача не найдена")
+    
+    return {
+        "jobId": job["jobId"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "createdAt": job["createdAt"],
+        "startedAt": job["startedAt"],
+        "finishedAt": job["finishedAt"],
+        "result": job["result"],
+        "error": job["error"]
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True, log_level="info")
\ No newline at end of file
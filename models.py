@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 from enum import Enum
@@ -49,7 +49,28 @@ class UserResponse(BaseModel):
 
 class TestSubmit(BaseModel):
     """Отправка теста"""
+    answers: List[UserResponse] = []
+    # Компактный формат вместо answers: ответы на все 160 вопросов битами
+    # (20 байт в base64, бит n-1 = вопрос n, младший бит байта первым, 1 = Да)
+    answer_bits: Optional[str] = None
+    # Версия каталога, по которой отвечал пользователь (поле "version" из GET /questions);
+    # если не передана - текущая
+    catalog_version: Optional[str] = None
+    # Завершить попытку по ответам, сохраненным через /test/progress
+    # (answers в этом случае - последние изменения, которые еще не отправлялись)
+    from_progress: bool = False
+
+    @model_validator(mode="after")
+    def check_answers(self):
+        if self.answer_bits is None and "answers" not in self.model_fields_set and not self.from_progress:
+            raise ValueError("Нужно передать answers, answer_bits или from_progress")
+        return self
+
+class ProgressUpdate(BaseModel):
+    """Изменения ответов для автосохранения: только новые или измененные ответы"""
     answers: List[UserResponse]
+    # Версия каталога попытки; если не передана - версия сохраненного прогресса или текущая
+    catalog_version: Optional[str] = None
 
 class UserLogin(BaseModel):
     """Логин пользователя"""
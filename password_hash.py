@@ -0,0 +1,46 @@
+import base64
+import hashlib
+import hmac
+import os
+
+# ============== ХЭШ ПАРОЛЯ (SCRYPT) ==============
+# Только стандартная библиотека: модуль импортируют процессы пула
+# проверки паролей (см. passwords.py), им не нужны Firebase и конфиг.
+#
+# Формат: scrypt$<n>$<r>$<p>$<соль base64>$<хэш base64>
+
+SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", str(2 ** 14)))
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+PREFIX = "scrypt"
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+        maxmem=256 * n * r + 1024 * 1024, dklen=HASH_BYTES
+    )
+
+
+def hash_password(password: str) -> str:
+    salt = os.urandom(SALT_BYTES)
+    digest = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return "$".join((
+        PREFIX, str(SCRYPT_N), str(SCRYPT_R), str(SCRYPT_P),
+        base64.b64encode(salt).decode("ascii"), base64.b64encode(digest).decode("ascii")
+    ))
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    try:
+        prefix, n, r, p, salt, digest = encoded.split("$")
+        if prefix != PREFIX:
+            return False
+        expected = base64.b64decode(digest)
+        actual = _scrypt(password, base64.b64decode(salt), int(n), int(r), int(p))
+    except (ValueError, TypeError):
+        return False
+    return hmac.compare_digest(actual, expected)
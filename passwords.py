@@ -0,0 +1,168 @@
+import os
+import time
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from firebase_admin import firestore
+
+from config import db, logger, run_db
+from password_hash import hash_password, verify_password
+
+# ============== ПРОВЕРКА ПАРОЛЕЙ В ПУЛЕ ПРОЦЕССОВ ==============
+# Пароли хранятся хэшем scrypt (поле passwordHash, см. password_hash.py).
+# scrypt намеренно тяжелый, поэтому хэширование и проверка идут в отдельном
+# пуле процессов, а не в event loop и не в потоках (GIL).
+#
+# Очередь к пулу ограничена: вход, которому не хватило места, получает
+# отказ (503) сразу, а не ждет минуту; генерация пользователей ждет.
+#
+# Старые пользователи с паролем в открытом виде (поле password) после
+# первого успешного входа получают passwordHash, а открытый пароль удаляется.
+
+# Процессов пула и мест в очереди (в работе + ожидают)
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_QUEUE_SIZE = int(os.getenv("PASSWORD_QUEUE_SIZE", "64"))
+
+
+class PasswordQueueFull(Exception):
+    """Очередь проверки паролей переполнена"""
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_slots: Optional[asyncio.Semaphore] = None
+# Фоновые переводы открытых паролей на хэш: user_id -> задача
+_upgrades: Dict[str, asyncio.Task] = {}
+
+_metrics = {
+    "hashed": 0,
+    "verified": 0,
+    "mismatched": 0,
+    "upgraded": 0,
+    "rejected": 0,
+    "poolCalls": 0,
+    "queued": 0,
+    "maxQueued": 0,
+    "totalMs": 0.0,
+    "maxMs": 0.0
+}
+
+
+def _pool() -> ProcessPoolExecutor:
+    global _executor, _slots
+    if _executor is None:
+        # spawn: дочерние процессы не наследуют потоки gRPC/Firestore воркера
+        _executor = ProcessPoolExecutor(
+            max_workers=PASSWORD_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+        _slots = asyncio.Semaphore(PASSWORD_QUEUE_SIZE)
+    return _executor
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def _submit(fn, *args, wait: bool):
+    executor = _pool()
+    if not wait and _slots.locked():
+        _metrics["rejected"] += 1
+        raise PasswordQueueFull()
+
+    async with _slots:
+        _metrics["queued"] += 1
+        _metrics["maxQueued"] = max(_metrics["maxQueued"], _metrics["queued"])
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        finally:
+            _metrics["queued"] -= 1
+            _metrics["poolCalls"] += 1
+            elapsed = (time.perf_counter() - started) * 1000
+            _metrics["totalMs"] += elapsed
+            _metrics["maxMs"] = max(_metrics["maxMs"], elapsed)
+
+
+async def hash_passwords(passwords: List[str]) -> List[str]:
+    """Хэши для новых пользователей (ждет место в очереди, не отказывает)"""
+    hashes = await asyncio.gather(*(_submit(hash_password, password, wait=True) for password in passwords))
+    _metrics["hashed"] += len(hashes)
+    return list(hashes)
+
+
+async def check_user_password(user_id: str, user_data: Dict, password: Optional[str]) -> bool:
+    """
+    Пароль пользователя: по хэшу в пуле процессов или (старые пользователи)
+    сравнением открытого пароля с последующей заменой на хэш.
+    PasswordQueueFull - очередь переполнена.
+    """
+    if not isinstance(password, str):
+        return False
+
+    encoded = user_data.get("passwordHash")
+    if encoded:
+        ok = await _submit(verify_password, password, encoded, wait=False)
+    else:
+        ok = user_data.get("password") is not None and user_data.get("password") == password
+        if ok:
+            _upgrade(user_id, password)
+    _metrics["verified" if ok else "mismatched"] += 1
+    return ok
+
+
+def has_password(user_data: Dict) -> bool:
+    return bool(user_data.get("passwordHash") or user_data.get("password"))
+
+
+def _upgrade(user_id: str, password: str) -> None:
+    """Открытый пароль -> passwordHash в фоне, ответ на вход не ждет"""
+    if user_id in _upgrades:
+        return
+
+    async def run():
+        try:
+            encoded = await _submit(hash_password, password, wait=True)
+            await run_db(db.collection("users").document(user_id).update, {
+                "passwordHash": encoded,
+                "password": firestore.DELETE_FIELD
+            })
+            _metrics["upgraded"] += 1
+        except Exception as e:
+            logger.warning(f"⚠️ Пароль пользователя {user_id} не переведен на хэш: {e}")
+        finally:
+            _upgrades.pop(user_id, None)
+
+    _upgrades[user_id] = asyncio.get_running_loop().create_task(run())
+
+
+class PasswordCheck:
+    """
+    Проверка пароля для identity_index.resolve: результат запоминается,
+    чтобы один и тот же документ не хэшировался дважды за запрос
+    """
+
+    def __init__(self, password: Optional[str], require_password: bool = True):
+        self.password = password
+        self.require_password = require_password
+        self._results: Dict[tuple, bool] = {}
+
+    async def __call__(self, user_id: str, user_data: Dict) -> bool:
+        if not self.require_password and not has_password(user_data):
+            return True  # зарегистрирован через email - пароль хранит Firebase
+        key = (user_id, user_data.get("passwordHash"), user_data.get("password"))
+        if key not in self._results:
+            self._results[key] = await check_user_password(user_id, user_data, self.password)
+        return self._results[key]
+
+
+def password_metrics() -> Dict:
+    return dict(
+        _metrics,
+        workers=PASSWORD_WORKERS,
+        queueSize=PASSWORD_QUEUE_SIZE,
+        avgMs=round(_metrics["totalMs"] / max(1, _metrics["poolCalls"]), 1)
+    )
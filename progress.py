@@ -0,0 +1,292 @@
+import os
+import time
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from firebase_admin import firestore
+
+from config import db, logger, verbose, run_db, get_documents
+from scoring import SCALES, answer_bits_length, decode_answer_bits, encode_answer_bits
+
+# ============== АВТОСОХРАНЕНИЕ ПРОГРЕССА ТЕСТА ==============
+# POST /test/progress присылает изменения ответов (дельты). Воркер держит
+# состояние попытки в памяти: маски ответов и текущие суммы по шкалам,
+# которые пересчитываются по одному вопросу на дельту.
+#
+# В Firestore состояние попадает не на каждый запрос: фоновая задача раз в
+# PROGRESS_FLUSH_INTERVAL секунд пишет накопленные дельты небольшими пачками
+# пользователей (транзакция на пачку) - не больше одной записи
+# progress/{user_id} на пользователя за интервал. Транзакция читает
+# сохраненные биты и накладывает на них дельты, поэтому воркеры с общим
+# пользователем не затирают друг друга. Пользователей, у которых уже есть
+# результат, транзакция пропускает: иначе запоздавший сброс создал бы
+# автосохранение заново после отправки теста.
+#
+# Перед подсчетом по автосохранению (/test/submit с from_progress) состояние
+# перечитывается из Firestore: ответы, сохраненные другим воркером, тоже
+# попадают в результат. Дельты другого воркера, еще не сброшенные (до
+# PROGRESS_FLUSH_INTERVAL секунд), в результат не попадут.
+#
+#   progress/{user_id}: userId, catalogVersion, answerBits, answeredBits, updatedAt
+#
+# После перезагрузки страницы GET /test/progress отдает сохраненные биты,
+# а /test/submit с from_progress берет готовые суммы вместо пересчета.
+
+PROGRESS_COLLECTION = "progress"
+
+# Как часто дельты пишутся в Firestore (секунды)
+PROGRESS_FLUSH_INTERVAL = float(os.getenv("PROGRESS_FLUSH_INTERVAL", "3"))
+# Через сколько секунд без дельт сохраненное состояние выгружается из памяти
+PROGRESS_IDLE_TTL = float(os.getenv("PROGRESS_IDLE_TTL", "1800"))
+# Пользователей в одной транзакции сброса: конфликт по одному документу
+# перезапускает только свою пачку
+PROGRESS_FLUSH_BATCH = int(os.getenv("PROGRESS_FLUSH_BATCH", "20"))
+RESULTS_COLLECTION = "results"
+
+
+class ProgressState:
+    """Попытка пользователя в памяти: ответы битами и суммы по шкалам"""
+
+    def __init__(self, user_id: str, catalog, yes: int = 0, answered: int = 0):
+        self.user_id = user_id
+        self.catalog = catalog
+        self.yes = yes & answered
+        self.answered = answered
+        self.sums = catalog.engine.score_answered(self.yes, answered)
+        # Дельты, еще не записанные в Firestore: номер вопроса -> ответ
+        self.pending: Dict[int, bool] = {}
+        self.touched = time.monotonic()
+        self.finalized = False
+
+    def apply(self, number: int, answer: bool) -> None:
+        """Ответ на вопрос number: суммы меняются только на баллы этого вопроса"""
+        engine = self.catalog.engine
+        bit = 1 << (number - 1)
+        if self.answered & bit:
+            old = engine.yes_rows[number - 1] if self.yes & bit else engine.no_rows[number - 1]
+            self.sums = [total - points for total, points in zip(self.sums, old)]
+        new = engine.yes_rows[number - 1] if answer else engine.no_rows[number - 1]
+        self.sums = [total + points for total, points in zip(self.sums, new)]
+
+        self.answered |= bit
+        self.yes = self.yes | bit if answer else self.yes & ~bit
+        self.pending[number] = answer
+        self.touched = time.monotonic()
+
+    def rebase(self, yes: int, answered: int, flushed: Optional[Dict[int, bool]] = None) -> None:
+        """Состояние после записи в Firestore; дельты, пришедшие во время записи, остаются"""
+        for number, answer in (flushed or {}).items():
+            if self.pending.get(number) == answer:
+                del self.pending[number]
+        yes, answered = apply_deltas(yes, answered, self.pending)
+        if (yes, answered) != (self.yes, self.answered):
+            # Другой воркер успел записать свои ответы - суммы заново по битам
+            self.yes, self.answered = yes, answered
+            self.sums = self.catalog.engine.score_answered(yes, answered)
+
+    @property
+    def count(self) -> int:
+        return self.answered.bit_count()
+
+    @property
+    def complete(self) -> bool:
+        return self.answered & self.catalog.engine.all_mask == self.catalog.engine.all_mask
+
+    def scores(self) -> Dict[str, int]:
+        return dict(zip(SCALES, self.sums))
+
+    def bits(self) -> Tuple[bytes, bytes]:
+        length = answer_bits_length(self.catalog.engine.size)
+        return self.yes.to_bytes(length, "little"), self.answered.to_bytes(length, "little")
+
+
+def apply_deltas(yes: int, answered: int, deltas: Dict[int, bool]) -> Tuple[int, int]:
+    for number, answer in deltas.items():
+        bit = 1 << (number - 1)
+        answered |= bit
+        yes = yes | bit if answer else yes & ~bit
+    return yes, answered
+
+
+def stored_bits(data: Optional[Dict], catalog) -> Tuple[int, int]:
+    """Биты из документа progress; другая версия каталога - начинаем заново"""
+    if not data or data.get("catalogVersion") != catalog.version:
+        return 0, 0
+    size = catalog.engine.size
+    try:
+        yes = int.from_bytes(decode_answer_bits(data["answerBits"], size), "little")
+        answered = int.from_bytes(decode_answer_bits(data["answeredBits"], size), "little")
+    except (KeyError, ValueError):
+        logger.warning(f"⚠️ Поврежденный прогресс пользователя {data.get('userId')} - начинаем заново")
+        return 0, 0
+    return yes, answered
+
+
+def progress_ref(user_id: str):
+    return db.collection(PROGRESS_COLLECTION).document(user_id)
+
+
+def progress_document(state: ProgressState, yes: int, answered: int) -> Dict:
+    length = answer_bits_length(state.catalog.engine.size)
+    return {
+        "userId": state.user_id,
+        "catalogVersion": state.catalog.version,
+        "answerBits": encode_answer_bits(yes.to_bytes(length, "little")),
+        "answeredBits": encode_answer_bits(answered.to_bytes(length, "little")),
+        "updatedAt": datetime.now()
+    }
+
+
+def _commit_progress(batch: List[Tuple[ProgressState, Dict[int, bool]]]) -> Dict[str, Tuple[int, int]]:
+    """
+    Дельты пачки пользователей одной транзакцией: {user_id: (yes, answered)
+    после записи}. Пользователи с результатом пропускаются (нет в ответе).
+    """
+    refs = [progress_ref(state.user_id) for state, _ in batch]
+    results_refs = [db.collection(RESULTS_COLLECTION).document(state.user_id) for state, _ in batch]
+
+    @firestore.transactional
+    def run(transaction) -> Dict[str, Tuple[int, int]]:
+        snapshots = {snap.reference.path: snap for snap in transaction.get_all(refs + results_refs)}
+        merged = {}
+        for (state, deltas), ref, results_ref in zip(batch, refs, results_refs):
+            if snapshots[results_ref.path].exists:
+                # Тест уже отправлен (возможно, с другого воркера) - автосохранение не нужно
+                continue
+            snap = snapshots.get(ref.path)
+            data = snap.to_dict() if snap is not None and snap.exists else None
+            yes, answered = apply_deltas(*stored_bits(data, state.catalog), deltas)
+            transaction.set(ref, progress_document(state, yes, answered))
+            merged[state.user_id] = (yes, answered)
+        return merged
+
+    return run(db.transaction())
+
+
+class ProgressStore:
+    """Состояния попыток в памяти воркера и фоновый сброс дельт в Firestore"""
+
+    def __init__(self):
+        self._states: Dict[str, ProgressState] = {}
+        self._loading: Dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    # ---------- запуск и остановка ----------
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Последний сброс дельт перед остановкой воркера"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        self._task = None
+        try:
+            await asyncio.wait_for(self.flush(), timeout)
+        except Exception as e:
+            logger.warning(f"⚠️ Прогресс тестов не сохранен до остановки: {e}")
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None
+
+    # ---------- состояние пользователя ----------
+
+    async def load(self, user_id: str, catalog, user_check=None) -> ProgressState:
+        """
+        Состояние из памяти, иначе из progress/{user_id} (одно чтение вместе с
+        документом пользователя). user_check(user_snapshot) - проверка
+        пользователя при загрузке (например, тест уже пройден).
+        Другая версия каталога - попытка начинается заново.
+        """
+        state = self._states.get(user_id)
+        if state is not None:
+            if state.catalog.version == catalog.version:
+                return state
+            self.finalize(user_id)
+
+        # Параллельные первые дельты одного пользователя ждут одну загрузку
+        task = self._loading.get(user_id)
+        if task is None:
+            task = asyncio.ensure_future(self._read(user_id, catalog, user_check))
+            self._loading[user_id] = task
+            task.add_done_callback(lambda _: self._loading.pop(user_id, None))
+        return await asyncio.shield(task)
+
+    async def _read(self, user_id: str, catalog, user_check) -> ProgressState:
+        user_ref = db.collection("users").document(user_id)
+        ref = progress_ref(user_id)
+        snapshots = await get_documents([user_ref, ref])
+        if user_check is not None:
+            user_check(snapshots[user_ref.path])
+        snap = snapshots[ref.path]
+        yes, answered = stored_bits(snap.to_dict() if snap.exists else None, catalog)
+        state = ProgressState(user_id, catalog, yes, answered)
+        self._states[user_id] = state
+        return state
+
+    def get(self, user_id: str) -> Optional[ProgressState]:
+        return self._states.get(user_id)
+
+    async def refresh(self, state: ProgressState) -> ProgressState:
+        """Перед подсчетом: ответы, сохраненные другими воркерами, + свои несохраненные дельты"""
+        snap = await run_db(progress_ref(state.user_id).get)
+        data = snap.to_dict() if snap.exists else None
+        if data and data.get("catalogVersion") == state.catalog.version:
+            state.rebase(*stored_bits(data, state.catalog))
+        return state
+
+    def finalize(self, user_id: str) -> None:
+        """Попытка отправлена: дельты больше не пишутся, документ удалит запись результата"""
+        state = self._states.pop(user_id, None)
+        if state is not None:
+            state.finalized = True
+
+    # ---------- сброс в Firestore ----------
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(PROGRESS_FLUSH_INTERVAL)
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Дельты остаются в памяти - запишем в следующий раз
+                logger.error(f"❌ Ошибка сохранения прогресса тестов: {e}")
+            self._evict()
+
+    async def flush(self) -> int:
+        """Все накопленные дельты в Firestore; возвращает число записанных пользователей"""
+        dirty = [(state, dict(state.pending)) for state in self._states.values() if state.pending]
+        if not dirty:
+            return 0
+
+        chunks = [dirty[i:i + PROGRESS_FLUSH_BATCH] for i in range(0, len(dirty), PROGRESS_FLUSH_BATCH)]
+        outcomes = await asyncio.gather(*(run_db(_commit_progress, chunk) for chunk in chunks), return_exceptions=True)
+
+        written = 0
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.warning(f"⚠️ Прогресс {len(chunk)} пользователей не сохранен, повторим: {outcome}")
+                continue
+            for state, deltas in chunk:
+                if state.user_id not in outcome:
+                    # Результат уже записан - попытка в памяти больше не нужна
+                    state.pending.clear()
+                    if self._states.get(state.user_id) is state:
+                        self.finalize(state.user_id)
+                elif not state.finalized:
+                    state.rebase(*outcome[state.user_id], deltas)
+            written += len(chunk)
+        if written:
+            verbose("💾 Прогресс теста сохранен: %d пользователей", written)
+        return written
+
+    def _evict(self) -> None:
+        """Давно не менявшиеся и уже сохраненные попытки - из памяти"""
+        deadline = time.monotonic() - PROGRESS_IDLE_TTL
+        for user_id in [uid for uid, state in self._states.items() if not state.pending and state.touched < deadline]:
+            del self._states[user_id]
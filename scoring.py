@@ -467,12 +467,20 @@
 
 
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Mapping, NamedTuple, Iterable, Tuple
+import base64
+import binascii
 import logging
+from functools import lru_cache
+import numpy as np
 from models import ScaleType
 
 logger = logging.getLogger(__name__)
 
+# Порядок шкал в матрицах и векторах баллов
+SCALES = ("Isk", "Con", "Ast", "Ist", "Psi", "NPN")
+SCALE_INDEX = {scale: i for i, scale in enumerate(SCALES)}
+
 # Максимальные баллы по шкалам
 SCALE_MAX_SCORES = {
     "Isk": 17,
@@ -495,17 +503,21 @@ def calculate_score(answers: List[Dict], questions_map: Dict[int, Dict]) -> Dict
         "Isk": 0, "Con": 0, "Ast": 0, "Ist": 0, "Psi": 0, "NPN": 0
     }
     
-    logger.info(f"📊 НАЧАЛО ПОДСЧЕТА: получено {len(answers)} ответов")
-    logger.info(f"📚 questions_map содержит {len(questions_map)} вопросов")
+    # Подробный разбор пишется только на уровне DEBUG
+    debug = logger.isEnabledFor(logging.DEBUG)
     
-    # Проверяем ключевые вопросы в БД
-    test_questions = [2, 35, 42, 43, 71, 110, 153, 157]
-    for q_num in test_questions:
-        if q_num in questions_map:
-            q_data = questions_map[q_num]
-            logger.info(f"📌 Вопрос {q_num}: types={q_data.get('types')}, pointsIfYes={q_data.get('pointsIfYes')}, pointsIfNo={q_data.get('pointsIfNo')}")
-        else:
-            logger.warning(f"⚠️ Вопрос {q_num} ОТСУТСТВУЕТ в questions_map!")
+    if debug:
+        logger.debug("📊 НАЧАЛО ПОДСЧЕТА: получено %d ответов, в questions_map %d вопросов", len(answers), len(questions_map))
+        
+        # Проверяем ключевые вопросы в БД
+        test_questions = [2, 35, 42, 43, 71, 110, 153, 157]
+        for q_num in test_questions:
+            if q_num in questions_map:
+                q_data = questions_map[q_num]
+                logger.debug("📌 Вопрос %d: types=%s, pointsIfYes=%s, pointsIfNo=%s",
+                             q_num, q_data.get('types'), q_data.get('pointsIfYes'), q_data.get('pointsIfNo'))
+            else:
+                logger.debug("⚠️ Вопрос %d ОТСУТСТВУЕТ в questions_map!", q_num)
     
     for answer_item in answers:
         q_num = answer_item["question_number"]
@@ -514,104 +526,377 @@ def calculate_score(answers: List[Dict], questions_map: Dict[int, Dict]) -> Dict
         # Получаем данные вопроса из БД
         q_data = questions_map.get(q_num)
         if not q_data:
-            logger.warning(f"⚠️ Вопрос {q_num} не найден в БД, пропускаем")
+            logger.warning("⚠️ Вопрос %s не найден в БД, пропускаем", q_num)
             continue
         
         # Получаем типы шкал из БД
         types = q_data.get('types', [])
         if not types:
-            logger.debug(f"ℹ️ Вопрос {q_num} не относится ни к одной шкале")
             continue
         
         # Получаем баллы за ответ из БД
         if answer_bool:  # ответ Да
             score = q_data.get('pointsIfYes', 0)
-            logger.debug(f"  Вопрос {q_num}: ответ ДА, балл={score}, типы={types}")
         else:  # ответ Нет
             score = q_data.get('pointsIfNo', 0)
-            logger.debug(f"  Вопрос {q_num}: ответ НЕТ, балл={score}, типы={types}")
+        if debug:
+            logger.debug("  Вопрос %d: ответ %s, балл=%s, типы=%s", q_num, "ДА" if answer_bool else "НЕТ", score, types)
         
         # Добавляем баллы во все шкалы, к которым относится вопрос
         for scale in types:
             # Особый случай: вопрос 1 не учитывается в Isk
             if scale == "Isk" and q_num == 1:
-                logger.debug(f"    🚫 Пропускаем вопрос 1 для Isk (по методике)")
                 continue
                 
             scores[scale] += score
-            logger.debug(f"    ✅ +{score} к {scale}, теперь {scores[scale]}")
     
-    logger.info(f"📈 ИТОГОВЫЕ БАЛЛЫ:")
-    for scale in ["Isk", "Con", "Ast", "Ist", "Psi", "NPN"]:
-        logger.info(f"  {scale}: {scores[scale]}/{SCALE_MAX_SCORES[scale]}")
+    if debug:
+        logger.debug("📈 ИТОГОВЫЕ БАЛЛЫ: %s", ", ".join(
+            f"{scale}: {scores[scale]}/{SCALE_MAX_SCORES[scale]}" for scale in SCALES
+        ))
     
     return scores
 
-def get_interpretation(scale: str, score: int) -> str:
+# ============== ТАБЛИЦЫ ИНТЕРПРЕТАЦИЙ ПО ТЗ И EXCEL ==============
+# Для каждой шкалы: максимум, который пишется в тексте, и пороги
+# (балл <= порога -> уровень; None - все остальные баллы)
+INTERPRETATION_TABLE = {
+    "Isk": (17, ((9, "norm"), (None, "retest"))),  # Достоверность
+    "Con": (14, ((6, "norm"), (8, "conditional"), (None, "not_recommended"))),  # Аутоагрессия
+    "NPN": (67, ((23, "norm"), (30, "conditional"), (None, "not_recommended"))),  # Нервно-психическая устойчивость
+    "Psi": (30, ((13, "norm"), (None, "not_recommended"))),  # Психопатическая реакция
+    "Ist": (30, ((27, "norm"), (None, "conditional"))),  # Истероидные проявления
+    "Ast": (19, ((15, "norm"), (None, "conditional"))),  # Ранимость, чувствительность
+}
+
+INTERPRETATION_LABELS = {
+    "ru": {
+        "norm": "норма",
+        "conditional": "условно рекомендован",
+        "not_recommended": "не рекомендован",
+        "retest": "ретест",
+    },
+    "kz": {
+        "norm": "қалыпты",
+        "conditional": "шартты түрде ұсынылады",
+        "not_recommended": "ұсынылмайды",
+        "retest": "қайта тестілеу",
+    },
+}
+
+# Формат строки с уровнем и формат для шкал без порогов
+INTERPRETATION_FORMATS = {
+    "ru": ("{label} ({score} из {max_score})", "{score} баллов"),
+    "kz": ("{label} ({score} / {max_score})", "{score} ұпай"),
+}
+
+INTERPRETATION_LANGUAGES = tuple(INTERPRETATION_LABELS)
+
+
+def _format_interpretation(scale: str, score: int, lang: str, table: Mapping = INTERPRETATION_TABLE) -> str:
+    text_format, unknown_format = INTERPRETATION_FORMATS[lang]
+    if scale not in table:
+        return unknown_format.format(score=score)
+    max_score, levels = table[scale]
+    for limit, level in levels:
+        if limit is None or score <= limit:
+            return text_format.format(label=INTERPRETATION_LABELS[lang][level], score=score, max_score=max_score)
+    return unknown_format.format(score=score)
+
+
+def build_interpretation_table(size: int, table: Mapping = INTERPRETATION_TABLE) -> Dict[str, Dict[str, tuple]]:
+    """Все строки интерпретаций: [язык][шкала][балл] для баллов 0..size-1"""
+    return {
+        lang: {
+            scale: tuple(_format_interpretation(scale, score, lang, table) for score in range(size))
+            for scale in SCALES
+        }
+        for lang in INTERPRETATION_LANGUAGES
+    }
+
+
+# Готовые строки для баллов от 0 до максимума по ТЗ
+_INTERPRETATIONS = build_interpretation_table(max(SCALE_MAX_SCORES.values()) + 1)
+
+
+def get_interpretation(scale: str, score: int, lang: str = "ru") -> str:
     """
-    Интерпретация результатов ПО ТЗ И EXCEL
+    Интерпретация результатов ПО ТЗ И EXCEL (готовая строка из таблицы)
     """
-    if scale == "Isk":  # Достоверность (17 вопросов)
-        if score <= 9:
-            return f"норма ({score} из 17)"  # ✅ ДҰРЫС!
-        else:
-            return f"ретест ({score} из 17)"
-    
-    elif scale == "Con":  # Аутоагрессия
-        if score <= 6:
-            return f"норма ({score} из 14)"
-        elif score <= 8:
-            return f"условно рекомендован ({score} из 14)"
-        else:
-            return f"не рекомендован ({score} из 14)"
-    
-    elif scale == "NPN":  # Нервно-психическая устойчивость
-        if score <= 23:
-            return f"норма ({score} из 67)"
-        elif score <= 30:
-            return f"условно рекомендован ({score} из 67)"
-        else:
-            return f"не рекомендован ({score} из 67)"
-    
-    elif scale == "Psi":  # Психопатическая реакция
-        if score <= 13:
-            return f"норма ({score} из 30)"
-        else:
-            return f"не рекомендован ({score} из 30)"
-    
-    elif scale == "Ist":  # Истероидные проявления
-        if score <= 27:
-            return f"норма ({score} из 30)"
-        else:
-            return f"условно рекомендован ({score} из 30)"
-    
-    elif scale == "Ast":  # Ранимость, чувствительность
-        if score <= 15:
-            return f"норма ({score} из 19)"
-        else:
-            return f"условно рекомендован ({score} из 19)"
-    
-    return f"{score} баллов"
+    strings = _INTERPRETATIONS[lang].get(scale)
+    if strings is not None and 0 <= score < len(strings):
+        return strings[score]
+    return _format_interpretation(scale, score, lang)
+
+
+# ============== ИТОГОВАЯ РЕКОМЕНДАЦИЯ ==============
+# Правила проверяются по порядку. Правило срабатывает, если балл хотя бы
+# одной из его шкал попал в диапазон [от, до] (None - без границы)
+RECOMMENDATION_RULES = (
+    ("не рекомендован", {"Con": (9, None), "NPN": (31, None), "Psi": (14, None), "Ist": (28, None)}),
+    ("ретест", {"Isk": (7, None)}),
+    ("условно рекомендован", {"Con": (7, 8), "NPN": (24, 30), "Ast": (16, None)}),
+)
+DEFAULT_RECOMMENDATION = "рекомендован"
+
+
+def _in_range(score, low: Optional[int], high: Optional[int]):
+    """Попадание балла в диапазон; работает и для чисел, и для массивов NumPy"""
+    result = True
+    if low is not None:
+        result = result & (score >= low)
+    if high is not None:
+        result = result & (score <= high)
+    return result
+
+
+@lru_cache(maxsize=65536)
+def _recommendation_for(scores: Tuple[int, ...]) -> str:
+    by_scale = dict(zip(SCALES, scores))
+    for recommendation, ranges in RECOMMENDATION_RULES:
+        if any(_in_range(by_scale[scale], low, high) for scale, (low, high) in ranges.items()):
+            return recommendation
+    return DEFAULT_RECOMMENDATION
+
 
 def get_recommendation(scores: Dict[str, int]) -> str:
     """
     Итоговая рекомендация на основе всех шкал
     """
-    isk_score = scores.get("Isk", 0)
-    con_score = scores.get("Con", 0)
-    npn_score = scores.get("NPN", 0)
-    psi_score = scores.get("Psi", 0)
-    ist_score = scores.get("Ist", 0)
-    ast_score = scores.get("Ast", 0)
-    
-    # Проверяем наихудший сценарий
-    if con_score > 8 or npn_score > 30 or psi_score > 13 or ist_score > 27:
-        return "не рекомендован"
-    
-    if isk_score > 6:
-        return "ретест"
-    
-    if (7 <= con_score <= 8) or (24 <= npn_score <= 30) or (ast_score > 15):
-        return "условно рекомендован"
-    
-    return "рекомендован"
\ No newline at end of file
+    return _recommendation_for(tuple(scores.get(scale, 0) for scale in SCALES))
+
+# ============== ВЕКТОРНЫЙ ПОДСЧЕТ ==============
+class ScoringEngine:
+    """
+    Скомпилированный ключ каталога: матрицы баллов "Да" и "Нет" (вопрос x шкала).
+    Исключение вопроса 1 из Isk и инверсии уже учтены в матрицах,
+    поэтому все шесть шкал считаются одним матричным произведением.
+    """
+
+    def __init__(self, questions_map: Mapping[int, Mapping], interpretation_table: Mapping = INTERPRETATION_TABLE):
+        size = max((q_num for q_num in questions_map if q_num > 0), default=0)
+        yes_points = np.zeros((size, len(SCALES)), dtype=np.int32)
+        no_points = np.zeros((size, len(SCALES)), dtype=np.int32)
+
+        for q_num, q_data in questions_map.items():
+            if q_num <= 0 or not q_data:
+                continue
+            for scale in q_data.get('types', []):
+                if scale == "Isk" and q_num == 1 and ISK_SKIP_QUESTION_1:
+                    continue
+                if scale not in SCALE_INDEX:
+                    continue
+                yes_points[q_num - 1, SCALE_INDEX[scale]] += q_data.get('pointsIfYes', 0)
+                no_points[q_num - 1, SCALE_INDEX[scale]] += q_data.get('pointsIfNo', 0)
+
+        self.size = size
+        self.yes_points = yes_points
+        self.no_points = no_points
+        # a @ yes + (m - a) @ no == a @ delta + m @ no
+        self.delta_points = yes_points - no_points
+        self.max_scores = np.maximum(yes_points, no_points).sum(axis=0)
+        for matrix in (self.yes_points, self.no_points, self.delta_points, self.max_scores):
+            matrix.setflags(write=False)
+
+        # Битовые маски шкал для подсчета по битовому набору ответов (popcount)
+        self.all_mask = (1 << size) - 1
+        self.binary = bool(np.isin(yes_points, (0, 1)).all() and np.isin(no_points, (0, 1)).all())
+        self.yes_masks = tuple(_column_mask(yes_points[:, j]) for j in range(len(SCALES)))
+        self.no_masks = tuple(_column_mask(no_points[:, j]) for j in range(len(SCALES)))
+        # Баллы одного вопроса по шкалам - для пересчета сумм по одному ответу
+        self.yes_rows = tuple(tuple(int(x) for x in row) for row in yes_points)
+        self.no_rows = tuple(tuple(int(x) for x in row) for row in no_points)
+
+        # Все строки интерпретаций [язык][шкала][балл] считаются один раз на каталог
+        strings = build_interpretation_table(int(self.max_scores.max(initial=0)) + 1, interpretation_table)
+        self.interpretation_table = {
+            lang: tuple(np.array(strings[lang][scale], dtype=object) for scale in SCALES)
+            for lang in INTERPRETATION_LANGUAGES
+        }
+
+    def score_vector(self, yes: np.ndarray, answered: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Баллы по шкалам (в порядке SCALES) для вектора ответов:
+        yes[i] - ответ "Да" на вопрос i+1, answered[i] - на вопрос ответили
+        (по умолчанию - ответы на все вопросы)
+        """
+        if answered is None:
+            answered = np.ones(self.size, dtype=np.int32)
+        return yes @ self.delta_points + answered @ self.no_points
+
+    def score(self, answers: List[Dict]) -> Dict[str, int]:
+        """Замена calculate_score: тот же вход и тот же результат"""
+        numbers = np.fromiter((a["question_number"] for a in answers), dtype=np.int64, count=len(answers))
+        flags = np.fromiter((bool(a["answer"]) for a in answers), dtype=bool, count=len(answers))
+
+        # Ответы на неизвестные вопросы пропускаются, как в calculate_score
+        known = (numbers > 0) & (numbers <= self.size)
+        index = numbers[known] - 1
+        answered = np.bincount(index, minlength=self.size)
+        yes = np.bincount(index[flags[known]], minlength=self.size)
+
+        totals = self.score_vector(yes, answered)
+        return {scale: int(totals[i]) for i, scale in enumerate(SCALES)}
+
+    def interpret(self, scores: Dict[str, int], lang: str = "ru") -> Dict[str, str]:
+        """Интерпретации всех шкал - индекс в готовой таблице"""
+        table = self.interpretation_table[lang]
+        result = {}
+        for i, scale in enumerate(SCALES):
+            score = scores.get(scale, 0)
+            strings = table[i]
+            result[scale] = strings[score] if 0 <= score < len(strings) else get_interpretation(scale, score, lang)
+        return result
+
+    def score_bits(self, bits: bytes) -> Dict[str, int]:
+        """Баллы по битовому набору ответов на все вопросы (см. pack_answer_bits)"""
+        if not self.binary:
+            # Баллы больше 1 - считаем через матрицы
+            yes = unpack_answers(np.frombuffer(bits, dtype=np.uint8), self.size)
+            totals = self.score_vector(yes.astype(np.int32))
+            return {scale: int(totals[i]) for i, scale in enumerate(SCALES)}
+
+        yes = int.from_bytes(bits, "little")
+        no = ~yes & self.all_mask
+        return {
+            scale: (yes & self.yes_masks[i]).bit_count() + (no & self.no_masks[i]).bit_count()
+            for i, scale in enumerate(SCALES)
+        }
+
+    def score_answered(self, yes: int, answered: int) -> List[int]:
+        """
+        Баллы по шкалам (в порядке SCALES) для частичных ответов:
+        yes - маска ответов "Да", answered - маска отвеченных вопросов
+        """
+        yes &= answered
+        if not self.binary:
+            length = answer_bits_length(self.size)
+            vectors = unpack_answers(
+                np.frombuffer(yes.to_bytes(length, "little") + answered.to_bytes(length, "little"),
+                              dtype=np.uint8).reshape(2, length),
+                self.size
+            ).astype(np.int32)
+            return [int(x) for x in self.score_vector(vectors[0], vectors[1])]
+
+        no = answered & ~yes
+        return [
+            (yes & self.yes_masks[i]).bit_count() + (no & self.no_masks[i]).bit_count()
+            for i in range(len(SCALES))
+        ]
+
+
+def _column_mask(column: np.ndarray) -> int:
+    """Столбец матрицы баллов -> битовая маска вопросов с ненулевым баллом"""
+    return int.from_bytes(np.packbits(column != 0, bitorder="little").tobytes(), "little")
+
+
+# ============== БИТОВЫЙ НАБОР ОТВЕТОВ ==============
+# Ответ на вопрос n - бит (n-1) % 8 (младший бит первым) байта (n-1) // 8,
+# 1 = Да, 0 = Нет. 160 ответов занимают 20 байт, в JSON и Firestore - base64.
+
+def answer_bits_length(size: int) -> int:
+    return (size + 7) // 8
+
+
+def pack_answer_bits(answers: Iterable[Tuple[int, bool]], size: int) -> bytes:
+    """(номер вопроса, ответ) -> битовый набор; вопросы вне 1..size пропускаются"""
+    value = 0
+    for q_num, answer in answers:
+        if answer and 0 < q_num <= size:
+            value |= 1 << (q_num - 1)
+    return value.to_bytes(answer_bits_length(size), "little")
+
+
+def unpack_answer_bits(bits: bytes, size: int) -> List[bool]:
+    """Битовый набор -> список ответов на вопросы 1..size"""
+    value = int.from_bytes(bits, "little")
+    return [bool(value >> i & 1) for i in range(size)]
+
+
+def encode_answer_bits(bits: bytes) -> str:
+    """Битовый набор -> base64 (формат передачи и хранения)"""
+    return base64.b64encode(bits).decode("ascii")
+
+
+def decode_answer_bits(encoded: str, size: int) -> bytes:
+    """Проверка и декодирование битового набора из base64 (формат передачи)"""
+    try:
+        bits = base64.b64decode(encoded, validate=True)
+    except (binascii.Error, ValueError):
+        raise ValueError("answer_bits: некорректный base64")
+    if len(bits) != answer_bits_length(size):
+        raise ValueError(f"answer_bits: ожидается {answer_bits_length(size)} байт, получено {len(bits)}")
+    if int.from_bytes(bits, "little") >> size:
+        raise ValueError(f"answer_bits: установлены биты за пределами {size} вопросов")
+    return bits
+
+
+class BatchScores(NamedTuple):
+    """Результаты пакетного подсчета для N тестируемых"""
+    scores: np.ndarray  # N x 6, шкалы в порядке SCALES
+    interpretations: np.ndarray  # N x 6, строки
+    recommendations: np.ndarray  # N, строки
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Результат одного тестируемого в формате /test/submit"""
+        return {
+            "scores": {scale: int(self.scores[i, j]) for j, scale in enumerate(SCALES)},
+            "interpretations": {scale: self.interpretations[i, j] for j, scale in enumerate(SCALES)},
+            "recommendation": self.recommendations[i]
+        }
+
+
+def unpack_answers(packed: np.ndarray, size: int) -> np.ndarray:
+    """
+    Битовые наборы ответов (N x ceil(size/8) байт) -> матрица 0/1 (N x size).
+    Ответ на вопрос n - бит (n-1) % 8 (младший бит первым) байта (n-1) // 8.
+    """
+    packed = np.asarray(packed, dtype=np.uint8)
+    return np.unpackbits(packed, axis=-1, count=size, bitorder="little")
+
+
+RECOMMENDATIONS = np.array([rule[0] for rule in RECOMMENDATION_RULES] + [DEFAULT_RECOMMENDATION], dtype=object)
+
+
+def recommend_many(scores: np.ndarray) -> np.ndarray:
+    """
+    Итоговые рекомендации для матрицы баллов N x 6
+    (те же RECOMMENDATION_RULES, что в get_recommendation, но над столбцами)
+    """
+    conditions = []
+    for _, ranges in RECOMMENDATION_RULES:
+        hit = np.zeros(len(scores), dtype=bool)
+        for scale, (low, high) in ranges.items():
+            hit |= _in_range(scores[:, SCALE_INDEX[scale]], low, high)
+        conditions.append(hit)
+    codes = np.select(conditions, list(range(len(RECOMMENDATION_RULES))), default=len(RECOMMENDATION_RULES))
+    return RECOMMENDATIONS[codes]
+
+
+def score_many(engine: ScoringEngine, answers: np.ndarray, packed: bool = False, lang: str = "ru") -> BatchScores:
+    """
+    Пакетный подсчет: матрица ответов N x 160 (1 = Да, 0 = Нет, ответы на все вопросы)
+    или, при packed=True, N битовых наборов по 20 байт
+    """
+    answers = np.asarray(answers)
+    if packed:
+        answers = unpack_answers(answers, engine.size)
+    if answers.ndim != 2 or answers.shape[1] != engine.size:
+        raise ValueError(f"Ожидается матрица N x {engine.size}, получено {answers.shape}")
+
+    # float32 точен для целых баллов и умножается через BLAS
+    scores = answers.astype(np.float32) @ engine.delta_points.astype(np.float32)
+    scores = scores.astype(np.int32) + engine.no_points.sum(axis=0, dtype=np.int32)
+
+    interpretations = interpret_many(engine, scores, lang)
+    recommendations = recommend_many(scores)
+
+    return BatchScores(scores, interpretations, recommendations)
+
+
+def interpret_many(engine: ScoringEngine, scores: np.ndarray, lang: str = "ru") -> np.ndarray:
+    """Интерпретации для матрицы баллов N x 6 - индексы в готовых таблицах каталога"""
+    interpretations = np.empty(scores.shape, dtype=object)
+    for j, table in enumerate(engine.interpretation_table[lang]):
+        interpretations[:, j] = table[scores[:, j]]
+    return interpretations
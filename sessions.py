@@ -0,0 +1,135 @@
+import os
+import hmac
+import json
+import time
+import base64
+import hashlib
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional
+
+from config import logger
+
+# ============== ПОДПИСАННЫЕ ТОКЕНЫ СЕССИИ ==============
+# После входа клиент получает короткоживущий токен с userId, логином,
+# потоком, признаком администратора и отметкой "тест пройден", подписанный
+# HMAC-SHA256 общим для всех воркеров секретом SESSION_SECRET:
+#
+#   <payload base64url>.<подпись base64url>
+#
+# Токен передается заголовком Authorization: Bearer <токен> и проверяется
+# локально: роуты чтения (профиль, результат) не читают users/{id}, роуты
+# /admin/* пускают только токен с признаком администратора. Отправка теста
+# меняет состояние и поэтому всегда перечитывает пользователя. Новый токен
+# выдается при входе, после отправки теста и через /auth/session/refresh.
+#
+# Пока SESSION_REQUIRED=0, старые клиенты работают как раньше: тестируемые
+# присылают X-User-Id без подписи, админка ходит в /admin/* без токена.
+# Без SESSION_SECRET токены не выдаются вовсе.
+
+SESSION_SECRET = os.getenv("SESSION_SECRET", "")
+# Срок жизни токена (секунды)
+SESSION_TTL = int(os.getenv("SESSION_TTL", str(4 * 3600)))
+# Отказывать запросам только с X-User-Id (когда все клиенты перешли на токены)
+SESSION_REQUIRED = os.getenv("SESSION_REQUIRED", "0") == "1"
+
+SESSIONS_ENABLED = bool(SESSION_SECRET)
+if not SESSIONS_ENABLED:
+    if SESSION_REQUIRED:
+        raise RuntimeError("SESSION_REQUIRED=1 без SESSION_SECRET: токены сессии нечем подписать")
+    logger.warning("⚠️ SESSION_SECRET не задан - токены сессии не выдаются, пользователь определяется по X-User-Id")
+
+
+class SessionError(Exception):
+    """Токен сессии поддельный, испорченный или просрочен"""
+
+
+class Session(NamedTuple):
+    user_id: str
+    login: Optional[str]
+    batch: Optional[int]
+    is_admin: bool
+    completed: bool
+    created_at: Optional[datetime]
+    expires_at: int
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(payload: str) -> str:
+    return _b64encode(hmac.new(SESSION_SECRET.encode("utf-8"), payload.encode("ascii"), hashlib.sha256).digest())
+
+
+def issue_session(user_id: str, user_data: Dict, completed: Optional[bool] = None) -> Dict:
+    """
+    Поля ответа входа с новым токеном ({sessionToken, sessionExpiresAt});
+    пусто, если токены выключены. completed - отметка о прохождении, если
+    она новее user_data (результат еще в спуле).
+    """
+    if not SESSIONS_ENABLED:
+        return {}
+    created_at = user_data.get("createdAt")
+    expires_at = int(time.time()) + SESSION_TTL
+    claims = {
+        "uid": user_id,
+        "login": user_data.get("login"),
+        "batch": user_data.get("batch"),
+        "adm": bool(user_data.get("isAdmin")),
+        "done": bool(user_data.get("isCompleted")) if completed is None else completed,
+        "ca": created_at.timestamp() if isinstance(created_at, datetime) else None,
+        "exp": expires_at
+    }
+    payload = _b64encode(json.dumps(claims, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+    return {"sessionToken": f"{payload}.{_sign(payload)}", "sessionExpiresAt": expires_at}
+
+
+def read_session(token: str) -> Session:
+    """Проверка подписи и срока; SessionError - токен не принят"""
+    if not SESSIONS_ENABLED:
+        raise SessionError("токены сессии выключены")
+    payload, _, signature = token.partition(".")
+    if not payload or not token.isascii() or not hmac.compare_digest(signature, _sign(payload)):
+        raise SessionError("неверная подпись")
+    try:
+        claims = json.loads(_b64decode(payload))
+        expires_at = int(claims["exp"])
+        user_id = claims["uid"]
+    except (ValueError, KeyError, TypeError):
+        raise SessionError("испорченный токен")
+    if time.time() >= expires_at:
+        raise SessionError("токен просрочен")
+    created_at = claims.get("ca")
+    return Session(
+        user_id=user_id,
+        login=claims.get("login"),
+        batch=claims.get("batch"),
+        is_admin=bool(claims.get("adm")),
+        completed=bool(claims.get("done")),
+        created_at=datetime.fromtimestamp(created_at) if created_at is not None else None,
+        expires_at=expires_at
+    )
+
+
+def bearer_token(authorization: Optional[str]) -> Optional[str]:
+    """Токен из заголовка Authorization: Bearer ..."""
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    return token.strip()
+
+
+def renew_session(session: Session, completed: bool) -> Dict:
+    """Новый токен с измененной отметкой о прохождении - без чтения пользователя"""
+    return issue_session(session.user_id, {
+        "login": session.login,
+        "batch": session.batch,
+        "isAdmin": session.is_admin,
+        "createdAt": session.created_at
+    }, completed=completed)
@@ -0,0 +1,355 @@
+import io
+import os
+import csv
+import json
+import time
+import asyncio
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Union
+
+import numpy as np
+from firebase_admin import firestore
+
+from config import db, logger, run_db, get_documents
+from catalog_sync import MAX_BATCH_WRITES
+from models import SCALE_MAX_SCORES
+from scoring import SCALES, answer_bits_length, decode_answer_bits, interpret_many, score_many
+from answer_sheets import ANSWER_SHEETS_COLLECTION, build_answer_sheet
+from identity import identity_index, identity_key, identity_ref, normalize_identity
+from progress import progress_ref
+
+# ============== ИМПОРТ БУМАЖНЫХ БЛАНКОВ ==============
+# Файл читается потоково, блоками по IMPORT_CHUNK_ROWS строк. Каждый блок:
+# поиск пользователей по индексу логинов (identities, одним get_all - тот же
+# пользователь, что и при /auth/login), пакетный подсчет score_many и запись
+# транзакциями по SHEETS_PER_TRANSACTION бланков: как и /test/submit,
+# транзакция проверяет, что тест еще не пройден, и пишет результат, лист
+# ответов, отметку о прохождении и удаляет автосохранение. Онлайн-результат
+# импорт не затрет. Одновременно идет не больше IMPORT_TRANSACTIONS
+# транзакций - остальной пул Firestore (DB_POOL_SIZE) остается запросам.
+#
+# CSV (разделитель "," или ";"), первая строка - заголовок:
+#   login (или userId) и либо answers - 160 ответов строкой ("1"/"0",
+#   "Y"/"N", "Д"/"Н"), либо столбцы q1..q160 (1/0, да/нет, yes/no)
+# JSONL - по объекту в строке:
+#   {"login": ..., "answers": "1010..." | [true, false, ...]} или "answer_bits" (base64)
+
+IMPORT_CHUNK_ROWS = int(os.getenv("IMPORT_CHUNK_ROWS", "2000"))
+# Одновременных транзакций импорта
+IMPORT_TRANSACTIONS = max(1, int(os.getenv("IMPORT_TRANSACTIONS", "4")))
+
+# Записей на бланк: результат, лист ответов, пользователь, автосохранение
+WRITES_PER_SHEET = 4
+SHEETS_PER_TRANSACTION = MAX_BATCH_WRITES // WRITES_PER_SHEET
+
+_import_slots = asyncio.Semaphore(IMPORT_TRANSACTIONS)
+
+YES_VALUES = {"1", "да", "д", "yes", "y", "true", "+"}
+NO_VALUES = {"0", "нет", "н", "no", "n", "false", "-"}
+_ANSWER_CHARS = str.maketrans({
+    "1": "1", "0": "0", "+": "1", "-": "0",
+    "Y": "1", "y": "1", "N": "0", "n": "0",
+    "Д": "1", "д": "1", "Н": "0", "н": "0"
+})
+
+
+class SheetRow(NamedTuple):
+    """Разобранный бланк"""
+    row: int  # номер строки в файле (для отчета)
+    login: Optional[str]
+    user_id: Optional[str]
+    bits: bytes
+
+
+def sheet_format(filename: Optional[str], content_type: Optional[str]) -> str:
+    """"csv" или "jsonl" по имени файла и типу содержимого"""
+    name = (filename or "").lower()
+    if name.endswith((".jsonl", ".ndjson")) or (content_type or "").endswith(("ndjson", "jsonl")):
+        return "jsonl"
+    return "csv"
+
+
+def answer_string_to_bits(text: str, size: int) -> bytes:
+    """Строка ответов ("1010...", "ДНДН...") -> битовый набор"""
+    normalized = text.strip().translate(_ANSWER_CHARS)
+    if len(normalized) != size or set(normalized) - {"0", "1"}:
+        raise ValueError(f"Ожидается {size} ответов (1/0, Y/N, Д/Н), получено {len(normalized)} символов")
+    answers = np.frombuffer(normalized.encode("ascii"), dtype=np.uint8) - ord("0")
+    return np.packbits(answers, bitorder="little").tobytes()
+
+
+def answers_to_bits(values: List, size: int) -> bytes:
+    """Список ответов (bool, 1/0 или да/нет) -> битовый набор"""
+    if len(values) != size:
+        raise ValueError(f"Ожидается {size} ответов, получено {len(values)}")
+    answers = np.zeros(size, dtype=np.uint8)
+    for i, value in enumerate(values):
+        if isinstance(value, bool) or value in (0, 1):
+            answers[i] = bool(value)
+            continue
+        text = str(value).strip().lower()
+        if text in YES_VALUES:
+            answers[i] = 1
+        elif text not in NO_VALUES:
+            raise ValueError(f"Вопрос {i + 1}: непонятный ответ '{value}'")
+    return np.packbits(answers, bitorder="little").tobytes()
+
+
+def _csv_sheets(stream: io.TextIOBase, size: int) -> Iterator[Union[SheetRow, Dict]]:
+    first = stream.readline()
+    delimiter = ";" if first.count(";") > first.count(",") else ","
+    header = [cell.strip().lower() for cell in next(csv.reader([first], delimiter=delimiter), [])]
+
+    def column(*names) -> Optional[int]:
+        return next((i for i, cell in enumerate(header) if cell in names), None)
+
+    login_col = column("login", "логин")
+    user_col = column("userid", "user_id")
+    answers_col = column("answers", "ответы")
+    question_cols = {}
+    for i, cell in enumerate(header):
+        number = cell.lstrip("qв")
+        if number.isdigit() and 0 < int(number) <= size:
+            question_cols[int(number)] = i
+
+    if login_col is None and user_col is None:
+        raise ValueError("В заголовке CSV нет столбца login или userId")
+    if answers_col is None and len(question_cols) != size:
+        raise ValueError(f"В заголовке CSV нужен столбец answers или столбцы q1..q{size}")
+
+    for row_no, row in enumerate(csv.reader(stream, delimiter=delimiter), start=2):
+        if not any(cell.strip() for cell in row):
+            continue
+        login = row[login_col].strip() if login_col is not None and login_col < len(row) else None
+        user_id = row[user_col].strip() if user_col is not None and user_col < len(row) else None
+        try:
+            if answers_col is not None:
+                bits = answer_string_to_bits(row[answers_col], size)
+            else:
+                bits = answers_to_bits([row[question_cols[n]] for n in range(1, size + 1)], size)
+        except (ValueError, IndexError) as e:
+            yield {"row": row_no, "login": login, "error": str(e) if isinstance(e, ValueError) else "Не хватает столбцов"}
+            continue
+        yield SheetRow(row_no, login or None, user_id or None, bits)
+
+
+def _jsonl_sheets(stream: io.TextIOBase, size: int) -> Iterator[Union[SheetRow, Dict]]:
+    for row_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        login = None
+        try:
+            item = json.loads(line)
+            if not isinstance(item, dict):
+                raise ValueError("Ожидается JSON-объект")
+            login, user_id = item.get("login"), item.get("userId")
+            if not isinstance(login, (str, type(None))) or not isinstance(user_id, (str, type(None))):
+                login = None
+                raise ValueError("login и userId должны быть строками")
+            if item.get("answer_bits") is not None:
+                bits = decode_answer_bits(item["answer_bits"], size)
+            elif isinstance(item.get("answers"), str):
+                bits = answer_string_to_bits(item["answers"], size)
+            elif isinstance(item.get("answers"), list):
+                bits = answers_to_bits(item["answers"], size)
+            else:
+                raise ValueError("Нет ответов (answers или answer_bits)")
+        except ValueError as e:
+            yield {"row": row_no, "login": login, "error": str(e)}
+            continue
+        yield SheetRow(row_no, login or None, user_id or None, bits)
+
+
+def parse_sheets(stream, fmt: str, size: int) -> Iterator[Union[SheetRow, Dict]]:
+    """Потоковый разбор файла: бланки и ошибки строк ({"row", "login", "error"})"""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "jsonl":
+            yield from _jsonl_sheets(text, size)
+        else:
+            yield from _csv_sheets(text, size)
+    finally:
+        text.detach()  # файл закрывает вызывающий
+
+
+def _take(rows: Iterator, count: int) -> List:
+    chunk = []
+    for item in rows:
+        chunk.append(item)
+        if len(chunk) >= count:
+            break
+    return chunk
+
+
+async def _users_by_login(logins: List[str]) -> Dict[str, object]:
+    """Логин -> документ пользователя по индексу identities, как в /auth/login"""
+    keys = {login: identity_key("login", login) for login in logins}
+    keys = {login: key for login, key in keys.items() if key is not None}
+    entries = await get_documents(identity_ref(key) for key in keys.values())
+
+    user_ids = {}
+    for login, key in keys.items():
+        entry = entries.get(identity_ref(key).path)
+        if entry is not None and entry.exists:
+            user_ids[login] = entry.to_dict()["userId"]
+    snapshots = await get_documents(db.collection("users").document(user_id) for user_id in set(user_ids.values()))
+
+    users, missing = {}, []
+    for login in keys:
+        user = snapshots.get(db.collection("users").document(user_ids[login]).path) if login in user_ids else None
+        if user is not None and user.exists and \
+                normalize_identity("login", user.to_dict().get("login")) == normalize_identity("login", login):
+            users[login] = user
+        else:
+            missing.append(login)
+
+    # Нет в индексе или запись устарела - обычный поиск индекса (с починкой)
+    for login, user in zip(missing, await asyncio.gather(*(identity_index.resolve("login", login) for login in missing))):
+        if user is not None:
+            users[login] = user
+    return users
+
+
+def _commit_sheets(sheets: List[tuple]) -> List[bool]:
+    """
+    Бланки [(user_id, результат, лист ответов)] одной транзакцией. По бланку:
+    True - записан, False - тест уже пройден (записей нет).
+    """
+    user_refs = [db.collection("users").document(user_id) for user_id, _, _ in sheets]
+
+    @firestore.transactional
+    def run(transaction) -> List[bool]:
+        users = {snap.reference.path: snap for snap in transaction.get_all(user_refs)}
+        written = []
+        for user_ref, (user_id, result_data, sheet) in zip(user_refs, sheets):
+            user = users.get(user_ref.path)
+            if user is None or not user.exists or user.to_dict().get("isCompleted"):
+                written.append(False)
+                continue
+            transaction.set(db.collection("results").document(user_id), result_data)
+            transaction.set(db.collection(ANSWER_SHEETS_COLLECTION).document(user_id), sheet)
+            transaction.update(user_ref, {
+                "isCompleted": True,
+                "completedAt": result_data["completedAt"]
+            })
+            transaction.delete(progress_ref(user_id))
+            written.append(True)
+        return written
+
+    return run(db.transaction())
+
+
+async def _commit_group(sheets: List[tuple]) -> List[bool]:
+    async with _import_slots:
+        return await run_db(_commit_sheets, sheets)
+
+
+async def _import_chunk(rows: List[SheetRow], catalog, report: Dict, seen_users: set,
+                        pending: Optional[Callable[[str], bool]]) -> None:
+    # ---------- пользователи ----------
+    by_id = await get_documents(db.collection("users").document(r.user_id) for r in rows if r.user_id)
+    by_login = await _users_by_login(sorted({r.login for r in rows if r.login and not r.user_id}))
+
+    accepted = []
+    for r in rows:
+        if r.user_id:
+            user = by_id.get(db.collection("users").document(r.user_id).path)
+            user = user if user is not None and user.exists else None
+        else:
+            user = by_login.get(r.login)
+
+        error = None
+        if user is None:
+            error = "Пользователь не найден"
+        elif user.id in seen_users:
+            error = "Пользователь уже встречался в файле"
+        elif user.to_dict().get("isCompleted") or (pending is not None and pending(user.id)):
+            error = "Тест уже пройден"
+        if error:
+            report["failed"] += 1
+            report["errors"].append({"row": r.row, "login": r.login or r.user_id, "error": error})
+            continue
+        seen_users.add(user.id)
+        accepted.append((r, user.id))
+    if not accepted:
+        return
+
+    # ---------- подсчет ----------
+    size = catalog.engine.size
+    packed = np.frombuffer(b"".join(r.bits for r, _ in accepted), dtype=np.uint8)
+    scored = score_many(catalog.engine, packed.reshape(len(accepted), answer_bits_length(size)), packed=True)
+    interpretations_kz = interpret_many(catalog.engine, scored.scores, "kz")
+
+    # ---------- запись ----------
+    now = datetime.now()
+    max_scores = {k: v for k, v in SCALE_MAX_SCORES.items()}
+    sheets = []
+    for i, (r, user_id) in enumerate(accepted):
+        row = scored.row(i)
+        result_data = {
+            "userId": user_id,
+            "scores": row["scores"],
+            "interpretations": row["interpretations"],
+            "interpretationsKz": {scale: interpretations_kz[i, j] for j, scale in enumerate(SCALES)},
+            "recommendation": row["recommendation"],
+            "completedAt": now,
+            "maxScores": max_scores,
+            "catalogVersion": catalog.version,
+            "source": "import"
+        }
+        sheets.append((user_id, result_data, build_answer_sheet(catalog, user_id, r.bits, None, now)))
+
+    groups = [sheets[i:i + SHEETS_PER_TRANSACTION] for i in range(0, len(sheets), SHEETS_PER_TRANSACTION)]
+    group_outcomes = await asyncio.gather(*(_commit_group(group) for group in groups), return_exceptions=True)
+    outcomes = []
+    for group, outcome in zip(groups, group_outcomes):
+        outcomes.extend([outcome] * len(group) if isinstance(outcome, Exception) else outcome)
+
+    failures = 0
+    for (r, _), outcome in zip(accepted, outcomes):
+        error = None
+        if isinstance(outcome, Exception):
+            failures += 1
+            error = f"Ошибка записи: {outcome}"
+        elif not outcome:
+            # Пока шел импорт, тест прошли онлайн
+            error = "Тест уже пройден"
+        if error:
+            report["failed"] += 1
+            report["errors"].append({"row": r.row, "login": r.login or r.user_id, "error": error})
+        else:
+            report["imported"] += 1
+    if failures:
+        logger.error(f"❌ Ошибка записи {failures} бланков")
+
+
+async def import_sheets(stream, fmt: str, catalog, pending: Optional[Callable[[str], bool]] = None) -> Dict:
+    """
+    Импорт бланков из файла (stream - бинарный файл) по версии каталога catalog.
+    pending(user_id) - у пользователя есть еще не записанная отправка.
+    Отчет: {"imported", "failed", "errors": [{"row", "login", "error"}], ...}
+    """
+    started = time.monotonic()
+    report = {"imported": 0, "failed": 0, "errors": []}
+    seen_users = set()
+    sheets = parse_sheets(stream, fmt, catalog.engine.size)
+
+    while True:
+        # Чтение и разбор файла - блокирующие, выполняем в потоке
+        chunk = await asyncio.to_thread(_take, sheets, IMPORT_CHUNK_ROWS)
+        if not chunk:
+            break
+        rows = []
+        for item in chunk:
+            if isinstance(item, SheetRow):
+                rows.append(item)
+            else:
+                report["failed"] += 1
+                report["errors"].append(item)
+        if rows:
+            await _import_chunk(rows, catalog, report, seen_users, pending)
+
+    report["errors"].sort(key=lambda e: e["row"])
+    report["catalogVersion"] = catalog.version
+    report["seconds"] = round(time.monotonic() - started, 3)
+    return report
@@ -0,0 +1,382 @@
+import os
+import json
+import time
+import uuid
+import socket
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from config import db, logger, run_db
+
+try:
+    import fcntl
+except ImportError:  # не POSIX (локальная разработка на Windows) - без блокировок файлов
+    fcntl = None
+
+# ============== СПУЛ ОТПРАВОК ТЕСТА (WRITE-BEHIND) ==============
+# /test/submit считает результат в памяти, дописывает отправку в локальный
+# журнал (append-only, fsync) и сразу отвечает. Фоновая задача переносит
+# записи журнала в Firestore пачками, с повторами при ошибках.
+#
+# Журнал - файлы-сегменты <хост>-<pid>-<время>.spool, по одному активному
+# на воркер; воркер держит flock на своих сегментах. Строки сегмента:
+#   {"op": "put", "record": {...}} - отправка
+#   {"op": "ack", "ids": [...]}    - отправки, уже записанные в Firestore
+# При старте воркер забирает сегменты, которые никто не держит (их воркер
+# упал), и дописывает в Firestore неподтвержденные отправки. Запись в
+# Firestore идемпотентна (ключ отправки), поэтому повтор после сбоя безопасен.
+# Новый сегмент создается под временным именем, блокируется и только потом
+# переименовывается в .spool - восстановление не увидит его незаблокированным.
+#
+# "Тест уже пройден" до записи в журнал проверяется по Firestore и по журналу
+# своего воркера. Две отправки одного пользователя через разные воркеры
+# (или принятые без проверки, когда Firestore не ответил вовремя) разрешает
+# перенос: транзакция пропустит только первую, остальные отвергаются и
+# попадают в rejected.jsonl и в коллекцию rejectedSubmissions (видна админам).
+#
+# Журнал лежит на диске узла, поэтому включается явно (SUBMIT_WRITE_BEHIND=1)
+# там, где диск переживает перезапуск воркера; по умолчанию отправка пишется
+# в Firestore транзакцией.
+
+SPOOL_DIR = os.getenv("SUBMIT_SPOOL_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "spool"))
+SPOOL_ENABLED = os.getenv("SUBMIT_WRITE_BEHIND", "0") == "1"
+
+# Сколько отправок переносится в Firestore за один проход
+SPOOL_BATCH_SIZE = int(os.getenv("SPOOL_BATCH_SIZE", "20"))
+# Пауза между проходами без новых записей и максимальная пауза при ошибках (секунды)
+SPOOL_IDLE_INTERVAL = float(os.getenv("SPOOL_IDLE_INTERVAL", "5"))
+SPOOL_RETRY_MAX_DELAY = float(os.getenv("SPOOL_RETRY_MAX_DELAY", "60"))
+# Размер, после которого полностью подтвержденный активный сегмент заменяется новым
+SPOOL_ROTATE_BYTES = int(os.getenv("SPOOL_ROTATE_BYTES", str(1024 * 1024)))
+# Сколько ждать проверку пользователя в Firestore перед записью в журнал (секунды);
+# дольше - записываем без нее, окончательно проверит перенос в Firestore
+SPOOL_CHECK_TIMEOUT = float(os.getenv("SPOOL_CHECK_TIMEOUT", "1"))
+
+SPOOL_SUFFIX = ".spool"
+# Сегмент до блокировки (восстановление такие файлы не трогает)
+SPOOL_TEMP_SUFFIX = ".tmp"
+# Отправки, которые Firestore окончательно отверг (например, тест уже пройден)
+REJECTED_FILE = "rejected.jsonl"
+REJECTED_COLLECTION = "rejectedSubmissions"
+
+
+class PermanentSpoolError(Exception):
+    """Отправку нельзя записать никогда - повторять бессмысленно"""
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    raise TypeError(f"Не сериализуется: {type(value).__name__}")
+
+
+def _decode(obj: Dict):
+    if len(obj) == 1 and "$dt" in obj:
+        return datetime.fromisoformat(obj["$dt"])
+    return obj
+
+
+def _dumps(entry: Dict) -> bytes:
+    return (json.dumps(entry, default=_encode, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _same_file(file, path: str) -> bool:
+    """Открытый файл - все еще тот, что лежит по пути path"""
+    try:
+        return os.fstat(file.fileno()).st_ino == os.stat(path).st_ino
+    except FileNotFoundError:
+        return False
+
+
+def _store_rejected(rejected: List[Dict]) -> None:
+    """Отвергнутые отправки - в Firestore, чтобы их видели администраторы"""
+    batch = db.batch()
+    for entry in rejected:
+        record = entry["record"]
+        batch.set(db.collection(REJECTED_COLLECTION).document(record["id"]), {
+            "userId": record["userId"],
+            "idempotencyKey": record["idempotencyKey"],
+            "result": record["result"],
+            "reason": entry["reason"],
+            "rejectedAt": entry["rejectedAt"]
+        })
+    batch.commit()
+
+
+class _Segment:
+    """Файл журнала и id его неподтвержденных отправок"""
+
+    def __init__(self, path: str, file):
+        self.path = path
+        self.file = file
+        self.pending = set()
+
+    @property
+    def size(self) -> int:
+        return self.file.tell()
+
+
+class SubmissionSpool:
+    """
+    Локальный журнал отправок и фоновый перенос в Firestore.
+    apply(record) - синхронная запись отправки в Firestore (выполняется через run_db);
+    PermanentSpoolError - отправка отвергнута окончательно.
+    """
+
+    def __init__(self, directory: str, apply: Callable[[Dict], None]):
+        self.directory = directory
+        self.apply = apply
+        self._records: Dict[str, Dict] = {}
+        self._segment_of: Dict[str, _Segment] = {}
+        self._by_user: Dict[str, str] = {}
+        self._in_flight = set()
+        self._segments: List[_Segment] = []
+        self._active: Optional[_Segment] = None
+        # Один поток на файлы журнала: записи и fsync идут строго по очереди
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spool")
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._failures = 0
+
+    # ---------- запуск и остановка ----------
+
+    def start(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self._recover()
+        self._active = self._open_segment()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._drain_loop())
+        if self._records:
+            logger.info(f"♻️ В спуле {len(self._records)} неотправленных результатов - дописываем в Firestore")
+            self._wakeup.set()
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Последняя попытка перенести журнал; остаток заберет следующий запуск"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await asyncio.wait_for(self._drain_once(), timeout)
+        except Exception as e:
+            logger.warning(f"⚠️ Спул не перенесен до остановки: {e}")
+        self._executor.shutdown(wait=True)
+        for segment in self._segments:
+            segment.file.close()
+            if not segment.pending:
+                os.remove(segment.path)
+        self._task = None
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None
+
+    def _open_segment(self) -> _Segment:
+        name = f"{socket.gethostname()}-{os.getpid()}-{time.time_ns()}{SPOOL_SUFFIX}"
+        path = os.path.join(self.directory, name)
+        file = open(path + SPOOL_TEMP_SUFFIX, "ab")
+        if fcntl is not None:
+            fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        # Под именем .spool файл появляется уже заблокированным
+        os.rename(path + SPOOL_TEMP_SUFFIX, path)
+        segment = _Segment(path, file)
+        self._segments.append(segment)
+        return segment
+
+    def _recover(self) -> None:
+        """Сегменты упавших воркеров: неподтвержденные отправки - снова в очередь"""
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(SPOOL_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                file = open(path, "r+b")
+            except FileNotFoundError:
+                continue  # сегмент уже забрал и удалил другой воркер
+            if fcntl is not None:
+                try:
+                    fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    file.close()  # сегмент живого воркера
+                    continue
+                if not _same_file(file, path):
+                    file.close()  # пока ждали блокировку, файл удалили или заменили
+                    continue
+
+            records = {}
+            for line in file:
+                try:
+                    entry = json.loads(line, object_hook=_decode)
+                except ValueError:
+                    # Оборванная строка (сбой во время записи) - клиент ответа не получил
+                    logger.warning(f"⚠️ Пропущена поврежденная строка спула в {name}")
+                    continue
+                if entry.get("op") == "put":
+                    records[entry["record"]["id"]] = entry["record"]
+                elif entry.get("op") == "ack":
+                    for record_id in entry["ids"]:
+                        records.pop(record_id, None)
+
+            if not records:
+                file.close()
+                os.remove(path)
+                continue
+
+            file.seek(0, os.SEEK_END)
+            segment = _Segment(path, file)
+            self._segments.append(segment)
+            for record in records.values():
+                self._register(record, segment)
+            logger.info(f"♻️ Сегмент спула {name}: {len(records)} неотправленных результатов")
+
+    # ---------- запись ----------
+
+    def _register(self, record: Dict, segment: _Segment) -> None:
+        self._records[record["id"]] = record
+        self._segment_of[record["id"]] = segment
+        self._by_user[record["userId"]] = record["id"]
+        segment.pending.add(record["id"])
+
+    def pending_for_user(self, user_id: str) -> Optional[Dict]:
+        """Отправка пользователя, еще не записанная в Firestore"""
+        record_id = self._by_user.get(user_id)
+        return self._records.get(record_id) if record_id else None
+
+    async def append(self, user_id: str, idempotency_key: str, result_data: Dict, sheet: Dict,
+                     clear_progress: bool = False) -> Dict:
+        """Дописать отправку в журнал (fsync) - после этого она не потеряется"""
+        record = {
+            "id": uuid.uuid4().hex,
+            "userId": user_id,
+            "idempotencyKey": idempotency_key,
+            "result": result_data,
+            "sheet": sheet,
+            "clearProgress": clear_progress
+        }
+        # Занимаем пользователя до записи - параллельная отправка увидит ее
+        self._by_user[user_id] = record["id"]
+        self._records[record["id"]] = record
+        segment = self._active
+        # Сегмент с незаписанной отправкой не закроется при ротации в _ack
+        segment.pending.add(record["id"])
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._write, segment, _dumps({"op": "put", "record": record}), True
+            )
+        except Exception:
+            self._by_user.pop(user_id, None)
+            self._records.pop(record["id"], None)
+            segment.pending.discard(record["id"])
+            raise
+        # С этого момента запись в журнале - ее можно переносить в Firestore
+        self._segment_of[record["id"]] = segment
+        self._wakeup.set()
+        return record
+
+    @staticmethod
+    def _write(segment: _Segment, data: bytes, sync: bool) -> None:
+        segment.file.write(data)
+        segment.file.flush()
+        if sync:
+            os.fsync(segment.file.fileno())
+
+    # ---------- перенос в Firestore ----------
+
+    async def _drain_loop(self) -> None:
+        while True:
+            delay = SPOOL_IDLE_INTERVAL
+            if self._failures:
+                delay = min(SPOOL_RETRY_MAX_DELAY, 0.5 * 2 ** self._failures)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                while await self._drain_once():
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Ошибка переноса спула: {e}")
+
+    async def _drain_once(self) -> bool:
+        """Одна пачка записей; True - в журнале есть еще что переносить"""
+        batch = [
+            record for record_id, record in self._records.items()
+            if record_id in self._segment_of and record_id not in self._in_flight
+        ][:SPOOL_BATCH_SIZE]
+        if not batch:
+            return False
+
+        self._in_flight.update(record["id"] for record in batch)
+        try:
+            outcomes = await asyncio.gather(
+                *(run_db(self.apply, record) for record in batch), return_exceptions=True
+            )
+        finally:
+            self._in_flight.difference_update(record["id"] for record in batch)
+
+        done, rejected, failed = [], [], 0
+        for record, outcome in zip(batch, outcomes):
+            if isinstance(outcome, PermanentSpoolError):
+                logger.error(f"❌ Результат {record['userId']} отвергнут: {outcome}")
+                rejected.append({"record": record, "reason": str(outcome), "rejectedAt": datetime.now()})
+                done.append(record)
+            elif isinstance(outcome, BaseException):
+                failed += 1
+                logger.warning(f"⚠️ Результат {record['userId']} не записан, повторим: {outcome}")
+            else:
+                done.append(record)
+
+        if rejected:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._write_rejected, rejected)
+            try:
+                await run_db(_store_rejected, rejected)
+            except Exception as e:
+                # Локальный rejected.jsonl уже записан - админка их просто не увидит
+                logger.warning(f"⚠️ Отвергнутые результаты не записаны в Firestore: {e}")
+        if done:
+            await self._ack(done)
+
+        self._failures = self._failures + 1 if failed else 0
+        return not failed and len(batch) == SPOOL_BATCH_SIZE
+
+    def _write_rejected(self, rejected: List[Dict]) -> None:
+        with open(os.path.join(self.directory, REJECTED_FILE), "ab") as f:
+            f.write(b"".join(_dumps(entry) for entry in rejected))
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def _ack(self, records: List[Dict]) -> None:
+        by_segment: Dict[str, List[str]] = {}
+        for record in records:
+            by_segment.setdefault(self._segment_of[record["id"]].path, []).append(record["id"])
+
+        loop = asyncio.get_running_loop()
+        for segment in list(self._segments):
+            ids = by_segment.get(segment.path)
+            if not ids:
+                continue
+            # Подтверждения без fsync: потерянное подтверждение даст лишь
+            # идемпотентный повтор записи после перезапуска
+            await loop.run_in_executor(self._executor, self._write, segment, _dumps({"op": "ack", "ids": ids}), False)
+            for record_id in ids:
+                record = self._records.pop(record_id)
+                self._segment_of.pop(record_id, None)
+                if self._by_user.get(record["userId"]) == record_id:
+                    del self._by_user[record["userId"]]
+                segment.pending.discard(record_id)
+
+            if not segment.pending and (segment is not self._active or segment.size >= SPOOL_ROTATE_BYTES):
+                if segment is self._active:
+                    self._active = self._open_segment()
+                self._segments.remove(segment)
+                await loop.run_in_executor(self._executor, self._close_segment, segment)
+
+    @staticmethod
+    def _close_segment(segment: _Segment) -> None:
+        """Все отправки сегмента в Firestore - файл больше не нужен"""
+        os.remove(segment.path)
+        segment.file.close()
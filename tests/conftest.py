@@ -0,0 +1,10 @@
+import os
+import sys
+
+# Модули сервиса лежат в корне репозитория
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Секрет токенов сессии читается при импорте sessions.py
+os.environ.setdefault("SESSION_SECRET", "test-secret")
+# Без потока записи логов: тестам он не нужен
+os.environ.setdefault("LOG_QUEUE", "0")
@@ -0,0 +1,51 @@
+import base64
+import random
+
+import pytest
+
+from scoring import (
+    answer_bits_length, decode_answer_bits, encode_answer_bits, pack_answer_bits, unpack_answer_bits
+)
+
+SIZE = 160
+
+
+def test_layout():
+    # Вопрос n - бит (n-1) % 8 байта (n-1) // 8, младший бит первым
+    bits = pack_answer_bits([(1, True), (9, True), (160, True), (2, False)], SIZE)
+    assert len(bits) == answer_bits_length(SIZE) == 20
+    assert bits[0] == 0b1 and bits[1] == 0b1 and bits[19] == 0b10000000
+    assert sum(bits) == 1 + 1 + 0b10000000
+
+
+@pytest.mark.parametrize("size", [SIZE, 1, 7, 8, 9, 159])
+def test_round_trip(size):
+    rnd = random.Random(size)
+    for _ in range(200):
+        answers = [rnd.random() < 0.5 for _ in range(size)]
+        bits = pack_answer_bits(enumerate(answers, start=1), size)
+        decoded = decode_answer_bits(encode_answer_bits(bits), size)
+        assert decoded == bits
+        assert unpack_answer_bits(decoded, size) == answers
+
+
+def test_questions_out_of_range_are_ignored():
+    assert pack_answer_bits([(0, True), (SIZE + 1, True), (-3, True)], SIZE) == bytes(20)
+
+
+def test_decode_rejects_bad_base64():
+    with pytest.raises(ValueError):
+        decode_answer_bits("не base64!", SIZE)
+
+
+def test_decode_rejects_wrong_length():
+    for length in (19, 21, 0):
+        with pytest.raises(ValueError):
+            decode_answer_bits(base64.b64encode(bytes(length)).decode("ascii"), SIZE)
+
+
+def test_decode_rejects_bits_past_size():
+    bits = bytes(19) + b"\x01"  # вопрос 153 при size=152
+    with pytest.raises(ValueError):
+        decode_answer_bits(base64.b64encode(bits).decode("ascii"), 152)
+    assert decode_answer_bits(base64.b64encode(bits).decode("ascii"), SIZE) == bits
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from catalog_data import build_questions
+from scoring import SCALES, ScoringEngine, calculate_score, pack_answer_bits
+
+# Подсчет матрицами (ScoringEngine) должен давать ровно то же, что calculate_score
+
+
+def questions_map(key: str):
+    return {q["number"]: q for q in build_questions(key, bilingual=False).values()}
+
+
+def weighted_map():
+    """Баллы больше 1 - ScoringEngine считает матрицами, а не масками"""
+    weighted = {}
+    for q_num, q_data in questions_map("excel").items():
+        weighted[q_num] = dict(q_data, pointsIfYes=q_data["pointsIfYes"] * (1 + q_num % 3),
+                               pointsIfNo=q_data["pointsIfNo"] * (1 + q_num % 2))
+    return weighted
+
+
+MAPS = {
+    "excel": questions_map("excel"),
+    "inverted-only": questions_map("inverted-only"),
+    "weighted": weighted_map()
+}
+
+
+def random_answers(rnd: random.Random, size: int, complete: bool):
+    numbers = list(range(1, size + 1))
+    if not complete:
+        numbers = rnd.sample(numbers, rnd.randint(0, size))
+    return [{"question_number": n, "answer": rnd.random() < 0.5} for n in numbers]
+
+
+@pytest.mark.parametrize("name", sorted(MAPS))
+def test_score_matches_calculate_score(name):
+    q_map = MAPS[name]
+    engine = ScoringEngine(q_map)
+    rnd = random.Random(name)
+    for i in range(300):
+        answers = random_answers(rnd, engine.size, complete=i % 2 == 0)
+        # Повторные ответы и номера вне каталога calculate_score тоже принимает
+        answers += [{"question_number": rnd.choice([0, engine.size + 1, 7]), "answer": True}]
+        assert engine.score(answers) == calculate_score(answers, q_map)
+
+
+@pytest.mark.parametrize("name", sorted(MAPS))
+def test_score_bits_matches_calculate_score(name):
+    q_map = MAPS[name]
+    engine = ScoringEngine(q_map)
+    rnd = random.Random(name)
+    for _ in range(300):
+        answers = random_answers(rnd, engine.size, complete=True)
+        bits = pack_answer_bits(((a["question_number"], a["answer"]) for a in answers), engine.size)
+        assert engine.score_bits(bits) == calculate_score(answers, q_map)
+
+
+@pytest.mark.parametrize("name", sorted(MAPS))
+def test_score_answered_matches_calculate_score(name):
+    q_map = MAPS[name]
+    engine = ScoringEngine(q_map)
+    rnd = random.Random(name)
+    for _ in range(300):
+        answers = random_answers(rnd, engine.size, complete=False)
+        yes = sum(1 << (a["question_number"] - 1) for a in answers if a["answer"])
+        answered = sum(1 << (a["question_number"] - 1) for a in answers)
+        expected = calculate_score(answers, q_map)
+        assert engine.score_answered(yes, answered) == [expected[scale] for scale in SCALES]
+
+
+def test_extreme_answer_sets():
+    q_map = MAPS["excel"]
+    engine = ScoringEngine(q_map)
+    for value in (True, False):
+        answers = [{"question_number": n, "answer": value} for n in range(1, engine.size + 1)]
+        assert engine.score(answers) == calculate_score(answers, q_map)
+    assert engine.score([]) == calculate_score([], q_map)
@@ -0,0 +1,91 @@
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+import sessions
+from sessions import SessionError, bearer_token, issue_session, read_session, renew_session
+
+USER = {
+    "login": "Тестируемый12",
+    "batch": 3,
+    "isAdmin": False,
+    "isCompleted": False,
+    "createdAt": datetime(2026, 9, 1, 10, 30)
+}
+
+
+def token_for(user_data=USER, **kwargs) -> str:
+    return issue_session("u1", user_data, **kwargs)["sessionToken"]
+
+
+def test_round_trip():
+    issued = issue_session("u1", USER)
+    session = read_session(issued["sessionToken"])
+    assert session.user_id == "u1"
+    assert session.login == "Тестируемый12"
+    assert session.batch == 3
+    assert not session.is_admin and not session.completed
+    assert session.created_at == USER["createdAt"]
+    assert session.expires_at == issued["sessionExpiresAt"]
+
+
+def test_completed_overrides_user_data():
+    assert read_session(token_for(completed=True)).completed
+    assert read_session(token_for(dict(USER, isCompleted=True))).completed
+
+
+def test_renew_keeps_identity():
+    session = read_session(token_for(dict(USER, isAdmin=True)))
+    renewed = read_session(renew_session(session, completed=True)["sessionToken"])
+    assert renewed.completed
+    assert renewed._replace(completed=False, expires_at=0) == session._replace(expires_at=0)
+
+
+def test_expired(monkeypatch):
+    token = token_for()
+    expired_at = time.time() + sessions.SESSION_TTL + 1
+    monkeypatch.setattr(sessions.time, "time", lambda: expired_at)
+    with pytest.raises(SessionError):
+        read_session(token)
+
+
+def test_tampered_payload():
+    payload, _, signature = token_for().partition(".")
+    claims = json.loads(sessions._b64decode(payload))
+    claims["adm"] = True
+    forged = sessions._b64encode(json.dumps(claims).encode("utf-8"))
+    with pytest.raises(SessionError):
+        read_session(f"{forged}.{signature}")
+
+
+def test_tampered_signature():
+    token = token_for()
+    broken = token[:-1] + ("A" if token[-1] != "A" else "B")
+    for bad in (broken, token.partition(".")[0], token + "x", "", ".", "тест.тест"):
+        with pytest.raises(SessionError):
+            read_session(bad)
+
+
+def test_other_secret(monkeypatch):
+    token = token_for()
+    monkeypatch.setattr(sessions, "SESSION_SECRET", "another-secret")
+    with pytest.raises(SessionError):
+        read_session(token)
+
+
+def test_disabled_without_secret(monkeypatch):
+    token = token_for()
+    monkeypatch.setattr(sessions, "SESSIONS_ENABLED", False)
+    assert issue_session("u1", USER) == {}
+    with pytest.raises(SessionError):
+        read_session(token)
+
+
+def test_bearer_token():
+    assert bearer_token("Bearer abc.def") == "abc.def"
+    assert bearer_token("bearer  abc ") == "abc"
+    assert bearer_token("Basic abc") is None
+    assert bearer_token("Bearer ") is None
+    assert bearer_token(None) is None